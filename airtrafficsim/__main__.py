@@ -6,6 +6,7 @@ from importlib import import_module
 from zipfile import ZipFile
 
 import airtrafficsim.server.server as server
+from airtrafficsim.core.navigation import Nav
 
 def main():
     # Unpack client
@@ -25,10 +26,20 @@ def main():
     parser.add_argument('--headless',
                         type=str,
                         help='Run user defined environment without UI: airtrafficsim --headless <env name>.')
+    parser.add_argument('--install',
+                        action='store_true',
+                        help='Install navigation data before the first run: airtrafficsim --install [--workers <number of processes>].')
+    parser.add_argument('--workers',
+                        type=int,
+                        default=os.cpu_count() or 1,
+                        help='Number of processes to install navigation data, by default the number of CPUs.')
     
     args = parser.parse_args()
 
-    if args.init:
+    if args.install:
+        # Extract navigation data and index airports
+        Nav.install(workers=args.workers)
+    elif args.init:
         # Create a symbolic link to the data folder
         if Path.cwd().joinpath(args.init).is_dir():
             Path.cwd().joinpath(args.init).resolve().joinpath('airtrafficsim_data').symlink_to(Path(__file__).parent.resolve().joinpath('./data'), target_is_directory=True)
@@ -56,8 +56,8 @@ class Aircraft:
             ICAO code Standard Terminal Arrival Procedure, by default ""
         approach : str, optional
             ILS approach procedure, by default ""
-        flight_plan : list, optional
-            Array of waypoints that the aircraft will fly, by default []
+        flight_plan : list or str, optional
+            Array of waypoints that the aircraft will fly, or a route string of waypoints and airways (e.g. "RASSE A1 TONGA"), by default []
         cruise_alt : int, optional
             Target cruise altitude [ft], by default -1
         """
@@ -75,7 +75,7 @@ class Aircraft:
         heading : float
             Heading [deg]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         self.traffic.ap.heading[index] = heading
         self.traffic.ap.lateral_mode[index] = APLateralMode.HEADING
 
@@ -88,7 +88,7 @@ class Aircraft:
         speed : float
             Speed [kt]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         self.traffic.ap.cas[index] = speed
         self.traffic.ap.auto_throttle_mode[index] = APThrottleMode.SPEED
 
@@ -105,7 +105,7 @@ class Aircraft:
         vs : float
             Vertical speed [ft/min]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         self.traffic.ap.vs[index] = vs
 
     def set_alt(self, alt):
@@ -117,7 +117,7 @@ class Aircraft:
         alt : float
             Altitude [ft]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         self.traffic.ap.alt[index] = alt
 
     def set_direct(self, waypoint):
@@ -129,7 +129,7 @@ class Aircraft:
         waypoint : str
             ICAO code of the waypoint
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         self.traffic.ap.lateral_mode[index] = APLateralMode.LNAV
 
     def set_holding(self, holding_time, holding_fix, region):
@@ -145,10 +145,13 @@ class Aircraft:
         region : float
             ICAO code of the region that the aircraft should hold
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
+        # [inbound holding course, legtime, leg length, ...] after fix, region, airport and type
+        holding = Nav.get_holding_procedure(holding_fix, region)
         self.traffic.ap.holding_round[index] = holding_time
-        self.traffic.ap.holding_info[index] = Nav.get_holding_procedure(
-            holding_fix, region)
+        self.traffic.ap.holding_fix[index] = self.traffic.ap.find_wp(index, holding[0])
+        self.traffic.ap.holding_course[index] = holding[4]
+        self.traffic.ap.holding_leg[index] = holding[6]
 
     def set_vectoring(self, vectoring_time, v_2, fix):
         """
@@ -165,7 +168,7 @@ class Aircraft:
         """
         if not self.vectoring == fix and self.get_next_wp() == fix:
             self.vectoring = fix
-            index = np.where(self.traffic.index == self.index)[0][0]
+            index = self.traffic.rows_for(self.index)
 
             new_dist = self.traffic.ap.dist[index] + Unit.kts2mps(
                 self.traffic.cas[index] + v_2) * (vectoring_time) / 2000.0
@@ -175,21 +178,16 @@ class Aircraft:
                 self.traffic.lat[index], self.traffic.long[index], bearing, new_dist / 2)
 
             # Add new virtual waypoint
-            i = self.traffic.ap.flight_plan_index[index]
-            self.traffic.ap.flight_plan_lat[index].insert(i, lat)
-            self.traffic.ap.flight_plan_long[index].insert(i, long)
-            self.traffic.ap.flight_plan_name[index].insert(i, "VECT")
-            self.traffic.ap.flight_plan_target_alt[index].insert(
-                i, self.traffic.ap.flight_plan_target_alt[index][i])
-            self.traffic.ap.flight_plan_target_speed[index][i] = v_2
-            self.traffic.ap.flight_plan_target_speed[index].insert(
-                i, self.traffic.ap.flight_plan_target_speed[index][i])
+            ap = self.traffic.ap
+            i = ap.flight_plan_index[index]
+            ap.insert_waypoint(index, i, "VECT", lat, long, ap.wp_target_alt[ap.flight_plan_start[index] + i], v_2)
+            ap.wp_target_speed[ap.flight_plan_start[index] + i + 1] = v_2
 
     def resume_own_navigation(self):
         """
         Resume own navigation to use autopilot instead of user commanded target.
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         self.traffic.ap.lateral_mode[index] = APLateralMode.LNAV
         self.traffic.ap.auto_throttle_mode[index] = APThrottleMode.AUTO
 
@@ -202,7 +200,7 @@ class Aircraft:
         Heading : float
             Heading [deg]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         return self.traffic.heading[index]
 
     def get_cas(self):
@@ -214,7 +212,7 @@ class Aircraft:
         cas : float
             Calibrated air speed [knots]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         return self.traffic.cas[index]
 
     def get_mach(self):
@@ -226,7 +224,7 @@ class Aircraft:
         mach : float
             Mach number [dimensionless]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         return self.traffic.mach[index]
 
     def get_vs(self):
@@ -238,7 +236,7 @@ class Aircraft:
         vs : float
             Vertical speed [ft/min]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         return self.traffic.vs[index]
 
     def get_alt(self):
@@ -250,7 +248,7 @@ class Aircraft:
         alt : float[]
             Altitude [ft]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         return self.traffic.alt[index]
 
     def get_long(self):
@@ -262,7 +260,7 @@ class Aircraft:
         long : float
             Longitude [deg]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         return self.traffic.long[index]
 
     def get_lat(self):
@@ -274,7 +272,7 @@ class Aircraft:
         lat : float
             Latitude [deg]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         return self.traffic.lat[index]
 
     def get_fuel_consumed(self):
@@ -286,7 +284,7 @@ class Aircraft:
         fuel_consumed : float
             Fuel consumed [kg]
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
+        index = self.traffic.rows_for(self.index)
         return self.traffic.fuel_consumed[index]
 
     def get_next_wp(self):
@@ -296,10 +294,11 @@ class Aircraft:
         Returns
         -------
         waypoint : str
-            ICAO code of the next waypoing
+            ICAO code of the next waypoing, "NONE" if the flight plan is empty or finished
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
-        return self.traffic.ap.flight_plan_name[index][self.traffic.ap.flight_plan_index[index]]
+        index = self.traffic.rows_for(self.index)
+        wp, valid = self.traffic.ap.get_flight_plan_wp(n=index)
+        return self.traffic.ap.wp_name[wp] if valid else "NONE"
 
     def get_wake(self):
         """
@@ -310,5 +309,6 @@ class Aircraft:
         Wake category : str
             The ICAO wake category of the aircraft.
         """
-        index = np.where(self.traffic.index == self.index)[0][0]
-        return self.traffic.perf.perf_model._Bada__wake_category[index]
+        index = self.traffic.rows_for(self.index)
+        perf_model = self.traffic.perf.perf_model
+        return perf_model.wake_category[perf_model.type_id[index]]
@@ -2,88 +2,118 @@ from __future__ import annotations
 
 import numpy as np
 
+from airtrafficsim.core.storage import Storage, StorageMixin
 from airtrafficsim.core.navigation import Nav
 from airtrafficsim.utils.calculation import Cal
 from airtrafficsim.utils.enums import APSpeedMode, APThrottleMode, SpeedMode, VerticalMode, APLateralMode
 from airtrafficsim.utils.unit_conversion import Unit
 from airtrafficsim.utils.calculation import Cal
 
-class Autopilot:
+class Autopilot(StorageMixin):
     """
     Autopilot class
     """
 
-    def __init__(self):
+    def __init__(self, storage=None):
+        """
+        Initialize autopilot arrays
+
+        Parameters
+        ----------
+        storage : Storage, optional
+            Storage shared with the traffic class, by default a new Storage
+        """
+        self.storage = storage if storage is not None else Storage()
+        """Capacity managed storage of all per-aircraft arrays"""
+
         # Target altitude
-        self.alt = np.zeros([0])                                
+        self.alt = self.storage.column()                                
         """Autopilot target altitude [feet]"""
 
         # Target orientation
-        self.heading = np.zeros([0])                            
+        self.heading = self.storage.column()                            
         """Autopilot target heading [deg]"""
-        self.track_angle = np.zeros([0])                        
+        self.track_angle = self.storage.column()                        
         """Autopilot target track angle [deg]"""
-        self.ap_rate_of_turn = np.zeros([0])                    
+        self.ap_rate_of_turn = self.storage.column()                    
         """Rate of turn [deg/s]"""
 
         # Target speed
-        self.cas = np.zeros([0])                                
+        self.cas = self.storage.column()                                
         """Autopilot target calibrated air speed [knots]"""
-        self.mach = np.zeros([0])                               
+        self.mach = self.storage.column()                               
         """Autopilot target Mach number [dimensionless]"""
 
         # Target vertical speed
-        self.vs = np.zeros([0])                                 
+        self.vs = self.storage.column()                                 
         """Autopilot target vertical speed (feet/min)"""
-        self.fpa = np.zeros([0])                                
+        self.fpa = self.storage.column()                                
         """Flight path angle [deg]"""
 
         # Target position
-        self.lat = np.zeros([0])                                
+        self.lat = self.storage.column(dtype=np.float64)                                
         """Autopilot target latitude [deg]"""
-        self.long = np.zeros([0])                               
+        self.long = self.storage.column(dtype=np.float64)                               
         """Autopilot target longitude [deg]"""
-        self.lat_next = np.zeros([0])                                
+        self.lat_next = self.storage.column(dtype=np.float64)                                
         """Autopilot target latitude for next waypoint [deg]"""
-        self.long_next = np.zeros([0])                               
+        self.long_next = self.storage.column(dtype=np.float64)                               
         """Autopilot target longitude for next waypoint [deg]"""
-        self.hv_next_wp = np.ones([0], dtype=bool)
+        self.hv_next_wp = self.storage.column(dtype=bool, fill=False)
         """Autupilot hv next waypoint [bool]"""
-        self.dist = np.zeros([0])
+        self.dist = self.storage.column()
         """Distance to next waypoint [nm]"""
 
         # Flight plan
-        self.flight_plan_index = np.zeros([0], dtype=int)                  
+        # The waypoints of all flight plans are stored back to back in flat arrays (compressed sparse rows). The flight
+        # plan of row i is wp_*[flight_plan_start[i]:flight_plan_start[i]+flight_plan_len[i]]. Aircraft of the same route
+        # share one segment. A segment is copied before it is modified (e.g. vectoring).
+        self.flight_plan_index = self.storage.column(dtype=int, fill=0)                  
         """Index of next waypoint in flight plan array [int]"""
-        self.flight_plan_name = []          
-        """2D array to store the string of waypoints [[string]]"""
-        self.flight_plan_lat = []           
-        """2D array to store the latitude of waypoints [[deg...]]"""
-        self.flight_plan_long = []          
-        """2D array to store the longitude of waypoints [[deg...]]"""
-        self.flight_plan_target_alt = []   
-        """2D array of target altitude at each waypoint [[ft...]]"""
-        self.flight_plan_target_speed = []   
-        """2D array of target speed at each waypoint [[cas/mach...]]"""
-        self.procedure_speed = np.zeros([0])
+        self.flight_plan_start = self.storage.column(dtype=int, fill=0)
+        """Offset of the flight plan in the waypoint arrays [int]"""
+        self.flight_plan_len = self.storage.column(dtype=int, fill=0)
+        """Number of waypoints in the flight plan [int]"""
+        self.wp_name = np.empty(64, dtype=object)
+        """Flat array to store the string of waypoints of all flight plans [string]"""
+        self.wp_lat = np.zeros(64)
+        """Flat array to store the latitude of waypoints of all flight plans [deg]"""
+        self.wp_long = np.zeros(64)
+        """Flat array to store the longitude of waypoints of all flight plans [deg]"""
+        self.wp_target_alt = np.full(64, np.nan)
+        """Flat array of target altitude at each waypoint of all flight plans, nan if none [ft]"""
+        self.wp_target_speed = np.full(64, np.nan)
+        """Flat array of target speed at each waypoint of all flight plans, nan if none [cas/mach]"""
+        self.wp_leg_bearing = np.full(64, np.nan)
+        """Flat array of great circle bearing of the leg from each waypoint to the next one, nan for the last waypoint [deg]"""
+        self.wp_n = 0
+        """Number of used elements in the waypoint arrays [int]"""
+        self.procedure_speed = self.storage.column()
         """Procedural target speed from BADA"""
 
         # Flight mode
-        self.speed_mode = np.zeros([0])                         
+        self.speed_mode = self.storage.column(dtype=np.int8, fill=0)                         
         """Autopilot speed mode [1: constant Mach, 2: constant CAS, 3: accelerate, 4: decelerate]"""
-        self.auto_throttle_mode = np.zeros([0])                 
+        self.auto_throttle_mode = self.storage.column(dtype=np.int8, fill=0)                 
         """Autothrottle mode [1: Auto, 2: Speed]"""
-        self.vertical_mode = np.zeros([0])                      
+        self.vertical_mode = self.storage.column(dtype=np.int8, fill=0)                      
         """Autopilot vertical mode [1: alt hold, 2: vs mode, 3: flc mode (flight level change), 4. VNAV]"""
-        self.lateral_mode = np.zeros([0])                       
+        self.lateral_mode = self.storage.column(dtype=np.int8, fill=0)                       
         """Autopilot lateral mode [1: heading, 2: LNAV] ATC only use heading, LNAV -> track angle"""
-        self.expedite_descent = np.zeros([0], dtype=bool)       
+        self.expedite_descent = self.storage.column(dtype=bool, fill=False)       
         """Autopilot expedite climb setting [bool]"""
 
         # Holding
-        self.holding = np.zeros([0], dtype=bool)
-        self.holding_round = np.zeros([0])  
-        self.holding_info = []
+        self.holding = self.storage.column(dtype=bool, fill=False)
+        """Holding phase, whether the aircraft is flying the holding pattern [bool]"""
+        self.holding_round = self.storage.column()  
+        """Remaining holding rounds [int]"""
+        self.holding_fix = self.storage.column(dtype=int, fill=-1)
+        """Position of the holding fix in the flight plan, -1 if no holding is assigned [int]"""
+        self.holding_course = self.storage.column()
+        """Inbound holding course [deg]"""
+        self.holding_leg = self.storage.column()
+        """Holding leg length [nm]"""
 
 
     def add_aircraft(self, lat, long, alt, heading, cas, departure_airport, departure_runway, sid, arrival_airport, arrival_runway, star, approach, flight_plan, cruise_alt):
@@ -105,184 +135,384 @@ class Autopilot:
         cas : float
             Starting calibrated air speed of the aircraft
 
-        flight_plan : String[] (optional)
-            Flight plan of an aircraft
+        flight_plan : String[] or String (optional)
+            Flight plan of an aircraft as waypoint names or a route string (see Nav.expand_route())
+        """
+        self.add_aircraft_batch([lat], [long], [alt], [heading], [cas], [departure_airport], [departure_runway], [sid],
+                                [arrival_airport], [arrival_runway], [star], [approach], [flight_plan], [cruise_alt])
+
+    def add_aircraft_batch(self, lat, long, alt, heading, cas, departure_airport, departure_runway, sid, arrival_airport, arrival_runway, star, approach, flight_plan, cruise_alt):
+        """
+        Add a batch of aircraft to the last len(lat) rows and init their flight plans. The rows must already be reserved in the storage.
+
+        Procedures and waypoint coordinates are only looked up once for each distinct route in the batch, and aircraft
+        flying the same route share one flight plan segment.
+
+        Parameters
+        ----------
+        Same as add_aircraft() with one element per aircraft.
+        """
+        rows = np.arange(self.storage.n - len(lat), self.storage.n)
+
+        self.alt[rows] = alt
+        self.heading[rows] = heading
+        self.track_angle[rows] = heading
+        self.ap_rate_of_turn[rows] = 0.0
+        self.cas[rows] = cas
+        self.mach[rows] = 0.0
+        self.vs[rows] = 0.0
+        self.fpa[rows] = 0.0
+        self.lat[rows] = 0.0
+        self.long[rows] = 0.0
+        self.lat_next[rows] = 0.0
+        self.long_next[rows] = 0.0
+        self.hv_next_wp[rows] = False
+        self.dist[rows] = 0.0
+        self.flight_plan_index[rows] = 0
+        self.procedure_speed[rows] = 0.0
+        self.speed_mode[rows] = 0.0
+        self.auto_throttle_mode[rows] = APThrottleMode.SPEED
+        self.vertical_mode[rows] = 0.0
+        self.lateral_mode[rows] = APLateralMode.HEADING
+        self.expedite_descent[rows] = False
+        self.holding[rows] = False
+        self.holding_round[rows] = 0.0
+        self.holding_fix[rows] = -1
+        self.holding_course[rows] = 0.0
+        self.holding_leg[rows] = 0.0
+
+        routes = {}
+        row_route = []
+        for j in range(len(rows)):
+            route = (departure_airport[j], departure_runway[j], sid[j], arrival_airport[j], arrival_runway[j], star[j], approach[j],
+                     flight_plan[j] if isinstance(flight_plan[j], str) else tuple(flight_plan[j]), cruise_alt[j])
+            if route not in routes:
+                routes[route] = self.__get_flight_plan(*route)
+            row_route.append(route)
+
+        # Get Lat Long of the first waypoints at once. Only the first waypoint depends on the position of the aircraft.
+        hv_plan = [j for j, route in enumerate(row_route) if routes[route][0]]
+        first_lat, first_long = Nav.get_wp_coords([routes[row_route[j]][0][0] for j in hv_plan],
+                                                  np.asarray(lat, dtype=float)[hv_plan], np.asarray(long, dtype=float)[hv_plan])
+        first = dict(zip(hv_plan, zip(first_lat, first_long)))
+
+        segments = {}
+        for j, n in enumerate(rows):
+            route = row_route[j]
+            name, target_alt, target_speed, runway = routes[route]
+            start = first.get(j)
+            if (route, start) not in segments:
+                wp_lat, wp_long = self.__get_flight_plan_coord(name, start, runway)
+                self.flight_plan_start[n] = self.__add_flight_plan(name, wp_lat, wp_long, target_alt, target_speed)
+                # Remember the row rather than the offset as the segments may be compacted by later additions
+                segments[route, start] = n
+            else:
+                self.flight_plan_start[n] = self.flight_plan_start[segments[route, start]]
+            self.flight_plan_len[n] = len(name)
+
+            if name:
+                self.hv_next_wp[n] = True
+                self.lateral_mode[n] = APLateralMode.LNAV
+                self.auto_throttle_mode[n] = APThrottleMode.AUTO
+
+    def __get_flight_plan(self, departure_airport, departure_runway, sid, arrival_airport, arrival_runway, star, approach, flight_plan, cruise_alt):
         """
+        Build the waypoints, altitude targets and speed targets of a route from its procedures.
+
+        Returns
+        -------
+        name : string[]
+            Waypoint names
+        target_alt : float[]
+            Target altitude of each waypoint [ft]
+        target_speed : float[]
+            Target speed of each waypoint [kt]
+        runway : tuple
+            (lat, long, whether it is the last waypoint) of the arrival runway if any
+        """
+        name = []
+        target_alt = []
+        target_speed = []
 
-        self.alt = np.append(self.alt, alt)                                
-        self.heading = np.append(self.heading, heading)                    
-        self.track_angle = np.append(self.track_angle, heading)                     
-        self.ap_rate_of_turn = np.append(self.ap_rate_of_turn, 0.0)               
-        self.cas = np.append(self.cas, cas)                             
-        self.mach = np.append(self.mach, 0.0)                              
-        self.vs = np.append(self.vs, 0.0)                              
-        self.fpa = np.append(self.fpa, 0.0)                              
-        self.lat = np.append(self.lat, 0.0)                                
-        self.long = np.append(self.long, 0.0)                              
-        self.lat_next = np.append(self.lat_next, 0.0)                              
-        self.long_next = np.append(self.long_next, 0.0)                              
-        self.hv_next_wp = np.append(self.hv_next_wp, False)
-        self.dist = np.append(self.dist, 0.0)
-        self.flight_plan_index = np.append(self.flight_plan_index, 0)               
-        self.flight_plan_name.append([])     
-        self.flight_plan_lat.append([])         
-        self.flight_plan_long.append([])         
-        self.flight_plan_target_alt.append([])  
-        self.flight_plan_target_speed.append([])  
-        self.procedure_speed = np.append(self.procedure_speed, 0.0)
-        self.speed_mode = np.append(self.speed_mode, 0.0)                         
-        self.auto_throttle_mode = np.append(self.auto_throttle_mode, APThrottleMode.SPEED)
-        self.vertical_mode = np.append(self.vertical_mode, 0.0)                      
-        self.lateral_mode = np.append(self.lateral_mode, APLateralMode.HEADING)
-        self.expedite_descent = np.append(self.expedite_descent, False)
-        self.holding = np.append(self.holding, False)  
-        self.holding_round = np.append(self.holding_round, 0.0)  
-        self.holding_info.append([])
-
-        # if not flight_plan == []:
         # Add SID to flight plan
         if not sid == "":
             waypoint, alt_restriction_type, alt_restriction, speed_resctriction_type, speed_restriction = Nav.get_procedure(departure_airport, departure_runway, sid)
             # TODO: Ignored alt restriction 2, alt restriction type, and speed restriction type
-            self.flight_plan_name[-1].extend(waypoint)
-            self.flight_plan_target_alt[-1].extend(alt_restriction)
-            self.flight_plan_target_speed[-1].extend(speed_restriction)
-
-            self.hv_next_wp[-1] = True
-            self.lateral_mode[-1] = APLateralMode.LNAV
-            self.auto_throttle_mode[-1] = APThrottleMode.AUTO
+            name.extend(waypoint)
+            target_alt.extend(alt_restriction)
+            target_speed.extend(speed_restriction)
 
         # Add enroute flight plan
-        if not flight_plan == []:
-            self.flight_plan_name[-1].extend(flight_plan)
+        if isinstance(flight_plan, str):
+            flight_plan = Nav.expand_route(flight_plan)
+        if len(flight_plan) > 0:
+            name.extend(flight_plan)
             if cruise_alt > -1:
-                self.flight_plan_target_alt[-1].extend([cruise_alt for _ in flight_plan])
-            self.flight_plan_target_speed[-1].extend([-1 for _ in flight_plan])
-
-            self.hv_next_wp[-1] = True
-            self.lateral_mode[-1] = APLateralMode.LNAV
-            self.auto_throttle_mode[-1] = APThrottleMode.AUTO
+                target_alt.extend([cruise_alt for _ in flight_plan])
+            target_speed.extend([-1 for _ in flight_plan])
 
         # Add STAR to flight plan
         if not star == "":
             waypoint, alt_restriction_type, alt_restriction, speed_resctriction_type, speed_restriction = Nav.get_procedure(arrival_airport, arrival_runway, star)
-            self.flight_plan_name[-1].extend(waypoint)
-            self.flight_plan_target_alt[-1].extend(alt_restriction)
-            self.flight_plan_target_speed[-1].extend(speed_restriction)
-
-            self.hv_next_wp[-1] = True
-            self.lateral_mode[-1] = APLateralMode.LNAV
-            self.auto_throttle_mode[-1] = APThrottleMode.AUTO
+            name.extend(waypoint)
+            target_alt.extend(alt_restriction)
+            target_speed.extend(speed_restriction)
 
         if not approach == "":
             # Add Initial Approach to flight plan
-            waypoint, alt_restriction_type, alt_restriction, speed_resctriction_type, speed_restriction = Nav.get_procedure(arrival_airport, arrival_runway, approach, appch="A", iaf=self.flight_plan_name[-1][-1])
+            waypoint, alt_restriction_type, alt_restriction, speed_resctriction_type, speed_restriction = Nav.get_procedure(arrival_airport, arrival_runway, approach, appch="A", iaf=name[-1])
             # Remove last element of flight plan which should be equal to iaf
-            self.flight_plan_name[-1].pop()
-            self.flight_plan_target_alt[-1].pop()
-            self.flight_plan_target_speed[-1].pop()
-            # Add Initial Approach flight plan 
-            self.flight_plan_name[-1].extend(waypoint)
-            self.flight_plan_target_alt[-1].extend(alt_restriction)
-            self.flight_plan_target_speed[-1].extend(speed_restriction)
+            name.pop()
+            target_alt.pop()
+            target_speed.pop()
+            # Add Initial Approach flight plan
+            name.extend(waypoint)
+            target_alt.extend(alt_restriction)
+            target_speed.extend(speed_restriction)
 
             # Add Final Approach to flight plan
             waypoint, alt_restriction_type, alt_restriction, speed_resctriction_type, speed_restriction = Nav.get_procedure(arrival_airport, arrival_runway, approach, appch="I")
             # Remove last element of flight plan which should be equal to iaf
-            self.flight_plan_name[-1].pop()
-            self.flight_plan_target_alt[-1].pop()
-            self.flight_plan_target_speed[-1].pop()
+            name.pop()
+            target_alt.pop()
+            target_speed.pop()
             # Add Final Approach flight plan with missed approach removed)
-            # waypoint_idx = waypoint.index(' ')
-            # self.flight_plan_name[-1].extend(waypoint[:waypoint_idx])
-            # self.flight_plan_target_alt[-1].extend(alt_restriction_1[:waypoint_idx])
-            # self.flight_plan_target_speed[-1].extend(speed_restriction[:waypoint_idx])
-            self.flight_plan_name[-1].extend(waypoint)
-            self.flight_plan_target_alt[-1].extend(alt_restriction)
-            self.flight_plan_target_speed[-1].extend(speed_restriction)
+            name.extend(waypoint)
+            target_alt.extend(alt_restriction)
+            target_speed.extend(speed_restriction)
             # TODO: For missed approach procedure [waypoint_idx+1:]
 
-            self.hv_next_wp[-1] = True
-            self.lateral_mode[-1] = APLateralMode.LNAV
-            self.auto_throttle_mode[-1] = APThrottleMode.AUTO
-
-        # Get Lat Long of flight plan waypoints
-        for i, val in enumerate(self.flight_plan_name[-1]):
-            if i == 0:
-                lat_tmp, long_tmp = Nav.get_wp_coord(val, lat, long)
-                self.flight_plan_lat[-1].append(lat_tmp)
-                self.flight_plan_long[-1].append(long_tmp)
-            else:
-                lat_tmp, long_tmp = Nav.get_wp_coord(val, self.flight_plan_lat[-1][i - 1], self.flight_plan_long[-1][i - 1])
-                self.flight_plan_lat[-1].append(lat_tmp)
-                self.flight_plan_long[-1].append(long_tmp)
-
         # TODO: Add runway lat long alt
+        runway = None
         if not arrival_runway == "":
             lat_tmp, long_tmp, alt_tmp = Nav.get_runway_coord(arrival_airport, arrival_runway)
-            if self.flight_plan_name[-1][-1] == arrival_runway:
-                self.flight_plan_lat[-1][-1] = lat_tmp
-                self.flight_plan_long[-1][-1] = long_tmp
-                self.flight_plan_target_alt[-1][-1] = alt_tmp
+            runway = (lat_tmp, long_tmp, bool(name) and name[-1] == arrival_runway)
+            if runway[2]:
+                target_alt[-1] = alt_tmp
             else:
-                self.flight_plan_lat[-1].append(lat_tmp)
-                self.flight_plan_long[-1].append(long_tmp)
-                self.flight_plan_target_alt[-1].append(alt_tmp)
-                # self.flight_plan_target_speed[n]
+                target_alt.append(alt_tmp)
 
         # Populate alt and speed target from last waypoint
-        if len(self.flight_plan_target_alt[-1]) > 1:
-            self.flight_plan_target_alt[-1][-1] = 0.0
-            for i, val in reversed(list(enumerate(self.flight_plan_target_alt[-1]))):
+        if len(target_alt) > 1:
+            target_alt[-1] = 0.0
+            for i, val in reversed(list(enumerate(target_alt))):
                 if val == -1:
-                    self.flight_plan_target_alt[-1][i] = self.flight_plan_target_alt[-1][i+1]
+                    target_alt[i] = target_alt[i+1]
+
+        return name, target_alt, target_speed, runway
+
+    def __get_flight_plan_coord(self, name, start, runway):
+        """
+        Get the coordinates of the flight plan waypoints.
+
+        Parameters
+        ----------
+        name : string[]
+            Waypoint names
+        start : tuple
+            (lat, long) of the first waypoint
+        runway : tuple
+            (lat, long, whether it is the last waypoint) of the arrival runway if any
+
+        Returns
+        -------
+        lat : float[]
+            Latitude of each waypoint [deg]
+        long : float[]
+            Longitude of each waypoint [deg]
+        """
+        lat = []
+        long = []
+        for i, val in enumerate(name):
+            if i == 0:
+                lat_tmp, long_tmp = start
+            else:
+                lat_tmp, long_tmp = Nav.get_wp_coord(val, lat[i - 1], long[i - 1])
+            lat.append(lat_tmp)
+            long.append(long_tmp)
+
+        if runway is not None:
+            if runway[2]:
+                lat[-1] = runway[0]
+                long[-1] = runway[1]
+            else:
+                lat.append(runway[0])
+                long.append(runway[1])
 
-        # for i, val in reversed(list(enumerate(self.flight_plan_target_speed[n]))):
-        #     if val == -1:
-        #         self.flight_plan_target_speed[n][i] = self.flight_plan_target_speed[n][i+1]
+        return lat, long
 
-            
+    def __add_flight_plan(self, name, lat, long, target_alt, target_speed):
+        """
+        Append a flight plan to the waypoint arrays.
 
+        Parameters
+        ----------
+        name : string[]
+            Waypoint names
+        lat : float[]
+            Latitude of each waypoint. Extra elements (e.g. runway not in the names) are ignored [deg]
+        long : float[]
+            Longitude of each waypoint [deg]
+        target_alt : float[]
+            Target altitude of each waypoint, ignored if it has less than two elements [ft]
+        target_speed : float[]
+            Target speed of each waypoint [kt]
+
+        Returns
+        -------
+        start : int
+            Offset of the flight plan in the waypoint arrays
+        """
+        k = len(name)
+        if self.wp_n + k > len(self.wp_name):
+            self.__reserve_wp(k)
+        start = self.wp_n
+        self.wp_name[start:start+k] = name
+        self.wp_lat[start:start+k] = lat[:k]
+        self.wp_long[start:start+k] = long[:k]
+        self.wp_target_alt[start:start+k] = np.nan
+        if len(target_alt) > 1:
+            self.wp_target_alt[start:start+min(k, len(target_alt))] = target_alt[:k]
+        self.wp_target_speed[start:start+k] = np.nan
+        self.wp_target_speed[start:start+min(k, len(target_speed))] = target_speed[:k]
+        self.__update_leg(start, k)
+        self.wp_n = start + k
+        return start
+
+    def __reserve_wp(self, k):
+        """
+        Make space for k more waypoints. Segments not used by any aircraft are dropped first, then the arrays are grown geometrically.
+
+        Parameters
+        ----------
+        k : int
+            Number of waypoints to be added
+        """
+        # Compact the segments of live aircraft (shared segments are kept shared)
+        live = self.flight_plan_len > 0
+        starts, first, inverse = np.unique(self.flight_plan_start[live], return_index=True, return_inverse=True)
+        lens = self.flight_plan_len[live][first]
+        new_starts = np.concatenate(([0], np.cumsum(lens)[:-1])).astype(int)
+        gather = np.repeat(starts - new_starts, lens) + np.arange(lens.sum(), dtype=int)
+        self.wp_n = int(lens.sum())
+
+        capacity = len(self.wp_name)
+        while capacity < 2 * (self.wp_n + k):
+            capacity = capacity * 2
+        for attr, fill in [('wp_name', None), ('wp_lat', 0.0), ('wp_long', 0.0), ('wp_target_alt', np.nan), ('wp_target_speed', np.nan), ('wp_leg_bearing', np.nan)]:
+            old = getattr(self, attr)
+            new = np.full(capacity, fill, dtype=old.dtype)
+            new[:self.wp_n] = old[gather]
+            setattr(self, attr, new)
+        self.flight_plan_start[live] = new_starts[inverse]
+
+    def __update_leg(self, start, k):
+        """
+        Compute the leg geometry of a flight plan segment. It must be called whenever the waypoints of the segment change.
+
+        Parameters
+        ----------
+        start : int
+            Offset of the flight plan in the waypoint arrays
+        k : int
+            Number of waypoints in the flight plan
+        """
+        if k == 0:
+            return
+        end = start + k
+        self.wp_leg_bearing[start:end-1] = Cal.cal_great_circle_bearing(self.wp_lat[start:end-1], self.wp_long[start:end-1], self.wp_lat[start+1:end], self.wp_long[start+1:end])
+        self.wp_leg_bearing[end-1] = np.nan
+
+    def insert_waypoint(self, n, i, name, lat, long, target_alt, target_speed):
+        """
+        Insert a waypoint in the flight plan of one aircraft. The flight plan is copied to a new segment first.
 
-    def del_aircraft(self, index):
+        Parameters
+        ----------
+        n : int
+            Row of the aircraft
+        i : int
+            Position of the new waypoint in the flight plan
+        name : str
+            Waypoint name
+        lat : float
+            Latitude [deg]
+        long : float
+            Longitude [deg]
+        target_alt : float
+            Target altitude, nan if none [ft]
+        target_speed : float
+            Target speed, nan if none [kt]
+        """
+        k = self.flight_plan_len[n] + 1
+        if self.wp_n + k > len(self.wp_name):
+            self.__reserve_wp(k)
+        old = self.flight_plan_start[n] + np.arange(k - 1)
+        new = self.wp_n + np.arange(k - 1)
+        new[i:] += 1
+        for arr, val in [(self.wp_name, name), (self.wp_lat, lat), (self.wp_long, long), (self.wp_target_alt, target_alt), (self.wp_target_speed, target_speed)]:
+            arr[new] = arr[old]
+            arr[self.wp_n + i] = val
+        self.__update_leg(self.wp_n, k)
+        self.flight_plan_start[n] = self.wp_n
+        self.flight_plan_len[n] = k
+        if 0 <= i <= self.holding_fix[n]:
+            self.holding_fix[n] += 1
+        self.wp_n = self.wp_n + k
+
+    def get_flight_plan_wp(self, offset=0, n=slice(None)):
         """
-        Delete aircraft
+        Get the waypoint array index of the waypoint at flight_plan_index + offset.
 
         Parameters
         ----------
-        index : float
-            The index of the aircraft to be deleted
+        offset : int, optional
+            Offset from the current waypoint (1 for next waypoint), by default 0
+        n : int or int[], optional
+            Rows of the aircraft, by default all aircraft
+
+        Returns
+        -------
+        wp : int[]
+            Index in the waypoint arrays (wp_*), 0 if out of the flight plan
+        valid : bool[]
+            Whether the waypoint exists
         """
-        self.alt = np.delete(self.alt, index)                                
-        self.heading = np.delete(self.heading, index)                    
-        self.track_angle = np.delete(self.track_angle, index)                     
-        self.ap_rate_of_turn = np.delete(self.ap_rate_of_turn, index)               
-        self.cas = np.delete(self.cas, index)                             
-        self.mach = np.delete(self.mach, index)                              
-        self.vs = np.delete(self.vs, index)                              
-        self.fpa = np.delete(self.fpa, index)                              
-        self.lat = np.delete(self.lat, index)                                
-        self.long = np.delete(self.long, index)                              
-        self.lat_next = np.delete(self.lat_next, index)                              
-        self.long_next = np.delete(self.long_next, index)                              
-        self.hv_next_wp = np.delete(self.hv_next_wp, index)
-        self.dist = np.delete(self.dist, index)
-        self.flight_plan_index = np.delete(self.flight_plan_index, index)               
-        del self.flight_plan_name[index]          
-        del self.flight_plan_lat[index]           
-        del self.flight_plan_long[index]          
-        del self.flight_plan_target_alt[index]   
-        del self.flight_plan_target_speed[index]   
-        self.procedure_speed = np.delete(self.procedure_speed, index)
-        self.speed_mode = np.delete(self.speed_mode, index)                         
-        self.auto_throttle_mode = np.delete(self.auto_throttle_mode, index)             
-        self.vertical_mode = np.delete(self.vertical_mode, index)                      
-        self.lateral_mode = np.delete(self.lateral_mode, index)                   
-        self.expedite_descent =np.delete(self.expedite_descent, index)
-        self.holding = np.delete(self.holding, index) 
-        self.holding_round = np.delete(self.holding_round, index)  
-        del self.holding_info[index]
+        idx = self.flight_plan_index[n] + offset
+        valid = idx < self.flight_plan_len[n]
+        return np.where(valid, self.flight_plan_start[n] + idx, 0), valid
 
+    def get_next_wp_name(self):
+        """
+        Get the name of the next waypoint of all aircraft.
+
+        Returns
+        -------
+        name : string[]
+            Waypoint name, "NONE" if the flight plan is finished
+        """
+        wp, valid = self.get_flight_plan_wp()
+        return np.where(valid, self.wp_name[wp], "NONE")
+
+    def find_wp(self, n, name):
+        """
+        Find the first position of a waypoint in the flight plan of one aircraft.
+
+        Parameters
+        ----------
+        n : int
+            Row of the aircraft
+        name : str
+            Waypoint name
+
+        Returns
+        -------
+        i : int
+            Position in the flight plan, -1 if not found
+        """
+        start = self.flight_plan_start[n]
+        found = np.flatnonzero(self.wp_name[start:start+self.flight_plan_len[n]] == name)
+        return found[0] if len(found) > 0 else -1
 
     def update(self, traffic: Traffic):
         """
@@ -294,29 +524,22 @@ class Autopilot:
             Traffic class
         """
         # Update target based on flight plan
-        for i, val in enumerate(self.flight_plan_index):    #TODO: optimization
-            if val < len(self.flight_plan_name[i]):
-                # Target Flight Plan Lat/Long
-                self.lat[i] = self.flight_plan_lat[i][val]
-                self.long[i] = self.flight_plan_long[i][val]
-                if val == len(self.flight_plan_name[i]) - 1 :
-                    self.hv_next_wp[i] = False
-                else :
-                    self.lat_next[i] = self.flight_plan_lat[i][val+1]
-                    self.long_next[i] = self.flight_plan_long[i][val+1]
-                    self.hv_next_wp[i] = True
-                    
-                # Target Flight Plan Altitude
-                if len(self.flight_plan_target_alt[i]) > 1:
-                    self.alt[i] = self.flight_plan_target_alt[i][val]
-                # Target Flight Plan Speed
-                # if len(self.flight_plan_target_speed[i]) > 1:
-                #     if (self.flight_plan_target_speed[i][val] < 1.0):
-                #         self.mach[i] = self.flight_plan_target_speed[i][val]
-                #     else:
-                #         self.cas[i] = self.flight_plan_target_speed[i][val]
-            else:
-                self.lateral_mode[i] = APLateralMode.HEADING
+        wp, valid = self.get_flight_plan_wp()
+        wp_next, hv_next_wp = self.get_flight_plan_wp(1)
+        # Target Flight Plan Lat/Long
+        self.lat = np.where(valid, self.wp_lat[wp], self.lat)
+        self.long = np.where(valid, self.wp_long[wp], self.long)
+        self.hv_next_wp = np.where(valid, hv_next_wp, self.hv_next_wp)
+        self.lat_next = np.where(hv_next_wp, self.wp_lat[wp_next], self.lat_next)
+        self.long_next = np.where(hv_next_wp, self.wp_long[wp_next], self.long_next)
+        # Target Flight Plan Altitude
+        target_alt = self.wp_target_alt[wp]
+        self.alt = np.where(valid & ~np.isnan(target_alt), target_alt, self.alt)
+        # Target Flight Plan Speed
+        # target_speed = self.wp_target_speed[wp]
+        # self.mach = np.where(valid & (target_speed < 1.0), target_speed, self.mach)
+        # self.cas = np.where(valid & (target_speed >= 1.0), target_speed, self.cas)
+        self.lateral_mode = np.where(valid, self.lateral_mode, APLateralMode.HEADING)
 
         # self.alt = np.minimum(self.alt, traffic.max_alt)   #Altitude
         
@@ -359,7 +582,7 @@ class Autopilot:
 
         # Fly by turn
         turn_radius = traffic.perf.cal_turn_radius(traffic.perf.get_bank_angles(traffic.configuration), Unit.kts2mps(traffic.tas)) / 1000.0     #km
-        next_track_angle = np.where(self.hv_next_wp, Cal.cal_great_circle_bearing(self.lat, self.long, self.lat_next, self.long_next), self.track_angle)    # Next track angle to next next waypoint
+        next_track_angle = np.where(self.hv_next_wp & valid, self.wp_leg_bearing[wp], self.track_angle)    # Next track angle to next next waypoint (precomputed leg bearing)
         curr_track_angle = Cal.cal_great_circle_bearing(traffic.lat, traffic.long, self.lat, self.long) # Current track angle to next waypoint #!TODO consider current heading
         turn_dist = turn_radius * np.tan(np.deg2rad(np.abs(Cal.cal_angle_diff(next_track_angle, curr_track_angle)) / 2.0))    # Distance to turn
         self.track_angle =  np.where(self.lateral_mode == APLateralMode.HEADING, 0.0, np.where(dist < turn_dist, np.where(self.hv_next_wp, next_track_angle, self.track_angle), np.where(dist < 1.0, self.track_angle, curr_track_angle)))
@@ -376,26 +599,20 @@ class Autopilot:
         # self.dist = dist
 
         # Holding
-        for i, val in enumerate(self.holding):
-            if self.holding[i] == False:
-                if self.holding_info[i] and np.abs(Cal.cal_angle_diff(self.heading[i], self.holding_info[i][4])) < 90.0 and self.flight_plan_index[i] > self.flight_plan_name[i].index(self.holding_info[i][0]):   # Turn outbound
-                    self.heading[i] = np.mod(self.holding_info[i][4] + 180, 360)
-                    self.holding_round[i] -= 1
-                    self.flight_plan_index[i] -= 1
-                    self.lateral_mode[i] = APLateralMode.HEADING
-                    self.holding[i] = True        
-            else:
-                if np.abs(Cal.cal_angle_diff(self.heading[i], self.holding_info[i][4])) < 90.0 and dist[i] < 1:   # Turn outbound
-                    self.heading[i] = np.mod(self.holding_info[i][4] + 180, 360)
-                    self.holding_round[i] -= 1
-
-                if np.abs(Cal.cal_angle_diff(self.heading[i], self.holding_info[i][4] + 180.0)) < 90.0 and dist[i] > Unit.nm2m(self.holding_info[i][6])/1000.0: # Turn inbound
-                    self.heading[i] = self.holding_info[i][4]
-                    if self.holding_round[i] <= 0:
-                        self.lateral_mode[i] = APLateralMode.LNAV
-                        self.holding[i] = False
-                        self.holding_info[i] = []
-                
-                    # update_next_wp[i] = False
-        
-        
\ No newline at end of file
+        if np.any(self.holding_fix >= 0):
+            holding = self.holding.copy()
+            # Enter the holding pattern after passing the holding fix
+            enter = ~holding & (self.holding_fix >= 0) & (np.abs(Cal.cal_angle_diff(self.heading, self.holding_course)) < 90.0) & (self.flight_plan_index > self.holding_fix)
+            # Turn outbound
+            outbound = enter | (holding & (np.abs(Cal.cal_angle_diff(self.heading, self.holding_course)) < 90.0) & (dist < 1))
+            self.heading = np.where(outbound, np.mod(self.holding_course + 180, 360), self.heading)
+            self.holding_round = np.where(outbound, self.holding_round - 1, self.holding_round)
+            self.flight_plan_index = np.where(enter, self.flight_plan_index - 1, self.flight_plan_index)
+            self.lateral_mode = np.where(enter, APLateralMode.HEADING, self.lateral_mode)
+            # Turn inbound and leave the holding pattern when no round is remaining
+            inbound = holding & (np.abs(Cal.cal_angle_diff(self.heading, self.holding_course + 180.0)) < 90.0) & (dist > Unit.nm2m(self.holding_leg)/1000.0)
+            self.heading = np.where(inbound, self.holding_course, self.heading)
+            leave = inbound & (self.holding_round <= 0)
+            self.lateral_mode = np.where(leave, APLateralMode.LNAV, self.lateral_mode)
+            self.holding = (holding | enter) & ~leave
+            self.holding_fix = np.where(leave, -1, self.holding_fix)
@@ -16,7 +16,44 @@ class Environment:
 
     """
 
-    def __init__(self, file_name, start_time, end_time, weather_mode="ISA", performance_mode="BADA"):
+    def __init__(self, file_name, start_time, end_time, weather_mode="ISA", performance_mode="BADA", precision="float64", atmosphere="formula", kernel="numpy"):
+        """
+        Initialize simulation environment
+
+        Parameters
+        ----------
+        file_name : str
+            Output file name
+        start_time : datetime
+            The simulation start time
+        end_time : int
+            The simulation end time [s]
+        weather_mode : str, optional
+            Weather mode [ISA, ERA5], by default "ISA"
+        performance_mode : str, optional
+            Performance model [BADA, OpenAP], by default "BADA"
+        precision : str, optional
+            Floating point type of the state arrays [float64, float32], by default "float64"
+        atmosphere : str, optional
+            How the atmosphere model is evaluated [formula, table], by default "formula"
+        kernel : str, optional
+            Implementation of the per-aircraft kinematics [numpy, numba], by default "numpy". "numba" requires the
+            optional Numba package and falls back to numpy without it.
+
+        Notes
+        -----
+        precision="float32" halves the memory of most state arrays for large ensembles. Position, mass and fuel
+        consumed stay in float64. Largest deviation measured against float64 runs of DemoEnv and
+        FullFlightDemo (7000 s from take-off to approach): latitude and longitude 5.1e-6 deg, altitude 0.022 ft,
+        CAS and TAS 1.3e-3 kt, heading 3.4e-4 deg, relative fuel consumed 4.4e-7. Flight phases, configurations, modes
+        and waypoint sequencing were identical at every timestep of these runs. This is not a bound for other
+        scenarios: a comparison that is a near tie in float64 may resolve differently in float32, after which the
+        trajectories diverge by more than these values.
+
+        atmosphere="table" interpolates air pressure and energy share factor in lookup tables (see Performance).
+        Deviation from the formulas in DemoEnv and FullFlightDemo: latitude and longitude < 1e-6 deg, altitude < 0.01 ft,
+        CAS and TAS < 1e-4 kt, fuel consumed < 1e-3 kg with identical flight phases and waypoint sequencing.
+        """
         # User setting
         self.start_time = start_time
         """The simulation start time [datetime object]"""
@@ -25,7 +62,7 @@ class Environment:
 
         # Simulation variable
         self.traffic = Traffic(file_name, start_time,
-                               end_time, weather_mode, performance_mode)
+                               end_time, weather_mode, performance_mode, precision, atmosphere, kernel)
         self.global_time = 0                    # [s]
 
         # Handle io
@@ -42,7 +79,8 @@ class Environment:
             'data/result/'+self.file_name)
         self.folder_path.mkdir()
         self.file_path = self.folder_path.joinpath(self.file_name+'.csv')
-        self.writer = csv.writer(open(self.file_path, 'w+'))
+        self.file = open(self.file_path, 'w+')
+        self.writer = csv.writer(self.file)
         self.header = ['timestep', 'timestamp', 'id', 'callsign', 'lat', 'long', 'alt',
                        'cas', 'tas', 'mach', 'vs',
                        'heading', 'bank_angle', 'path_angle',
@@ -133,6 +171,9 @@ class Environment:
 
             self.step(socketio)
 
+        # Write the buffered rows so that the file is complete when run() returns
+        self.file.flush()
+
         # print("")
         # print("Export to CSVs")
         # self.export_to_csv()
@@ -149,8 +190,7 @@ class Environment:
                                 self.traffic.mass, self.traffic.fuel_consumed,
                                 self.traffic.perf.thrust, self.traffic.perf.drag, self.traffic.perf.esf, self.traffic.accel,
                                 self.traffic.ap.track_angle, self.traffic.ap.heading, self.traffic.ap.alt, self.traffic.ap.cas, self.traffic.ap.mach, self.traffic.ap.procedure_speed,
-                                self.traffic.ap.flight_plan_index, [self.traffic.ap.flight_plan_name[i][val] if (val < len(self.traffic.ap.flight_plan_name[i])) else "NONE" for i, val in enumerate(
-                                    self.traffic.ap.flight_plan_index)], self.traffic.ap.dist, self.traffic.ap.holding_round,  # autopilot variable
+                                self.traffic.ap.flight_plan_index, self.traffic.ap.get_next_wp_name(), self.traffic.ap.dist, self.traffic.ap.holding_round,  # autopilot variable
                                 [FlightPhase(i).name for i in self.traffic.flight_phase], [Config(i).name for i in self.traffic.configuration], [
             SpeedMode(i).name for i in self.traffic.speed_mode], [VerticalMode(i).name for i in self.traffic.vertical_mode],
             [APSpeedMode(i).name for i in self.traffic.ap.speed_mode], [APLateralMode(i).name for i in self.traffic.ap.lateral_mode], [APThrottleMode(i).name for i in self.traffic.ap.auto_throttle_mode]))  # mode
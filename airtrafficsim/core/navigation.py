@@ -3,8 +3,158 @@ import pandas as pd
 from pathlib import Path
 from zipfile import ZipFile
 import csv
+import functools
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import types
 
 from airtrafficsim.utils.calculation import Cal
+from airtrafficsim.utils.airway_graph import AirwayGraph
+from airtrafficsim.utils.spatial_index import SpatialIndex
+
+
+def _parse_airports(lines):
+    """
+    Split a block of apt.dat lines into airport records and extract their runway ends.
+
+    Parameters
+    ----------
+    lines : bytes[]
+        Lines of apt.dat. Lines before the first airport header (row code 1, 16 or 17) are ignored.
+
+    Returns
+    -------
+    icao : string[]
+        ICAO code of each airport
+    records : bytes[]
+        apt.dat lines of each airport
+    runways : [[string]]
+        [icao, runway, lat, long, alt] of each runway end
+    """
+    icao = ""
+    alt = ""
+    airport = []
+    icaos = []
+    records = []
+    runways = []
+    for line in lines:
+        row = line.split()
+        if row:
+            # If row code equals to airport
+            if row[0] in (b"1", b"16", b"17", b"99"):
+                # Write previous airport
+                if not icao == "":
+                    icaos.append(icao)
+                    records.append(b"".join(airport))
+                icao = ""
+                # Reset if not the end
+                if not row[0] == b"99":
+                    icao = row[4].decode()
+                    alt = row[1].decode()
+                    airport = []
+            # If row code equals to land runway
+            if row[0] == b"100":
+                for i in range(8, len(row), 9):
+                    runways.append([icao]+[val.decode() for val in row[i:i+3]]+[alt])
+            # If row code equals to water runway
+            if row[0] == b"101":
+                for i in range(3, len(row), 3):
+                    runways.append([icao]+[val.decode() for val in row[i:i+3]]+[alt])
+            # If row code equals to helipad runway
+            if row[0] == b"102":
+                runways.append([icao]+[val.decode() for val in row[1:4]]+[alt])
+            # Add data line to cache
+            airport.append(line)
+    # Write last airport of the block
+    if not icao == "":
+        icaos.append(icao)
+        records.append(b"".join(airport))
+    return icaos, records, runways
+
+
+def _to_numeric(column):
+    """
+    Convert a column of a navigation data table to numbers.
+
+    Parameters
+    ----------
+    column : pandas.Series
+        Column read from the source file
+
+    Returns
+    -------
+    pandas.Series
+        Numeric column, or the column unchanged if it has non-numeric values (e.g. names)
+    """
+    try:
+        return pd.to_numeric(column)
+    except (ValueError, TypeError):
+        return column
+
+
+class NavTable:
+    """
+    Navigation data table which is parsed on first access of the class attribute.
+
+    The parsed table is pickled to the cache/ directory of Nav.data_path under the hash of the source file, so that a
+    source file is only parsed once and importing the navigation module does not read any data.
+    """
+
+    def __init__(self, file_name, read):
+        """
+        Initialize navigation data table.
+
+        Parameters
+        ----------
+        file_name : string
+            Source file name in Nav.data_path
+        read : callable
+            Function to parse the source file given its path [callable(Path) -> pandas.DataFrame]
+        """
+        self.file_name = file_name
+        """Source file name in Nav.data_path"""
+        self.read = read
+        """Function to parse the source file"""
+        self.data = None
+        """Parsed table, None before the first access [pandas.DataFrame]"""
+
+    def __get__(self, instance, owner):
+        if self.data is None:
+            self.data = self.load()
+        return self.data
+
+    def load(self):
+        """
+        Load the table from the binary cache. Parse the source file and write the cache if it does not exist or the source file is changed.
+
+        Returns
+        -------
+        pandas.DataFrame
+            Parsed table
+        """
+        Nav.install()
+        path = Nav.data_path.joinpath(self.file_name)
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        cache = path.parent.joinpath('cache', path.stem + '-' + digest.hexdigest() + '.pkl')
+        if cache.is_file():
+            return pd.read_pickle(cache)
+
+        print("Reading NAV data ("+self.file_name+")...")
+        data = self.read(path)
+        # Replace outdated cache. Write to a temporary file first as other processes may read the cache at the same time.
+        cache.parent.mkdir(exist_ok=True)
+        for outdated in cache.parent.glob(path.stem + '-*.pkl'):
+            outdated.unlink()
+        tmp = cache.with_suffix('.' + str(os.getpid()) + '.tmp')
+        data.to_pickle(tmp)
+        os.replace(tmp, cache)
+        return data
 
 
 class Nav:
@@ -41,93 +191,235 @@ class Nav:
     https://developer.x-plane.com/article/navdata-in-x-plane-11/
     """
 
-    # Install navigation data
-    if not Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane/').is_dir():
-        # Create directories
-        Path(__file__).parent.parent.resolve().joinpath(
-            './data/navigation/xplane/airports').mkdir(parents=True)
-
-        # Unzip files
-        print("Unzipping X-plane navigation data.")
-        ZipFile(Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane_default_data.zip')
-                ).extractall(Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane/'))
-
-        # Extract apt.dat to runways.csv and individual csv in xplane/airports/
-        print("Unpacking airport data (apt.dat). This will take a while...")
-        airport = []
-        icao = ""
-        alt = 0.0
-
-        runways = []
-        with open(Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane/apt.dat'), 'r') as file:
-            # Skip 3 lines
-            next(file)
-            next(file)
-            next(file)
-            # Loop through all files
-            for line in file:
-                row = line.split()
-                if row:
-                    # If row code equals to airport
-                    if row[0] in ("1", "16", "17", "99"):
-                        # Write previous airport
-                        if not icao == "":
-                            print(
-                                "\r"+"Extracting information from airport "+icao, end="", flush=True)
-                            with open(Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane/airports', icao+'.csv'), 'w') as f:
-                                f.writelines(airport)
-                        # Reset if not the end
-                        if not row[0] == "99":
-                            icao = row[4]
-                            alt = row[1]
-                            airport = []
-                    # If row code equals to land runway
-                    if row[0] == "100":
-                        for i in range(8, len(row), 9):
-                            runways.append([icao]+row[i:i+3]+[alt])
-                    # If row code equals to water runway
-                    if row[0] == "101":
-                        for i in range(3, len(row), 3):
-                            runways.append([icao]+row[i:i+3]+[alt])
-                    # If row code equals to helipad runway
-                    if row[0] == "102":
-                        runways.append([icao]+row[1:4]+[alt])
-                    # Add data line to cache
-                    airport.append(line)
-
-        # Write saved runway data to airports.csv
-        print("\nExporting airport runways data.")
-        with open(Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane/airports.csv'), 'w') as f:
-            writer = csv.writer(f)
-            writer.writerows(runways)
-        del airport
-        del icao
-        del runways
-
-    # Static variables
-    print("Reading NAV data...")
-    fix = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath(
-        './data/navigation/xplane/earth_fix.dat'), delimiter='\s+', skiprows=3, header=None)
+    zip_path = Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane_default_data.zip')
+    """Zip file of the X-plane navigation data"""
+    data_path = Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane/')
+    """Directory of the installed X-plane navigation data"""
+
+    # Static variables (read on first access, see NavTable)
+    fix = NavTable('earth_fix.dat', lambda path: pd.read_csv(path, delimiter=r'\s+', skiprows=3, header=None))
     """Fixes data https://developer.x-plane.com/wp-content/uploads/2019/01/XP-FIX1101-Spec.pdf"""
-    nav = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath('./data/navigation/xplane/earth_nav.dat'),
-                      delimiter='\s+', skiprows=3, header=None, names=np.arange(0, 18), low_memory=False).apply(pd.to_numeric, errors='ignore')
+    nav = NavTable('earth_nav.dat', lambda path: pd.read_csv(path, delimiter=r'\s+', skiprows=3, header=None,
+                                                             names=np.arange(0, 18), low_memory=False).apply(_to_numeric))
     """Radio navigation data https://developer.x-plane.com/wp-content/uploads/2020/03/XP-NAV1150-Spec.pdf"""
-    airway = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath(
-        './data/navigation/xplane/earth_awy.dat'), delimiter='\s+', skiprows=3, header=None)
+    airway = NavTable('earth_awy.dat', lambda path: pd.read_csv(path, delimiter=r'\s+', skiprows=3, header=None))
     """Airway data https://developer.x-plane.com/wp-content/uploads/2019/01/XP-AWY1101-Spec.pdf"""
-    holding = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath(
-        './data/navigation/xplane/earth_hold.dat'), delimiter='\s+', skiprows=3, header=None)
+    holding = NavTable('earth_hold.dat', lambda path: pd.read_csv(path, delimiter=r'\s+', skiprows=3, header=None))
     """Holding data https://developer.x-plane.com/wp-content/uploads/2018/12/XP-HOLD1140-Spec.pdf"""
-    min_off_route_alt = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath(
-        './data/navigation/xplane/earth_mora.dat'), delimiter='\s+', skiprows=3, header=None)
+    min_off_route_alt = NavTable('earth_mora.dat', lambda path: pd.read_csv(path, delimiter=r'\s+', skiprows=3, header=None))
     """Minimum off route grid altitudes https://developer.x-plane.com/wp-content/uploads/2020/03/XP-MORA1150-Spec.pdf"""
-    min_sector_alt = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath(
-        './data/navigation/xplane/earth_msa.dat'), delimiter='\s+', skiprows=3, header=None, names=np.arange(0, 26))
+    min_sector_alt = NavTable('earth_msa.dat', lambda path: pd.read_csv(path, delimiter=r'\s+', skiprows=3, header=None, names=np.arange(0, 26)))
     """Minimum sector altitudes for navaids, fixes, airports and runway threshold https://developer.x-plane.com/wp-content/uploads/2020/03/XP-MSA1150-Spec.pdf"""
-    airports = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath(
-        './data/navigation/xplane/airports.csv'), header=None)
+    airports = NavTable('airports.csv', lambda path: pd.read_csv(path, header=None))
     """Airports data (extracted to contain only runway coordinates) https://developer.x-plane.com/article/airport-data-apt-dat-file-format-specification/"""
 
+    __airport_index = None
+    """Position of the record of each airport in the airport store {icao: (offset, length)}, loaded on first use"""
+
+    @staticmethod
+    def install(workers=1, block_size=2000, zip_path=None, path=None):
+        """
+        Install the X-plane navigation data from Nav.zip_path (data/navigation/xplane_default_data.zip) into Nav.data_path
+        (data/navigation/xplane/).
+
+        The data files are extracted except apt.dat, which is streamed from the zip file in blocks of airports. The
+        lines of each airport are written to a single store (airports.dat with the index airports_index.npz) and the
+        runway ends to airports.csv. Blocks can be parsed by several processes. The progress is saved after each
+        block so that an interrupted installation resumes where it stopped. Nothing is done if the data of the same
+        zip file is already installed.
+
+        It is called on the first access of the navigation data and can be run beforehand with
+        `airtrafficsim --install`.
+
+        Parameters
+        ----------
+        workers : int, optional
+            Number of processes to parse apt.dat, by default 1
+        block_size : int, optional
+            Number of airports in each block, by default 2000
+        zip_path : Path, optional
+            Zip file of the navigation data, by default Nav.zip_path
+        path : Path, optional
+            Directory to install the navigation data into, by default Nav.data_path
+        """
+        zip_path = Path(zip_path) if zip_path is not None else Nav.zip_path
+        path = Path(path) if path is not None else Nav.data_path
+        stat = zip_path.stat()
+        version = str(stat.st_size) + "-" + str(stat.st_mtime_ns)
+        if path.joinpath('installed').is_file() and path.joinpath('installed').read_text() == version:
+            return
+
+        path.mkdir(parents=True, exist_ok=True)
+        with ZipFile(zip_path) as zip_file:
+            # Extract data files (skip files extracted by an interrupted installation)
+            print("Unzipping X-plane navigation data.")
+            for member in zip_file.infolist():
+                target = path.joinpath(member.filename)
+                if member.is_dir() or member.filename == 'apt.dat' or (target.is_file() and target.stat().st_size == member.file_size):
+                    continue
+                zip_file.extract(member, path)
+
+            # Resume the extraction of apt.dat if the progress is saved for the same zip file and all its output is on disk
+            files = {'store': path.joinpath('airports.dat'), 'index': path.joinpath('airports_index.part'), 'runways': path.joinpath('airports.part')}
+            progress = {'version': version, 'blocks': 0, 'airports': 0, 'store': 0, 'index': 0, 'runways': 0}
+            if path.joinpath('airports.progress').is_file():
+                saved = json.loads(path.joinpath('airports.progress').read_text())
+                if saved['version'] == version and all(file.is_file() and file.stat().st_size >= saved[name] for name, file in files.items()):
+                    progress = saved
+            for name, file in files.items():
+                with open(file, 'a'):
+                    pass
+                os.truncate(file, progress[name])
+
+            print("Unpacking airport data (apt.dat).")
+            pool = multiprocessing.Pool(workers) if workers > 1 else None
+            try:
+                with zip_file.open('apt.dat') as apt, open(files['store'], 'ab') as store, open(files['index'], 'a') as index, \
+                        open(files['runways'], 'a') as runways:
+                    # Skip 3 lines
+                    next(apt)
+                    next(apt)
+                    next(apt)
+                    blocks = itertools.islice(Nav.__split_blocks(apt, block_size), progress['blocks'], None)
+                    if pool is not None:
+                        # Read ahead at most two blocks per process instead of the whole file
+                        batches = iter(lambda: list(itertools.islice(blocks, 2 * workers)), [])
+                        parsed = itertools.chain.from_iterable(pool.imap(_parse_airports, batch) for batch in batches)
+                    else:
+                        parsed = map(_parse_airports, blocks)
+                    runway_writer = csv.writer(runways)
+                    for icaos, records, runway in parsed:
+                        for icao, record in zip(icaos, records):
+                            index.write(icao + "," + str(progress['store']) + "," + str(len(record)) + "\n")
+                            store.write(record)
+                            progress['store'] += len(record)
+                        runway_writer.writerows(runway)
+                        for file in (store, index, runways):
+                            file.flush()
+                        progress['blocks'] += 1
+                        progress['airports'] += len(icaos)
+                        progress['index'] = index.tell()
+                        progress['runways'] = runways.tell()
+                        path.joinpath('airports.progress').write_text(json.dumps(progress))
+                        print("\r"+"Extracted "+str(progress['airports'])+" airports", end="", flush=True)
+            finally:
+                if pool is not None:
+                    pool.terminate()
+
+        # Build index (the last record of a duplicated airport is kept)
+        print("\nExporting airport runways data.")
+        airport_index = {}
+        with open(files['index'], 'r') as index:
+            for line in index:
+                icao, offset, length = line.rstrip("\n").rsplit(",", 2)
+                airport_index[icao] = (int(offset), int(length))
+        np.savez(path.joinpath('airports_index.npz'), icao=np.array(list(airport_index.keys()), dtype=str),
+                 offset=np.array([val[0] for val in airport_index.values()], dtype=np.int64),
+                 length=np.array([val[1] for val in airport_index.values()], dtype=np.int64))
+        # Drop the progress before the part files are moved, an installation interrupted from here starts again
+        path.joinpath('airports.progress').unlink()
+        os.replace(files['runways'], path.joinpath('airports.csv'))
+        files['index'].unlink()
+        path.joinpath('installed').write_text(version)
+
+    @staticmethod
+    def set_data_path(zip_path, path):
+        """
+        Use the navigation data of another zip file and installation directory (e.g. a test data set).
+
+        All tables and indices read from the previous data are dropped and read again from the new data on first use.
+
+        Parameters
+        ----------
+        zip_path : Path
+            Zip file of the navigation data
+        path : Path
+            Directory of the installed navigation data
+        """
+        Nav.zip_path = Path(zip_path)
+        Nav.data_path = Path(path)
+        for table in vars(Nav).values():
+            if isinstance(table, NavTable):
+                table.data = None
+        Nav.__airport_index = None
+        Nav.__wp_index = None
+        Nav.__wp_grid = None
+        Nav.__airport_grid = None
+        Nav.__airway_graph = None
+        Nav.__mora_grid = None
+        Nav.__runway_index = None
+        Nav.get_cifp.cache_clear()
+        Nav.__expand_route.cache_clear()
+        Nav.__get_shortest_route.cache_clear()
+
+    @staticmethod
+    def __split_blocks(file, block_size):
+        """
+        Split the lines of apt.dat into blocks of block_size airports.
+        """
+        block = []
+        count = 0
+        for line in file:
+            row = line.split(maxsplit=1)
+            if row and row[0] in (b"1", b"16", b"17"):
+                if count == block_size:
+                    yield block
+                    block = []
+                    count = 0
+                count += 1
+            block.append(line)
+        yield block
+
+    @staticmethod
+    def get_airport_data(airport):
+        """
+        Get the apt.dat data of an airport.
+
+        Parameters
+        ----------
+        airport : string
+            ICAO code of the airport
+
+        Returns
+        -------
+        string[]
+            Lines of apt.dat of the airport, starting with the airport header
+
+        Note
+        ----
+        https://developer.x-plane.com/article/airport-data-apt-dat-file-format-specification/
+        """
+        path = Nav.data_path
+        if Nav.__airport_index is None:
+            Nav.install()
+            data = np.load(path.joinpath('airports_index.npz'))
+            Nav.__airport_index = dict(zip(data['icao'], zip(data['offset'].tolist(), data['length'].tolist())))
+        offset, length = Nav.__airport_index[airport]
+        with open(path.joinpath('airports.dat'), 'rb') as store:
+            store.seek(offset)
+            return store.read(length).decode(errors='replace').splitlines()
+
+    __wp_index = None
+    """Names of all waypoints (fixes followed by navaids) sorted for binary search with their coordinates (name, lat, long), built on first use"""
+
+    @staticmethod
+    def __get_wp_index():
+        """
+        Get the name index of all waypoints (fix and navaid). Waypoints of the same name keep their order in the data.
+
+        Returns
+        -------
+        name, lat, long : string[], float[], float[]
+            Sorted waypoint names and their Latitude and Longitude
+        """
+        if Nav.__wp_index is None:
+            name = np.append(Nav.fix[2].to_numpy(), Nav.nav[7].to_numpy()).astype(str)
+            lat = np.append(Nav.fix[0].to_numpy(), Nav.nav[1].to_numpy()).astype(float)
+            long = np.append(Nav.fix[1].to_numpy(), Nav.nav[2].to_numpy()).astype(float)
+            order = np.argsort(name, kind='stable')
+            Nav.__wp_index = (name[order], lat[order], long[order])
+        return Nav.__wp_index
+
     @staticmethod
     def get_wp_coord(name, lat, long):
         """
@@ -149,21 +441,84 @@ class Nav:
         lat, Long: float, float
             Latitude and Longitude of the waypoint
         """
-        # Find lat and long of all fixes that match the name
-        mask = Nav.fix[2].to_numpy() == name
-        fix_lat = Nav.fix[0].to_numpy()[mask]
-        fix_long = Nav.fix[1].to_numpy()[mask]
-        # Find lat and long of all navaids that match the name
-        mask = Nav.nav[7].to_numpy() == name
-        nav_lat = Nav.nav[1].to_numpy()[mask]
-        nav_long = Nav.nav[2].to_numpy()[mask]
-        # Combine fix and nav
-        wp_lat = np.append(fix_lat, nav_lat)
-        wp_long = np.append(fix_long, nav_long)
-        # Find index of minimum distance
-        index = np.argmin(Cal.cal_great_circle_dist(
-            lat, long, wp_lat, wp_long), axis=0)
-        return wp_lat[index], wp_long[index]
+        wp_lat, wp_long = Nav.get_wp_coords([name], [lat], [long])
+        return wp_lat[0], wp_long[0]
+
+    @staticmethod
+    def get_wp_coords(names, ref_lat, ref_long):
+        """
+        Get the nearest waypoint (fix and navaid) coordinates given names. Each name is looked up by binary search and
+        only the waypoints of the same name are compared.
+
+        Parameters
+        ----------
+        names : String[]
+            ICAO name of the waypoints (max 5 chars)
+
+        ref_lat : float or float[]
+            Latitude of the reference position of each waypoint
+
+        ref_long : float or float[]
+            Longitude of the reference position of each waypoint
+
+        Returns
+        -------
+        lat, Long: float[], float[]
+            Latitude and Longitude of the waypoints
+
+        Raises
+        ------
+        ValueError
+            If a waypoint name is not found
+        """
+        wp_name, wp_lat, wp_long = Nav.__get_wp_index()
+        names = np.asarray(names, dtype=str)
+        ref_lat = np.broadcast_to(np.asarray(ref_lat, dtype=float), names.shape)
+        ref_long = np.broadcast_to(np.asarray(ref_long, dtype=float), names.shape)
+        # Candidate range of each name
+        lo = np.searchsorted(wp_name, names, side='left')
+        count = np.searchsorted(wp_name, names, side='right') - lo
+        if np.any(count == 0):
+            raise ValueError("Waypoint not found: " + str(names[count == 0]))
+        # Distance to all candidates of all names
+        group = np.repeat(np.arange(len(names)), count)
+        candidate = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count) + np.repeat(lo, count)
+        dist = Cal.cal_great_circle_dist(ref_lat[group], ref_long[group], wp_lat[candidate], wp_long[candidate])
+        # Nearest candidate of each name (first in data order if equal)
+        order = np.lexsort((dist, group))
+        nearest = candidate[order[np.cumsum(count) - count]]
+        return wp_lat[nearest], wp_long[nearest]
+
+    __wp_grid = None
+    """Spatial index of all waypoints (fixes followed by navaids) with their names (SpatialIndex, name), built on first use"""
+
+    __airport_grid = None
+    """Spatial index of all runways in airports data, built on first use"""
+
+    @staticmethod
+    def __get_wp_grid():
+        """
+        Get the spatial index of all waypoints (fix and navaid).
+
+        Returns
+        -------
+        SpatialIndex, string[]
+            Spatial index and name of the waypoints
+        """
+        if Nav.__wp_grid is None:
+            lat = np.append(Nav.fix[0].to_numpy(), Nav.nav[1].to_numpy()).astype(float)
+            long = np.append(Nav.fix[1].to_numpy(), Nav.nav[2].to_numpy()).astype(float)
+            name = np.append(Nav.fix[2].to_numpy(dtype=object), Nav.nav[7].to_numpy(dtype=object))
+            Nav.__wp_grid = (SpatialIndex(lat, long), name)
+        return Nav.__wp_grid
+
+    @staticmethod
+    def __get_wp(index):
+        """
+        Get [lat, long, name] of waypoints given their index in the spatial index.
+        """
+        grid, name = Nav.__get_wp_grid()
+        return np.column_stack((grid.lat[index].astype(object), grid.long[index].astype(object), name[index]))
 
     @staticmethod
     def get_wp_in_area(lat1, long1, lat2, long2):
@@ -175,9 +530,9 @@ class Nav:
         lat1 : float
             Latitude 1 of area (South)
         long1 : float
-            Longitude 1 of area (West)
+            Longitude 1 of area (West). The area crosses the antimeridian if long1 > long2.
         lat2 : float
-            Latitude 2 of area (North)
+            Latitude 2 of area (North). The area extends to the north pole if lat1 > lat2.
         long2 : float
             Longitude 2 of area (East)
 
@@ -186,31 +541,245 @@ class Nav:
         [lat, long, name] : [float[], float[], string[]]
             [Latitude, Longitude, Name] array of all waypoints in the area
         """
-        if lat1 < lat2 and long1 < long2:
-            # If normal condition
-            fix = Nav.fix[(Nav.fix.iloc[:, 0].between(lat1, lat2)) & (
-                Nav.fix.iloc[:, 1].between(long1, long2))].iloc[:, 0:3].to_numpy()
-            nav = Nav.nav[(Nav.nav.iloc[:, 1].between(lat1, lat2)) & (
-                Nav.nav.iloc[:, 2].between(long1, long2))].iloc[:, [1, 2, 7]].to_numpy()
-        elif lat1 < lat2 and long1 > long2:
-            # If long1 = 170 and long2 = -170
-            fix = Nav.fix[(Nav.fix.iloc[:, 0].between(lat1, lat2)) & (Nav.fix.iloc[:, 1].between(
-                long1, 180.0) | Nav.fix.iloc[:, 1].between(-180.0, long2))].iloc[:, 0:3].to_numpy()
-            nav = Nav.nav[(Nav.nav.iloc[:, 1].between(lat1, lat2)) & (Nav.nav.iloc[:, 2].between(
-                long1, 180.0) | Nav.nav.iloc[:, 2].between(-180.0, long2))].iloc[:, [1, 2, 7]].to_numpy()
-        elif lat1 > lat2 and long1 < long2:
-            # If lat1 = 80 and lat2 = -80
-            fix = Nav.fix[(Nav.fix.iloc[:, 0].between(lat1, 90.0) | Nav.fix.iloc[:, 0].between(
-                lat1, -90.0)) & (Nav.fix.iloc[:, 1].between(long1, long2))].iloc[:, 0:3].to_numpy()
-            nav = Nav.nav[(Nav.nav.iloc[:, 1].between(lat1, 90.0) | Nav.nav.iloc[:, 1].between(
-                lat1, -90.0)) & (Nav.nav.iloc[:, 2].between(long1, long2))].iloc[:, [1, 2, 7]].to_numpy()
-        else:
-            # If lat1 = 80 and lat2 = -80 and if long1 = 170 and long2 = -170
-            fix = Nav.fix[(Nav.fix.iloc[:, 0].between(lat1, 90.0) | Nav.fix.iloc[:, 0].between(lat1, -90.0)) & (
-                Nav.fix.iloc[:, 1].between(long1, 180.0) | Nav.fix.iloc[:, 1].between(-180.0, long2))].iloc[:, 0:3].to_numpy()
-            nav = Nav.nav[(Nav.nav.iloc[:, 1].between(lat1, 90.0) | Nav.nav.iloc[:, 1].between(lat1, -90.0)) & (
-                Nav.nav.iloc[:, 2].between(long1, 180.0) | Nav.nav.iloc[:, 2].between(-180.0, long2))].iloc[:, [1, 2, 7]].to_numpy()
-        return np.vstack((fix, nav))
+        if lat1 > lat2:
+            lat2 = 90.0
+        return Nav.__get_wp(Nav.__get_wp_grid()[0].query_box(lat1, long1, lat2, long2))
+
+    @staticmethod
+    def get_wp_in_radius(lat, long, radius):
+        """
+        Get all waypoints(fix, navaids) within a great circle distance
+
+        Parameters
+        ----------
+        lat : float
+            Latitude of center
+        long : float
+            Longitude of center
+        radius : float
+            Great circle distance [km]
+
+        Returns
+        -------
+        [lat, long, name] : [float[], float[], string[]]
+            [Latitude, Longitude, Name] array of the waypoints sorted by distance
+        """
+        return Nav.__get_wp(Nav.__get_wp_grid()[0].query_radius(lat, long, radius)[0])
+
+    @staticmethod
+    def get_nearest_wp(lat, long, k=1):
+        """
+        Get the nearest waypoints(fix, navaids)
+
+        Parameters
+        ----------
+        lat : float
+            Latitude
+        long : float
+            Longitude
+        k : int, optional
+            Number of waypoints, by default 1
+
+        Returns
+        -------
+        [lat, long, name] : [float[], float[], string[]]
+            [Latitude, Longitude, Name] array of the k nearest waypoints sorted by distance
+        """
+        return Nav.__get_wp(Nav.__get_wp_grid()[0].query_nearest(lat, long, k)[0])
+
+    __airway_graph = None
+    """Graph of all airway segments, built on first use"""
+
+    @staticmethod
+    def get_airway_graph():
+        """
+        Get the graph of all airway segments. The waypoints of the airways are located in the fix and navaid data by name, region and type.
+
+        Returns
+        -------
+        AirwayGraph
+            Airway graph
+        """
+        if Nav.__airway_graph is None:
+            awy = Nav.airway[Nav.airway[10].notna()]
+            navaid = Nav.nav[Nav.nav[0].isin([2, 3])]
+            wp_key = np.append(Nav.fix[2].astype(str) + ' ' + Nav.fix[4].astype(str) + ' 11',
+                               navaid[7].astype(str) + ' ' + navaid[9].astype(str) + ' ' + navaid[0].astype(int).astype(str))
+            wp_lat = np.append(Nav.fix[0].to_numpy(dtype=float), navaid[1].to_numpy(dtype=float))
+            wp_long = np.append(Nav.fix[1].to_numpy(dtype=float), navaid[2].to_numpy(dtype=float))
+            Nav.__airway_graph = AirwayGraph(awy[0], awy[1], awy[2].astype(int), awy[3], awy[4], awy[5].astype(int), awy[6], awy[10],
+                                             wp_key, wp_lat, wp_long)
+        return Nav.__airway_graph
+
+    @staticmethod
+    def expand_route(route):
+        """
+        Expand a route string into the waypoints of a flight plan.
+
+        A route string is a space separated list of waypoints and airways (e.g. "RASSE A1 ENVAR DCT TONGA"). An airway
+        between two waypoints is replaced by the waypoints along it. DCT (direct) is ignored. Each route string is only
+        expanded once and then kept in a cache.
+
+        Parameters
+        ----------
+        route : string
+            Route string
+
+        Returns
+        -------
+        string[]
+            Waypoint names
+
+        Raises
+        ------
+        ValueError
+            If the waypoint after an airway cannot be reached along it
+        """
+        return list(Nav.__expand_route(route))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def __expand_route(route):
+        """
+        Expand a route string (see expand_route) into a tuple of waypoint names.
+        """
+        graph = Nav.get_airway_graph()
+        tokens = [token for token in route.upper().split() if token != "DCT"]
+        names = []
+        nodes = None
+        i = 0
+        while i < len(tokens):
+            airway = graph.find_airway(tokens[i]) if names and i + 1 < len(tokens) else -1
+            if airway >= 0:
+                # Start from the node reached by the previous airway if any
+                path = graph.follow_airway(airway, nodes if nodes is not None else graph.find_nodes(names[-1]), tokens[i+1])
+                if not path:
+                    raise ValueError("Cannot follow airway " + tokens[i] + " from " + names[-1] + " to " + tokens[i+1])
+                names.extend(graph.node_name[path[1:]].tolist())
+                nodes = path[-1:]
+                i = i + 2
+            else:
+                names.append(tokens[i])
+                nodes = None
+                i = i + 1
+        return tuple(names)
+
+    @staticmethod
+    def get_shortest_route(origin, destination):
+        """
+        Get the shortest route along the airways between two waypoints. The result of each origin/destination pair is kept in a cache.
+
+        Parameters
+        ----------
+        origin : string
+            Name of the first waypoint
+        destination : string
+            Name of the last waypoint
+
+        Returns
+        -------
+        string[]
+            Waypoint names from origin to destination
+
+        Raises
+        ------
+        ValueError
+            If the destination cannot be reached from the origin along the airways
+        """
+        return list(Nav.__get_shortest_route(origin, destination))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def __get_shortest_route(origin, destination):
+        """
+        Get the shortest route (see get_shortest_route) as a tuple of waypoint names.
+        """
+        graph = Nav.get_airway_graph()
+        path, _ = graph.shortest_path(graph.find_nodes(origin), graph.find_nodes(destination))
+        if not path:
+            raise ValueError("No airway route from " + origin + " to " + destination)
+        return tuple(graph.node_name[path].tolist())
+
+    __mora_grid = None
+    """Minimum off route altitude of each 1 x 1 degree cell [ft, nan if unknown], row lat+90 and column long+180 of the south west corner, built on first use"""
+
+    @staticmethod
+    def get_mora(lat, long):
+        """
+        Get the minimum off route altitude (MORA) at many positions.
+
+        Parameters
+        ----------
+        lat : float[]
+            Latitude [deg]
+        long : float[]
+            Longitude [deg]
+
+        Returns
+        -------
+        float[]
+            Minimum off route altitude of the 1 x 1 degree grid cell of each position [ft, nan if unknown]
+        """
+        if Nav.__mora_grid is None:
+            mora = Nav.min_off_route_alt[Nav.min_off_route_alt[1].notna()]
+            # Each row holds 30 cells eastwards of its south west corner (e.g. N22E090)
+            corner = mora[0].astype(str)
+            lat0 = corner.str[1:3].astype(int).to_numpy() * np.where(corner.str[0] == 'S', -1, 1)
+            long0 = corner.str[4:7].astype(int).to_numpy() * np.where(corner.str[3] == 'W', -1, 1)
+            value = mora.iloc[:, 1:31].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float) * 100.0
+            grid = np.full((180, 360), np.nan)
+            grid[(lat0 + 90)[:, None], np.mod((long0 + 180)[:, None] + np.arange(value.shape[1]), 360)] = value
+            Nav.__mora_grid = grid
+        lat = np.asarray(lat, dtype=float)
+        long = np.asarray(long, dtype=float)
+        # Unknown positions are looked up in cell (0, 0) and masked afterwards
+        known = np.isfinite(lat) & np.isfinite(long)
+        row = np.clip(np.floor(np.where(known, lat, 0.0)).astype(int) + 90, 0, 179)
+        col = np.mod(np.floor(np.where(known, long, 0.0)).astype(int) + 180, 360)
+        return np.where(known, Nav.__mora_grid[row, col], np.nan)
+
+    __runway_index = None
+    """Runway end coordinates {(airport, normalized runway): (lat, long, alt)}, built on first use"""
+
+    @staticmethod
+    def normalize_runway(runway):
+        """
+        Normalize a runway designator so that the same runway is always written the same way.
+
+        Parameters
+        ----------
+        runway : string
+            Runway name (RW07L, 07L, 7L, rw07l)
+
+        Returns
+        -------
+        string
+            Runway designator without RW prefix and with two digits (07L)
+        """
+        runway = str(runway).strip().upper()
+        if runway.startswith("RW"):
+            runway = runway[2:]
+        if runway[:1].isdigit() and not runway[1:2].isdigit():
+            runway = "0" + runway
+        return runway
+
+    @staticmethod
+    def __get_runway_index():
+        """
+        Get the runway index. The first runway end in airports data is kept for duplicated designators.
+
+        Returns
+        -------
+        dict
+            {(airport, normalized runway): (lat, long, alt)}
+        """
+        if Nav.__runway_index is None:
+            coord = Nav.airports.iloc[:, 2:5].to_numpy(dtype=float)
+            index = {}
+            for i, (airport, runway) in enumerate(zip(Nav.airports[0].to_numpy(), Nav.airports[1].to_numpy())):
+                index.setdefault((airport, Nav.normalize_runway(runway)), tuple(coord[i]))
+            Nav.__runway_index = index
+        return Nav.__runway_index
 
     @staticmethod
     def get_runway_coord(airport, runway):
@@ -223,7 +792,7 @@ class Nav:
             ICAO code of the airport
 
         runway: string
-            Runway name (RW07L).
+            Runway name (RW07L or 07L). A partial name (07) returns the first runway containing it.
 
         Returns
         -------
@@ -231,8 +800,35 @@ class Nav:
             Latitude, Longitude, and Altitude of the runway end
         """
         # TODO: Convert MSL to Geopotentail altitude
+        coord = Nav.__get_runway_index().get((airport, Nav.normalize_runway(runway)))
+        if coord is not None:
+            return coord
         airport = Nav.airports[(Nav.airports[0].to_numpy() == airport)]
-        return tuple(airport[airport[1].str.contains(runway)].iloc[0, 2:5])
+        return tuple(airport[airport[1].astype(str).str.contains(runway)].iloc[0, 2:5])
+
+    @staticmethod
+    def get_runway_coords(airports, runways):
+        """
+        Get runway coordinates of many runways
+
+        Parameters
+        ----------
+        airports : string[]
+            ICAO code of the airport of each runway
+
+        runways: string[]
+            Runway names (RW07L or 07L)
+
+        Returns
+        -------
+        lat, Long, alt: float[], float[], float[]
+            Latitude, Longitude, and Altitude of the runway ends
+        """
+        # Look up each distinct runway once
+        keys = list(zip(airports, runways))
+        coords = {key: Nav.get_runway_coord(*key) for key in set(keys)}
+        lat, long, alt = np.array([coords[key] for key in keys], dtype=float).reshape(-1, 3).T
+        return lat, long, alt
 
     @staticmethod
     def find_closest_airport_runway(lat, long):
@@ -253,11 +849,10 @@ class Nav:
         Runway : string
             Runway Name
         """
-        tmp = Nav.airports[(Nav.airports.iloc[:, 2].between(
-            lat-0.1, lat+0.1)) & (Nav.airports.iloc[:, 3].between(long-0.1, long+0.1))]
-        dist = Cal.cal_great_circle_dist(
-            tmp.iloc[:, 2].to_numpy(), tmp.iloc[:, 3].to_numpy(), lat, long)
-        return tmp.iloc[np.argmin(dist)].tolist()
+        if Nav.__airport_grid is None:
+            Nav.__airport_grid = SpatialIndex(Nav.airports.iloc[:, 2].to_numpy(dtype=float), Nav.airports.iloc[:, 3].to_numpy(dtype=float))
+        index, _ = Nav.__airport_grid.query_nearest(lat, long)
+        return Nav.airports.iloc[index[0]].tolist()
 
     @staticmethod
     def get_airport_procedures(airport, procedure_type):
@@ -277,9 +872,9 @@ class Nav:
         procedure_names : string []
             Names of all procedures of the airport
         """
-        procedures = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath(
-            './data/navigation/xplane/CIFP/'+airport+'.dat'), header=None)
-        return procedures[procedures[0].str.contains(procedure_type)][2].unique()
+        # Rows with an empty type field are read as NaN
+        return np.array([name for name, rows in Nav.get_cifp(airport).items()
+                         if any(isinstance(t, str) and procedure_type in t for t in rows['type'])], dtype=object)
 
     @staticmethod
     def get_procedure(airport, runway, procedure, appch="", iaf=""):
@@ -329,62 +924,99 @@ class Nav:
             Terminal procedures (SID/STAR/Approach/Runway) https://developer.x-plane.com/wp-content/uploads/2019/01/XP-CIFP1101-Spec.pd f
             https://wiki.flightgear.org/User:Www2/XP11_Data_Specification
         """
-        procedures = pd.read_csv(Path(__file__).parent.parent.resolve().joinpath(
-            './data/navigation/xplane/CIFP/'+airport+'.dat'), header=None)
+        rows = Nav.get_cifp(airport).get(procedure)
+        if rows is None:
+            return [], [], np.array([]), [], []
 
         if appch == "":
             # SID/STAR
-            procedure_df = procedures[(procedures[2] == procedure) & (
-                procedures[3].str.contains(runway))]
-            if procedure_df.empty:
-                procedure_df = procedures[procedures[2] == procedure]
+            procedure_rows = rows[np.array([isinstance(t, str) and runway in t for t in rows['transition']], dtype=bool)]
+            if len(procedure_rows) == 0:
+                procedure_rows = rows
         elif appch == "A":
             # Initial Approach
-            procedure_df = procedures[(procedures[1] == appch) & (
-                procedures[2] == procedure) & (procedures[3] == iaf)]
+            procedure_rows = rows[(rows['route_type'] == appch) & (rows['transition'] == iaf)]
         elif appch == "I":
             # Final Approach
-            procedure_df = procedures[(procedures[1] == appch) & (
-                procedures[2] == procedure)]
+            procedure_rows = rows[rows['route_type'] == appch]
 
         # Remove missed approach waypoints
-        index = procedure_df[procedure_df[8].str.contains('M')].index
-        if len(index) > 0:
-            procedure_df = procedure_df.loc[:index[0]-1, :]
+        missed = np.flatnonzero(procedure_rows['missed_approach'])
+        if len(missed) > 0:
+            procedure_rows = procedure_rows[:missed[0]]
 
-        alt_restriction_1 = []
-        alt_restriction_2 = []
-        speed_restriction = []
+        return procedure_rows['fix'].tolist(), procedure_rows['alt_restriction_type'].tolist(), np.array(procedure_rows['alt_restriction']), procedure_rows['speed_restriction_type'].tolist(), procedure_rows['speed_restriction'].tolist()
 
-        for val in procedure_df[23].values:
-            if "FL" in val:
-                alt_restriction_1.append(float(val.replace("FL", ""))*100.0)
-            else:
-                if val == "     ":
-                    alt_restriction_1.append(-1)
-                else:
-                    alt_restriction_1.append(float(val))
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def get_cifp(airport):
+        """
+        Get the terminal procedures of an airport. Each airport is read and parsed once and then kept in a LRU cache.
+
+        The rows are grouped by procedure name, so a procedure is found by one dictionary lookup. The result is
+        shared by all callers and is read-only (the mapping is a MappingProxyType and the arrays are not writeable).
+
+        Parameters
+        ----------
+        airport : string
+            ICAO code of the airport
 
-        for val in procedure_df[24].values:
+        Returns
+        -------
+        {procedure name: numpy structured array}
+            Rows of CIFP/<airport>.dat of each procedure in file order with the fields type (SID/STAR/APPCH:sequence),
+            route_type, transition, fix, alt_restriction_type, alt_restriction (lowest) [ft, -1 if none],
+            speed_restriction_type, speed_restriction [kt, -1 if none] and missed_approach [bool].
+        """
+        Nav.install()
+        procedures = pd.read_csv(Nav.data_path.joinpath('CIFP', airport+'.dat'), header=None)
+
+        def parse_alt(val):
+            if not isinstance(val, str):
+                return np.nan
             if "FL" in val:
-                alt_restriction_2.append(float(val.replace("FL", ""))*100.0)
-            else:
-                if val == "     ":
-                    alt_restriction_2.append(-1)
-                else:
-                    alt_restriction_2.append(float(val))
+                return float(val.replace("FL", ""))*100.0
+            if val == "     ":
+                return -1.0
+            try:
+                return float(val)
+            except ValueError:
+                return np.nan
 
-        for val in procedure_df[27].values:
+        def parse_speed(val):
+            if not isinstance(val, str):
+                return np.nan
             if val == "   ":
-                speed_restriction.append(-1)
-            else:
-                speed_restriction.append(float(val))
+                return -1.0
+            try:
+                return float(val)
+            except ValueError:
+                return np.nan
 
+        alt_restriction_1 = procedures[23].map(parse_alt).astype(float) if 23 in procedures else np.nan
+        alt_restriction_2 = procedures[24].map(parse_alt).astype(float) if 24 in procedures else np.nan
+        speed_restriction = procedures[27].map(parse_speed).astype(float) if 27 in procedures else np.nan
         # Assume a lowest alt restriction
-        alt_restriction = np.where(np.array(alt_restriction_2) != -1, np.minimum(
-            alt_restriction_1, alt_restriction_2), alt_restriction_1)
+        alt_restriction = np.where(alt_restriction_2 != -1, np.minimum(alt_restriction_1, alt_restriction_2), alt_restriction_1)
+
+        table = np.empty(len(procedures), dtype=[('type', object), ('route_type', object), ('transition', object), ('fix', object),
+                                                 ('alt_restriction_type', object), ('alt_restriction', float),
+                                                 ('speed_restriction_type', object), ('speed_restriction', float), ('missed_approach', bool)])
+        table['type'] = procedures[0]
+        table['route_type'] = procedures[1]
+        table['transition'] = procedures[3]
+        table['fix'] = procedures[4]
+        table['alt_restriction_type'] = procedures[22]
+        table['alt_restriction'] = alt_restriction
+        table['speed_restriction_type'] = procedures[26]
+        table['speed_restriction'] = speed_restriction
+        table['missed_approach'] = procedures[8].str.contains('M', na=False) if 8 in procedures else False
 
-        return procedure_df[4].values.tolist(), procedure_df[22].values.tolist(), alt_restriction, procedure_df[26].values.tolist(), speed_restriction
+        # Group the rows by procedure name (stable sort keeps the file order inside each procedure)
+        code, names = pd.factorize(procedures[2])
+        table = table[np.argsort(code, kind='stable')]
+        table.flags.writeable = False
+        return types.MappingProxyType(dict(zip(names, np.split(table, np.cumsum(np.bincount(code, minlength=len(names)))[:-1]))))
 
     @staticmethod
     def get_holding_procedure(fix, region):
@@ -1,285 +1,338 @@
 """Aircraft performance class calculation using BADA 3.15"""
 from pathlib import Path
+import hashlib
+import os
+import shutil
 import numpy as np
 
+from airtrafficsim.core.storage import Storage, StorageMixin
 from airtrafficsim.utils.enums import APSpeedMode, EngineType, Config, FlightPhase, VerticalMode
 from airtrafficsim.utils.unit_conversion import Unit
 
 
-class Bada:
+class Coefficient:
+    """
+    BADA coefficient of the aircraft types, declared as a class attribute of Bada.
+
+    The coefficients are kept once per aircraft type in the table Bada.coefficients (one row per type id and one
+    column per coefficient). Reading the attribute gathers the coefficient of every aircraft by its type id.
+    """
+
+    def __set_name__(self, owner, name):
+        prefix = '_' + owner.__name__ + '__'
+        self.name = name[len(prefix):] if name.startswith(prefix) else name
+        """Name of the coefficient (without name mangling)"""
+        self.column = len(owner.coefficient_names)
+        """Column of the coefficient in the coefficient table"""
+        owner.coefficient_names.append(self.name)
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.coefficients[instance.type_id, self.column]
+
+
+class Bada(StorageMixin):
     """
     BADA Performance class 
     """
 
-    def __init__(self):
+    coefficient_names = []
+    """Names of the coefficients of an aircraft type, i.e. the columns of Bada.coefficients (filled by Coefficient)"""
+
+    # ----------------------------  Operations Performance File (OPF) section 3.11 -----------------------------------------
+    # Aircraft type
+    __n_eng = Coefficient()
+    """Number of engines"""
+    __engine_type = Coefficient()
+    """engine type [Engine_type enum]"""
+
+    # Mass
+    __m_ref = Coefficient()
+    """reference mass [tones]"""
+    m_min = Coefficient()
+    """minimum mass [tones]"""
+    __m_max = Coefficient()
+    """maximum mass [tones]"""
+    __m_pyld = Coefficient()
+    """maximum payload mass [tones]"""
+
+    # Flight envelope
+    v_mo = Coefficient()
+    """maximum operating speed [knots (CAS)]"""
+    m_mo = Coefficient()
+    """maximum operating Mach number [dimensionless]"""
+    __h_mo = Coefficient()
+    """maximum opearting altitude [feet]"""
+    __h_max = Coefficient()
+    """maximum altitude at MTOW and ISA [feet]"""
+    __g_w = Coefficient()
+    """weight gradient on maximum altitude [feet/kg]"""
+    __g_t = Coefficient()
+    """temperature gradient on maximum altitude [feet/K]"""
+
+    # Aerodynamics
+    __S = Coefficient()
+    """reference wing surface area [m^2]"""
+    __c_d0_cr = Coefficient()
+    """parasitic drag coefficient (cruise) [dimensionless]"""
+    __c_d2_cr = Coefficient()
+    """induced drag coefficient (cruise) [dimensionless]"""
+    __c_d0_ap = Coefficient()
+    """parasitic drag coefficient (approach) [dimensionless]"""
+    __c_d2_ap = Coefficient()
+    """induced drag coefficient (approach) [dimensionless]"""
+    __c_d0_ld = Coefficient()
+    """parasitic drag coefficient (landing) [dimensionless]"""
+    __c_d2_ld = Coefficient()
+    """induced drag coefficient (landing) [dimensionless]"""
+    __c_d0_ldg = Coefficient()
+    """parasite darg coefficient (landing gear) [dimensionless]"""
+    __v_stall_to = Coefficient()
+    """stall speed (TO) [knots (CAS)]"""
+    __v_stall_ic = Coefficient()
+    """stall speed (IC) [knots (CAS)]"""
+    __v_stall_cr = Coefficient()
+    """stall speed (CR) [knots (CAS)]"""
+    __v_stall_ap = Coefficient()
+    """stall speed (AP) [knots (CAS)]"""
+    __v_stall_ld = Coefficient()
+    """stall speed (LD) [knots (CAS)]"""
+    __c_lbo = Coefficient()
+    """buffet onset lift coefficient (jet and TBP only) [dimensionless]"""
+    __k = Coefficient()
+    """buffeting gradient (Jet & TBP only) [dimensionless]"""
+
+    # Engine thrust
+    __c_tc_1 = Coefficient()
+    """1st maximum climb thrust coefficient [Newton (jet/piston) knot-Newton (turboprop)]"""
+    __c_tc_2 = Coefficient()
+    """2nd maximum climb thrust coefficient [feet]"""
+    __c_tc_3 = Coefficient()
+    """3rd maximum climb thrust coefficient [1/feet^2 (jet) Newton (turboprop) knot-Newton (piston)]"""
+    __c_tc_4 = Coefficient()
+    """1st thrust temperature coefficient [K]"""
+    __c_tc_5 = Coefficient()
+    """2nd thrust temperature coefficient [1/K]"""
+    __c_tdes_low = Coefficient()
+    """low altitude descent thrust coefficient [dimensionless]"""
+    __c_tdes_high = Coefficient()
+    """high altitude descent thrust coefficient [dimensionless]"""
+    __h_p_des = Coefficient()
+    """transition altitude for calculation of descent thrust [feet]"""
+    __c_tdes_app = Coefficient()
+    """approach thrust coefficient [dimensionless]"""
+    __c_tdes_ld = Coefficient()
+    """landing thrust coefficient [dimensionless]"""
+    __v_des_ref = Coefficient()
+    """reference descent speed [knots (CAS)]"""
+    __m_des_ref = Coefficient()
+    """reference descent Mach number [dimensionless]"""
+
+    # Fuel flow
+    __c_f1 = Coefficient()
+    """1st thrust specific fuel consumption coefficient [kg/(min*kN) (jet) kg/(min*kN*knot) (turboprop) kg/min (piston)]"""
+    __c_f2 = Coefficient()
+    """2nd thrust specific fuel consumption coefficient [knots]"""
+    __c_f3 = Coefficient()
+    """1st descent fuel flow coefficient [kg/min]"""
+    __c_f4 = Coefficient()
+    """2nd descent fuel flow coefficient [feet]"""
+    __c_fcr = Coefficient()
+    """cruise fuel flow correction coefficient [dimensionless]"""
+
+    # Ground movement
+    __tol = Coefficient()
+    """take-off length [m]"""
+    __ldl = Coefficient()
+    """landing length [m]"""
+    __span = Coefficient()
+    """wingspan [m]"""
+    __length = Coefficient()
+    """length [m]"""
+
+    # ----------------------------  Airline Procedure Models (APF) section 4 -----------------------------------------
+    # Climb
+    __v_cl_1 = Coefficient()
+    """standard climb CAS [knots] between 1,500/6,000 and 10,000 ft"""
+    __v_cl_2 = Coefficient()
+    """standard climb CAS [knots] between 10,000 ft and Mach transition altitude"""
+    __m_cl = Coefficient()
+    """standard climb Mach number above Mach transition altitude"""
+
+    # Cruise
+    __v_cr_1 = Coefficient()
+    """standard cruise CAS [knots] between 3,000 and 10,000 ft"""
+    __v_cr_2 = Coefficient()
+    """standard cruise CAS [knots] between 10,000 ft and Mach transition altitude"""
+    __m_cr = Coefficient()
+    """standard cruise Mach number above Mach transition altitude"""
+
+    # Descent
+    __v_des_1 = Coefficient()
+    """standard descent CAS [knots] between 3,000/6,000 and 10,000 ft"""
+    __v_des_2 = Coefficient()
+    """standard descent CAS [knots] between 10,000 ft and Mach transition altitude"""
+    __m_des = Coefficient()
+    """standard descent Mach number above Mach transition altitude"""
+
+    def __init__(self, storage=None):
         """
         Initialize BADA performance parameters 
 
         Parameters
         ----------
-        N: int
-            Number of aircrafts. Maximum size of performance array (pre-initialize to eliminate inefficient append)
-            TODO: Revise the initial estimate
+        storage : Storage, optional
+            Storage shared with the traffic class, by default a new Storage
         """
-        # ----------------------------  Operations Performance File (OPF) section 3.11 -----------------------------------------
-        # Aircraft type
-        self.__n_eng = np.zeros([0])
-        """Number of engines"""
-        self.__engine_type = np.zeros([0])
-        """engine type [Engine_type enum]"""
-        self.__wake_category = np.zeros([0], dtype="U1")
-        """wake category [Wake_category enum]"""
-
-        # Mass
-        self.__m_ref = np.zeros([0])
-        """reference mass [tones]"""
-        self.m_min = np.zeros([0])
-        """minimum mass [tones]"""
-        self.__m_max = np.zeros([0])
-        """maximum mass [tones]"""
-        self.__m_pyld = np.zeros([0])
-        """maximum payload mass [tones]"""
-
-        # Flight envelope
-        self.v_mo = np.zeros([0])
-        """maximum operating speed [knots (CAS)]"""
-        self.m_mo = np.zeros([0])
-        """maximum operating Mach number [dimensionless]"""
-        self.__h_mo = np.zeros([0])
-        """maximum opearting altitude [feet]"""
-        self.__h_max = np.zeros([0])
-        """maximum altitude at MTOW and ISA [feet]"""
-        self.__g_w = np.zeros([0])
-        """weight gradient on maximum altitude [feet/kg]"""
-        self.__g_t = np.zeros([0])
-        """temperature gradient on maximum altitude [feet/K]"""
-
-        # Aerodynamics
-        self.__S = np.zeros([0])
-        """reference wing surface area [m^2]"""
-        self.__c_d0_cr = np.zeros([0])
-        """parasitic drag coefficient (cruise) [dimensionless]"""
-        self.__c_d2_cr = np.zeros([0])
-        """induced drag coefficient (cruise) [dimensionless]"""
-        self.__c_d0_ap = np.zeros([0])
-        """parasitic drag coefficient (approach) [dimensionless]"""
-        self.__c_d2_ap = np.zeros([0])
-        """induced drag coefficient (approach) [dimensionless]"""
-        self.__c_d0_ld = np.zeros([0])
-        """parasitic drag coefficient (landing) [dimensionless]"""
-        self.__c_d2_ld = np.zeros([0])
-        """induced drag coefficient (landing) [dimensionless]"""
-        self.__c_d0_ldg = np.zeros([0])
-        """parasite darg coefficient (landing gear) [dimensionless]"""
-        self.__v_stall_to = np.zeros([0])
-        """stall speed (TO) [knots (CAS)]"""
-        self.__v_stall_ic = np.zeros([0])
-        """stall speed (IC) [knots (CAS)]"""
-        self.__v_stall_cr = np.zeros([0])
-        """stall speed (CR) [knots (CAS)]"""
-        self.__v_stall_ap = np.zeros([0])
-        """stall speed (AP) [knots (CAS)]"""
-        self.__v_stall_ld = np.zeros([0])
-        """stall speed (LD) [knots (CAS)]"""
-        self.__c_lbo = np.zeros([0])
-        """buffet onset lift coefficient (jet and TBP only) [dimensionless]"""
-        self.__k = np.zeros([0])
-        """buffeting gradient (Jet & TBP only) [dimensionless]"""
-
-        # Engine thrust
-        self.__c_tc_1 = np.zeros([0])
-        """1st maximum climb thrust coefficient [Newton (jet/piston) knot-Newton (turboprop)]"""
-        self.__c_tc_2 = np.zeros([0])
-        """2nd maximum climb thrust coefficient [feet]"""
-        self.__c_tc_3 = np.zeros([0])
-        """3rd maximum climb thrust coefficient [1/feet^2 (jet) Newton (turboprop) knot-Newton (piston)]"""
-        self.__c_tc_4 = np.zeros([0])
-        """1st thrust temperature coefficient [K]"""
-        self.__c_tc_5 = np.zeros([0])
-        """2nd thrust temperature coefficient [1/K]"""
-        self.__c_tdes_low = np.zeros([0])
-        """low altitude descent thrust coefficient [dimensionless]"""
-        self.__c_tdes_high = np.zeros([0])
-        """high altitude descent thrust coefficient [dimensionless]"""
-        self.__h_p_des = np.zeros([0])
-        """transition altitude for calculation of descent thrust [feet]"""
-        self.__c_tdes_app = np.zeros([0])
-        """approach thrust coefficient [dimensionless]"""
-        self.__c_tdes_ld = np.zeros([0])
-        """landing thrust coefficient [dimensionless]"""
-        self.__v_des_ref = np.zeros([0])
-        """reference descent speed [knots (CAS)]"""
-        self.__m_des_ref = np.zeros([0])
-        """reference descent Mach number [dimensionless]"""
-
-        # Fuel flow
-        self.__c_f1 = np.zeros([0])
-        """1st thrust specific fuel consumption coefficient [kg/(min*kN) (jet) kg/(min*kN*knot) (turboprop) kg/min (piston)]"""
-        self.__c_f2 = np.zeros([0])
-        """2nd thrust specific fuel consumption coefficient [knots]"""
-        self.__c_f3 = np.zeros([0])
-        """1st descent fuel flow coefficient [kg/min]"""
-        self.__c_f4 = np.zeros([0])
-        """2nd descent fuel flow coefficient [feet]"""
-        self.__c_fcr = np.zeros([0])
-        """cruise fuel flow correction coefficient [dimensionless]"""
-
-        # Ground movement
-        self.__tol = np.zeros([0])
-        """take-off length [m]"""
-        self.__ldl = np.zeros([0])
-        """landing length [m]"""
-        self.__span = np.zeros([0])
-        """wingspan [m]"""
-        self.__length = np.zeros([0])
-        """length [m]"""
+        self.storage = storage if storage is not None else Storage()
+        """Capacity managed storage of all per-aircraft arrays"""
+
+        # ----------------------------  Aircraft type -----------------------------------------
+        self.type_id = self.storage.column(dtype=np.int32, fill=0)
+        """Row of the aircraft type in the coefficient table [int]"""
+        self.types = {}
+        """Type id of each loaded aircraft type and mass class {(ICAO code, mass class): type id}"""
+        self.coefficients = np.empty((0, len(Bada.coefficient_names)), dtype=self.storage.precision)
+        """Coefficients of each loaded aircraft type [type id, coefficient] (columns named in Bada.coefficient_names)"""
+        self.wake_category = np.empty(0, dtype='U1')
+        """Wake category of each loaded aircraft type [J (jumbo), H (heavy), M (medium) or L (light)]"""
+
+        # Coefficients depending on the configuration, indexed by [type id, configuration enum] (built from the coefficient table)
+        self.__config_c_d0 = np.empty((0, max(Config) + 1), dtype=self.storage.precision)
+        """Parasitic drag coefficient (including landing gear) [dimensionless]"""
+        self.__config_c_d2 = np.empty((0, max(Config) + 1), dtype=self.storage.precision)
+        """Induced drag coefficient [dimensionless]"""
+        self.__config_v_min = np.empty((0, max(Config) + 1), dtype=self.storage.precision)
+        """Minimum speed [knots (CAS)]"""
+        self.__config_c_tdes = np.empty((0, max(Config) + 1), dtype=self.storage.precision)
+        """Descent thrust coefficient below the descent thrust transition altitude (0 for take off and initial climb) [dimensionless]"""
 
         # ----------------------------  Airline Procedure Models (APF) section 4 -----------------------------------------
-        # Climb
-        self.__v_cl_1 = np.zeros([0])
-        """standard climb CAS [knots] between 1,500/6,000 and 10,000 ft"""
-        self.__v_cl_2 = np.zeros([0])
-        """standard climb CAS [knots] between 10,000 ft and Mach transition altitude"""
-        self.__m_cl = np.zeros([0])
-        """standard climb Mach number above Mach transition altitude"""
-
-        # Cruise
-        self.__v_cr_1 = np.zeros([0])
-        """standard cruise CAS [knots] between 3,000 and 10,000 ft"""
-        self.__v_cr_2 = np.zeros([0])
-        """standard cruise CAS [knots] between 10,000 ft and Mach transition altitude"""
-        self.__m_cr = np.zeros([0])
-        """standard cruise Mach number above Mach transition altitude"""
-
-        # Descent
-        self.__v_des_1 = np.zeros([0])
-        """standard descent CAS [knots] between 3,000/6,000 and 10,000 ft"""
-        self.__v_des_2 = np.zeros([0])
-        """standard descent CAS [knots] between 10,000 ft and Mach transition altitude"""
-        self.__m_des = np.zeros([0])
-        """standard descent Mach number above Mach transition altitude"""
-
         # Speed schedule
-        self.climb_schedule = np.zeros([0, 8])
+        self.climb_schedule = self.storage.column(shape=(8,))
         """Standard climb CAS schedule [knots*8] (section 4.1)"""
-        self.cruise_schedule = np.zeros([0, 5])
+        self.cruise_schedule = self.storage.column(shape=(5,))
         """Standard cruise CAS schedule [knots*5] (section 4.2)"""
-        self.descent_schedule = np.zeros([0, 8])
+        self.descent_schedule = self.storage.column(shape=(8,))
         """Standard descent CAS schedule [knots*8] (section 4.3)"""
+        self.speed_breakpoints = self.storage.column(shape=(3, 7))
+        """Lower altitude bound of the speed ranges 1 to 7 of the climb, cruise and descent schedules. The last bound is raised to the transition altitude [ft]"""
+        self.speed_schedule = self.storage.column(shape=(3, 8))
+        """Speed of the altitude ranges 0 to 7 of the climb, cruise and descent schedules [knots (CAS) or Mach]"""
 
         # ----------------------------  Global Aircraft Parameters (GPF) section 5 -----------------------------------------
-        # Read data from GPF file (section 6.8)
-        # 'CD', 1X, A15, 1X, A7, 1X, A16, 1x, A29, 1X, E10.5
-        if Path(__file__).parent.parent.parent.resolve().joinpath('./data/performance/BADA/BADA.GPF').is_file():
-            GPF = np.genfromtxt(Path(__file__).parent.parent.parent.resolve().joinpath('./data/performance/BADA/BADA.GPF'),
-                                delimiter=[3, 16, 8, 17, 29, 12], dtype="U2,U15,U7,U16,U29,f8", comments="CC", autostrip=True, skip_footer=1)
+        # Read data from GPF file (section 6.8) in the compiled BADA data
+        data = Bada.load_data()
+        if len(data['gpf']) > 0:
+            GPF = data['gpf']
 
             # Maximum acceleration
-            self.__A_L_MAX_CIV = GPF[0][5]
+            self.__A_L_MAX_CIV = GPF[0]
             """Maximum longitudinal acceleration for civil flights [2 ft/s^2]"""
-            self.__A_N_MAX_CIV = GPF[1][5]
+            self.__A_N_MAX_CIV = GPF[1]
             """Maximum normal acceleration for civil flights [5 ft/s^2]"""
 
             # Bank angles
-            self.__PHI_NORM_CIV_TOLD = GPF[2][5]
+            self.__PHI_NORM_CIV_TOLD = GPF[2]
             """Nominal bank angles fpr civil flight during TO and LD [15 deg]"""
-            self.__PHI_NORM_CIV_OTHERS = GPF[3][5]
+            self.__PHI_NORM_CIV_OTHERS = GPF[3]
             """Nominal bank angles for civil flight during all other phases [30 deg]"""
-            self.__PHI_NORM_MIL = GPF[4][5]
+            self.__PHI_NORM_MIL = GPF[4]
             """Nominal bank angles for military flight (all phases) [50 deg]"""
-            self.__PHI_MAX_CIV_TOLD = GPF[5][5]
+            self.__PHI_MAX_CIV_TOLD = GPF[5]
             """Maximum bank angles for civil flight during TO and LD [25 deg]"""
-            self.__PHI_MAX_CIV_HOLD = GPF[6][5]
+            self.__PHI_MAX_CIV_HOLD = GPF[6]
             """Maximum bank angles for civil flight during HOLD [35 deg]"""
-            self.__PHI_MAX_CIV_OTHERS = GPF[7][5]
+            self.__PHI_MAX_CIV_OTHERS = GPF[7]
             """Maximum bank angles for civil flight during all other phases [45 deg]"""
-            self.__PHI_MAX_MIL = GPF[8][5]
+            self.__PHI_MAX_MIL = GPF[8]
             """Maximum bank angles for military flight (all phases) [70 deg]"""
 
             # Expedited descent (drag multiplication factor during expedited descent to simulate use of spoilers)
-            self.__C_DES_EXP = GPF[9][5]
+            self.__C_DES_EXP = GPF[9]
             """Expedited descent factor [1.6]"""
 
             # Thrust factors
-            self.__C_TCR = GPF[11][5]
+            self.__C_TCR = GPF[11]
             """Maximum cruise thrust coefficient [0.95] (postition different between GPF and user menu)"""
-            self.__C_TH_TO = GPF[10][5]
+            self.__C_TH_TO = GPF[10]
             """Take-off thrust coefficient [1.2] (no longer used since BADA 3.0) (postition different between GPF and user menu)"""
 
             # Configuration altitude threshold
-            self.__H_MAX_TO = GPF[12][5]
+            self.__H_MAX_TO = GPF[12]
             """Maximum altitude threshold for take-off [400 ft]"""
-            self.__H_MAX_IC = GPF[13][5]
+            self.__H_MAX_IC = GPF[13]
             """Maximum altitude threshold for initial climb [2,000 ft]"""
-            self.__H_MAX_AP = GPF[14][5]
+            self.__H_MAX_AP = GPF[14]
             """Maximum altitude threshold for approach [8,000 ft]"""
-            self.__H_MAX_LD = GPF[15][5]
+            self.__H_MAX_LD = GPF[15]
             """Maximum altitude threshold for landing [3,000 ft]"""
 
             # Minimum speed coefficient
-            self.__C_V_MIN = GPF[16][5]
+            self.__C_V_MIN = GPF[16]
             """Minimum speed coefficient (all other phases) [1.3]"""
-            self.__C_V_MIN_TO = GPF[17][5]
+            self.__C_V_MIN_TO = GPF[17]
             """Minimum speed coefficient for take-off [1.2]"""
 
             # Speed schedules
-            self.__V_D_CL_1 = GPF[18][5]
+            self.__V_D_CL_1 = GPF[18]
             """Climb speed increment below 1,500 ft (jet) [5 knot CAS]"""
-            self.__V_D_CL_2 = GPF[19][5]
+            self.__V_D_CL_2 = GPF[19]
             """Climb speed increment below 3,000 ft (jet) [10 knot CAS]"""
-            self.__V_D_CL_3 = GPF[20][5]
+            self.__V_D_CL_3 = GPF[20]
             """Climb speed increment below 4,000 ft (jet) [30 knot CAS]"""
-            self.__V_D_CL_4 = GPF[21][5]
+            self.__V_D_CL_4 = GPF[21]
             """Climb speed increment below 5,000 ft (jet) [60 knot CAS]"""
-            self.__V_D_CL_5 = GPF[22][5]
+            self.__V_D_CL_5 = GPF[22]
             """Climb speed increment below 6,000 ft (jet) [80 knot CAS]"""
-            self.__V_D_CL_6 = GPF[23][5]
+            self.__V_D_CL_6 = GPF[23]
             """Climb speed increment below 500 ft (turbo/piston) [20 knot CAS]"""
-            self.__V_D_CL_7 = GPF[24][5]
+            self.__V_D_CL_7 = GPF[24]
             """Climb speed increment below 1,000 ft (turbo/piston) [30 knot CAS]"""
-            self.__V_D_CL_8 = GPF[25][5]
+            self.__V_D_CL_8 = GPF[25]
             """ Climb speed increment below 1,500 ft (turbo/piston) [35 knot CAS]"""
-            self.__V_D_DSE_1 = GPF[26][5]
+            self.__V_D_DSE_1 = GPF[26]
             """Descent speed increment below 1,000 ft (jet/turboprop) [5 knot CAS]"""
-            self.__V_D_DSE_2 = GPF[27][5]
+            self.__V_D_DSE_2 = GPF[27]
             """Descent speed increment below 1,500 ft (jet/turboprop) [10 knot CAS]"""
-            self.__V_D_DSE_3 = GPF[28][5]
+            self.__V_D_DSE_3 = GPF[28]
             """Descent speed increment below 2,000 ft (jet/turboprop) [20 knot CAS]"""
-            self.__V_D_DSE_4 = GPF[29][5]
+            self.__V_D_DSE_4 = GPF[29]
             """Descent speed increment below 3,000 ft (jet/turboprop) [50 knot CAS]"""
-            self.__V_D_DSE_5 = GPF[30][5]
+            self.__V_D_DSE_5 = GPF[30]
             """Descent speed increment below 500 ft (piston) [5 knot CAS]"""
-            self.__V_D_DSE_6 = GPF[31][5]
+            self.__V_D_DSE_6 = GPF[31]
             """Descent speed increment below 1,000 ft (piston) [10 knot CAS]"""
-            self.__V_D_DSE_7 = GPF[32][5]
+            self.__V_D_DSE_7 = GPF[32]
             """Descent speed increment below 1,500 ft (piston) [20 knot CAS]"""
 
             # Holding speeds
-            self.__V_HOLD_1 = GPF[33][5]
+            self.__V_HOLD_1 = GPF[33]
             """Holding speed below FL140 [230 knot CAS]"""
-            self.__V_HOLD_2 = GPF[34][5]
+            self.__V_HOLD_2 = GPF[34]
             """Holding speed between FL140 and FL220 [240 knot CAS]"""
-            self.__V_HOLD_3 = GPF[35][5]
+            self.__V_HOLD_3 = GPF[35]
             """Holding speed between FL220 and FL340 [265 knot CAS]"""
-            self.__V_HOLD_4 = GPF[36][5]
+            self.__V_HOLD_4 = GPF[36]
             """Holding speed above FL340 [0.83 Mach]"""
 
             # Ground speed
-            self.__V_BACKTRACK = GPF[37][5]
+            self.__V_BACKTRACK = GPF[37]
             """Runway backtrack speed [35 knot CAS]"""
-            self.__V_TAXI = GPF[38][5]
+            self.__V_TAXI = GPF[38]
             """Taxi speed [15 knot CAS]"""
-            self.__V_APRON = GPF[39][5]
+            self.__V_APRON = GPF[39]
             """Apron speed [10 knot CAS]"""
-            self.__V_GATE = GPF[40][5]
+            self.__V_GATE = GPF[40]
             """Gate speed [5 knot CAS]"""
 
             # Reduced power coefficient
-            self.__C_RED_TURBO = GPF[42][5]
+            self.__C_RED_TURBO = GPF[42]
             """Maximum reduction in power for turboprops [0.25] (postition different between GPF and user menu)"""
-            self.__C_RED_PISTON = GPF[41][5]
+            self.__C_RED_PISTON = GPF[41]
             """Maximum reduction in power for pistons [0.0] (postition different between GPF and user menu)"""
-            self.__C_RED_JET = GPF[43][5]
+            self.__C_RED_JET = GPF[43]
             """Maximum reduction in power for jets [0.15]"""
 
             # Delete variable to free memory
@@ -315,199 +368,280 @@ class Bada:
 
         # ----------------------------  SYNONYM FILE FORMAT (SYNONYM.NEW) section 6.3 -----------------------------------------
         # | 'CD' | SUPPORT TYPE (-/*) | AIRCRAFT Code | MANUFACTURER | NAME OR MODEL | FILE NAME | ICAO (Y/N) |
-        self.__SYNONYM = np.genfromtxt(Path(__file__).parent.parent.parent.resolve().joinpath('./data/performance/BADA/SYNONYM.NEW'), delimiter=[3, 2, 7, 20, 25, 8, 5], names=[
-                                       'CD', 'ST', 'ACCODE', 'MANUFACTURER', 'MODEL', 'FILENAME', 'ICAO'], dtype="U2,U1,U4,U18,U25,U6,U1", comments="CC", autostrip=True, skip_footer=1, encoding='unicode_escape')
+        self.__SYNONYM = data['synonym']
+        self.__data = data
 
     def add_aircraft(self, icao, mass_class=2):
         """
-        Add one specific aircraft performance data to the performance array according to index.
+        Add one specific aircraft performance data to the last row of the performance array. The row must already be reserved in the storage.
 
         Parameters
         ----------
-        self: Performance class instance
-            Used to add data to the performance array.
-
-        ICAO: string
+        icao: string
             ICAO code of the specific aircraft.
 
-        mass: int
-            Mass of aircraft [kg]
+        mass_class: int
+            Aircraft mass for specific flight. To be used for APF. 1 = LO, 2 = AV, 3 = HI TODO: useful?
+        """
+        self.add_aircraft_batch([icao], mass_class)
+
+    def add_aircraft_batch(self, icao, mass_class=2):
+        """
+        Add performance data of a batch of aircraft to the last len(icao) rows of the performance array. The rows must already be reserved in the storage.
+
+        The coefficients of each aircraft type are only copied once into the coefficient table. Each aircraft only
+        stores the type id of its row in the table.
+
+        Parameters
+        ----------
+        icao: string[]
+            ICAO code of each aircraft.
 
         mass_class: int
             Aircraft mass for specific flight. To be used for APF. 1 = LO, 2 = AV, 3 = HI TODO: useful?
+        """
+        types, inverse = np.unique(np.asarray(icao, dtype=str), return_inverse=True)
+        rows = np.arange(self.storage.n - len(inverse), self.storage.n)
+
+        type_id = np.array([self.get_type_id(aircraft_type, mass_class) for aircraft_type in types], dtype=int)
+        self.type_id[rows] = type_id[inverse]
+        self.climb_schedule[rows] = 0.0
+        self.cruise_schedule[rows] = 0.0
+        self.descent_schedule[rows] = 0.0
+
+    def get_type_id(self, icao, mass_class=2):
+        """
+        Get the type id of an aircraft type. A row is copied from the compiled BADA data to the coefficient table if the type is not loaded yet.
+
+        Parameters
+        ----------
+        icao: string
+            ICAO code of the aircraft type.
+
+        mass_class: int
+            Aircraft mass for specific flight. To be used for APF. 1 = LO, 2 = AV, 3 = HI
 
         Returns
         -------
-        TODO:
+        int
+            Row of the aircraft type in the coefficient table
+        """
+        if (icao, mass_class) not in self.types:
+            # Get file name by searching in SYNONYM.NEW
+            row = np.where(self.__SYNONYM['ACCODE'] == icao)[
+                0][0]      # Get row index
+            file_name = self.__SYNONYM[row][5]
+
+            if(not file_name):
+                print("No aircraft in SYNONYM.NEW")
+
+            file = np.where(self.__data['file_name'] == file_name)[0]
+            if len(file) == 0:
+                raise FileNotFoundError("BADA file not found: " + file_name + ".OPF/.APF")
+            self.coefficients = np.vstack((self.coefficients, self.__data['coefficients'][file[0], mass_class].astype(self.coefficients.dtype)[None, :]))
+            self.wake_category = np.append(self.wake_category, self.__data['wake_category'][file[0]])
+            self.types[icao, mass_class] = len(self.coefficients) - 1
+            self.__build_config_coefficients()
+        return self.types[icao, mass_class]
+
+    def __build_config_coefficients(self):
+        """
+        Build the coefficient matrices indexed by [type id, configuration] from the coefficient table (Sections 3.5-3.7).
         """
+        c = {name: self.coefficients[:, i] for i, name in enumerate(Bada.coefficient_names)}
+        n_config = max(Config) + 1
+
+        # Drag coefficients. Approach and landing use the clean coefficients if their data is not set (Equation 3.6-2~4).
+        self.__config_c_d0 = np.repeat(c['c_d0_cr'][:, None], n_config, axis=1)
+        self.__config_c_d2 = np.repeat(c['c_d2_cr'][:, None], n_config, axis=1)
+        self.__config_c_d0[:, Config.APPROACH] = np.where(c['c_d2_ap'] != 0, c['c_d0_ap'], c['c_d0_cr'])
+        self.__config_c_d2[:, Config.APPROACH] = np.where(c['c_d2_ap'] != 0, c['c_d2_ap'], c['c_d2_cr'])
+        self.__config_c_d0[:, Config.LANDING] = np.where(c['c_d2_ld'] != 0, c['c_d0_ld'] + c['c_d0_ldg'], c['c_d0_cr'])
+        self.__config_c_d2[:, Config.LANDING] = np.where(c['c_d2_ld'] != 0, c['c_d2_ld'], c['c_d2_cr'])
+
+        # Minimum speed (Equation 3.5-2~3)
+        self.__config_v_min = np.repeat((self.__C_V_MIN * c['v_stall_cr'])[:, None], n_config, axis=1)
+        self.__config_v_min[:, Config.TAKEOFF] = self.__C_V_MIN_TO * c['v_stall_to']
+        self.__config_v_min[:, Config.INITIAL_CLIMB] = self.__C_V_MIN * c['v_stall_ic']
+        self.__config_v_min[:, Config.APPROACH] = self.__C_V_MIN * c['v_stall_ap']
+        self.__config_v_min[:, Config.LANDING] = self.__C_V_MIN * c['v_stall_ld']
+
+        # Descent thrust coefficient (Equation 3.7-10~12)
+        self.__config_c_tdes = np.zeros((len(self.coefficients), n_config), dtype=self.coefficients.dtype)
+        self.__config_c_tdes[:, Config.CLEAN] = c['c_tdes_low']
+        self.__config_c_tdes[:, Config.APPROACH] = c['c_tdes_app']
+        self.__config_c_tdes[:, Config.LANDING] = c['c_tdes_ld']
+
+    @staticmethod
+    def load_data():
+        """
+        Load the compiled BADA data. The data is compiled from the files in data/performance/BADA/ when it is loaded
+        for the first time or when a file is added, removed or modified.
+
+        The compiled data is saved as .npy files in data/performance/BADA/cache/<hash of the file names, sizes and
+        modification times>/ and memory mapped, so that creating a Bada instance does not read any text file.
 
-        # Get file name by searching in SYNONYM.NEW
-        row = np.where(self.__SYNONYM['ACCODE'] == icao)[
-            0][0]      # Get row index
-        file_name = self.__SYNONYM[row][5]
+        Returns
+        -------
+        dict
+            gpf : float[]
+                Values of the global aircraft parameters in BADA.GPF, empty if the file does not exist
+            synonym : numpy.recarray
+                Rows of SYNONYM.NEW (CD, ST, ACCODE, MANUFACTURER, MODEL, FILENAME, ICAO)
+            file_name : string[]
+                Name of each pair of OPF and APF files
+            coefficients : float[file, mass class, coefficient]
+                Coefficients of each file and mass class (row of APF file) in the order of Bada.coefficient_names
+            wake_category : string[]
+                Wake category of each file
+        """
+        path = Path(__file__).parent.parent.parent.resolve().joinpath('./data/performance/BADA/')
+        files = sorted(f for f in path.iterdir() if f.is_file() and not f.name.startswith('.'))
+        digest = hashlib.sha1(str(Bada.coefficient_names).encode())
+        for f in files:
+            stat = f.stat()
+            digest.update((f.name + ' ' + str(stat.st_size) + ' ' + str(stat.st_mtime_ns) + '\n').encode())
+        cache = path.joinpath('cache', digest.hexdigest())
+
+        if not cache.is_dir():
+            print("Compiling BADA data...")
+            # Write to a temporary directory first as other processes may read the cache at the same time.
+            tmp = cache.with_name(cache.name + '.' + str(os.getpid()) + '.tmp')
+            tmp.mkdir(parents=True, exist_ok=True)
+            for name, value in Bada.__compile(path, files).items():
+                np.save(tmp.joinpath(name + '.npy'), value)
+            for outdated in cache.parent.iterdir():
+                if outdated.is_dir() and not outdated.name.endswith('.tmp'):
+                    shutil.rmtree(outdated, ignore_errors=True)
+            try:
+                os.replace(tmp, cache)
+            except OSError:
+                # Compiled by another process in the meantime
+                shutil.rmtree(tmp, ignore_errors=True)
+
+        return {name: np.load(cache.joinpath(name + '.npy'), mmap_mode='r')
+                for name in ('gpf', 'synonym', 'file_name', 'coefficients', 'wake_category')}
+
+    @staticmethod
+    def __compile(path, files):
+        """
+        Parse the BADA files. See load_data() for the returned arrays.
+        """
+        names = {f.name for f in files}
 
-        if(not file_name):
-            print("No aircraft in SYNONYM.NEW")
+        # 'CD', 1X, A15, 1X, A7, 1X, A16, 1x, A29, 1X, E10.5
+        if 'BADA.GPF' in names:
+            GPF = np.genfromtxt(path.joinpath('BADA.GPF'), delimiter=[3, 16, 8, 17, 29, 12], dtype="U2,U15,U7,U16,U29,f8",
+                                comments="CC", autostrip=True, skip_footer=1)
+            gpf = np.array([row[5] for row in GPF], dtype=float)
+        else:
+            gpf = np.empty(0)
+
+        synonym = np.genfromtxt(path.joinpath('SYNONYM.NEW'), delimiter=[3, 2, 7, 20, 25, 8, 5], names=[
+                                'CD', 'ST', 'ACCODE', 'MANUFACTURER', 'MODEL', 'FILENAME', 'ICAO'], dtype="U2,U1,U4,U18,U25,U6,U1", comments="CC", autostrip=True, skip_footer=1, encoding='unicode_escape')
+
+        file_name = sorted(f.stem for f in files if f.suffix == '.OPF' and f.stem + '.APF' in names)
+        coefficients = []
+        wake_category = []
+        for f in file_name:
+            coefficient, wake = Bada.__read_performance_files(path, f)
+            coefficients.append(coefficient)
+            wake_category.append(wake)
+        n_mass = max([len(c) for c in coefficients], default=0)
+        coefficients = np.array([np.vstack((c, np.full((n_mass - len(c), len(Bada.coefficient_names)), np.nan))) for c in coefficients],
+                                dtype=float).reshape(len(file_name), n_mass, len(Bada.coefficient_names))
+
+        return {'gpf': gpf, 'synonym': synonym, 'file_name': np.array(file_name, dtype=str), 'coefficients': coefficients,
+                'wake_category': np.array(wake_category, dtype='U1')}
+
+    @staticmethod
+    def __read_performance_files(path, file_name):
+        """
+        Read the coefficients of an aircraft type from its Operations Performance File and Airlines Procedures File.
 
+        Returns
+        -------
+        coefficients : float[mass class, coefficient]
+            Coefficients of each mass class (row of APF file) in the order of Bada.coefficient_names
+        wake_category : string
+            Wake category
+        """
         # Get data from Operations Performance File (Section 6.4)
-        OPF = np.genfromtxt(Path(__file__).parent.parent.parent.resolve().joinpath('./data/performance/BADA/', file_name+'.OPF'), delimiter=[
+        OPF = np.genfromtxt(path.joinpath(file_name+'.OPF'), delimiter=[
                             3, 2, 2, 13, 13, 13, 13, 11], dtype="U2,U1,U2,f8,f8,f8,f8,f8", comments="CC", autostrip=True, skip_header=16, skip_footer=1)
 
         # 'CD', 3X, A6, 9X, I1, 12X, A9, 17X, A1 - aircraft type block - 1 data line
         # | 'CD' | ICAO | # of engine | 'engines' | engine type ( Jet,  Turboprop  or  Piston) | wake category ( J (jumbo), H (heavy), M (medium) or L (light))
-        OPF_Actype = np.genfromtxt(Path(__file__).parent.parent.parent.resolve().joinpath(
-            './data/performance/BADA/', file_name+'.OPF'), delimiter=[5, 15, 1, 12, 26, 1], dtype="U2,U6,i1,U7,U9,U1", comments="CC", autostrip=True, max_rows=1)
+        OPF_Actype = np.genfromtxt(path.joinpath(file_name+'.OPF'), delimiter=[5, 15, 1, 12, 26, 1], dtype="U2,U6,i1,U7,U9,U1", comments="CC", autostrip=True, max_rows=1)
 
         # Get data from Airlines Procedures File (Section 6.5)
         # 'CD', 25X, 2(I3, 1X), I2, 10X, 2(Ix, 1X), I2, 2X, I2, 2(1X, I3) - procedures specification block - 3 dataline
-        APF = np.genfromtxt(Path(__file__).parent.parent.parent.resolve().joinpath('./data/performance/BADA/', file_name+'.APF'), delimiter=[
+        APF = np.genfromtxt(path.joinpath(file_name+'.APF'), delimiter=[
                             6, 8, 9, 4, 4, 4, 3, 5, 4, 4, 4, 4, 3, 4, 4, 5, 4, 4, 4, 5, 7], dtype="U2,U7,U7,U2,i2,i2,i2,i2,i2,i2,i2,i2,i2,i2,i2,i2,i2,i2,i2,i2,U6", comments="CC", autostrip=True)
 
-        self.__n_eng = np.append(self.__n_eng, OPF_Actype.item()[2])
-        self.__engine_type = np.append(self.__engine_type, {
-                                       'Jet': 1, 'Turboprop': 2, 'Piston': 3}.get(OPF_Actype.item()[4]))
-        self.__wake_category = np.append(
-            self.__wake_category, OPF_Actype.item()[5])
-        self.__m_ref = np.append(self.__m_ref, OPF[0][3])
-        self.m_min = np.append(self.m_min, OPF[0][4])
-        self.__m_max = np.append(self.__m_max, OPF[0][5])
-        self.__m_pyld = np.append(self.__m_pyld, OPF[0][6])
-        self.v_mo = np.append(self.v_mo, OPF[1][3])
-        self.m_mo = np.append(self.m_mo, OPF[1][4])
-        self.__h_mo = np.append(self.__h_mo, OPF[1][5])
-        self.__h_max = np.append(self.__h_max, OPF[1][6])
-        self.__g_w = np.append(self.__g_w, OPF[0][7])
-        self.__g_t = np.append(self.__g_t, OPF[1][7])
-        self.__S = np.append(self.__S, OPF[2][3])
-        self.__c_d0_cr = np.append(self.__c_d0_cr, OPF[3][5])
-        self.__c_d2_cr = np.append(self.__c_d2_cr, OPF[3][6])
-        self.__c_d0_ap = np.append(self.__c_d0_ap, OPF[6][5])
-        self.__c_d2_ap = np.append(self.__c_d2_ap, OPF[6][6])
-        self.__c_d0_ld = np.append(self.__c_d0_ld, OPF[7][5])
-        self.__c_d2_ld = np.append(self.__c_d2_ld, OPF[7][6])
-        self.__c_d0_ldg = np.append(self.__c_d0_ldg, OPF[11][5])
-        self.__v_stall_to = np.append(self.__v_stall_to, OPF[5][4])
-        self.__v_stall_ic = np.append(self.__v_stall_ic, OPF[4][4])
-        self.__v_stall_cr = np.append(self.__v_stall_cr, OPF[3][4])
-        self.__v_stall_ap = np.append(self.__v_stall_ap, OPF[6][4])
-        self.__v_stall_ld = np.append(self.__v_stall_ld, OPF[7][4])
-        self.__c_lbo = np.append(self.__c_lbo, OPF[2][4])
-        self.__k = np.append(self.__k, OPF[2][5])
-        self.__c_tc_1 = np.append(self.__c_tc_1, OPF[14][3])
-        self.__c_tc_2 = np.append(self.__c_tc_2, OPF[14][4])
-        self.__c_tc_3 = np.append(self.__c_tc_3, OPF[14][5])
-        self.__c_tc_4 = np.append(self.__c_tc_4, OPF[14][6])
-        self.__c_tc_5 = np.append(self.__c_tc_5, OPF[14][7])
-        self.__c_tdes_low = np.append(self.__c_tdes_low, OPF[15][3])
-        self.__c_tdes_high = np.append(self.__c_tdes_high, OPF[15][4])
-        self.__h_p_des = np.append(self.__h_p_des, OPF[15][5])
-        self.__c_tdes_app = np.append(self.__c_tdes_app, OPF[15][6])
-        self.__c_tdes_ld = np.append(self.__c_tdes_ld, OPF[15][7])
-        self.__v_des_ref = np.append(self.__v_des_ref, OPF[16][3])
-        self.__m_des_ref = np.append(self.__m_des_ref, OPF[16][4])
-        self.__c_f1 = np.append(self.__c_f1, OPF[17][3])
-        self.__c_f2 = np.append(self.__c_f2, OPF[17][4])
-        self.__c_f3 = np.append(self.__c_f3, OPF[18][3])
-        self.__c_f4 = np.append(self.__c_f4, OPF[18][4])
-        self.__c_fcr = np.append(self.__c_fcr, OPF[19][3])
-        self.__tol = np.append(self.__tol, OPF[20][3])
-        self.__ldl = np.append(self.__ldl, OPF[20][4])
-        self.__span = np.append(self.__span, OPF[20][5])
-        self.__length = np.append(self.__length, OPF[20][6])
-        self.__v_cl_1 = np.append(self.__v_cl_1, APF[mass_class][4])
-        self.__v_cl_2 = np.append(self.__v_cl_2, APF[mass_class][5])
-        self.__m_cl = np.append(self.__m_cl, APF[mass_class][6]/100)
-        self.__v_cr_1 = np.append(self.__v_cr_1, APF[mass_class][9])
-        self.__v_cr_2 = np.append(self.__v_cr_2, APF[mass_class][10])
-        self.__m_cr = np.append(self.__m_cr, APF[mass_class][11]/100)
-        self.__v_des_1 = np.append(self.__v_des_1, APF[mass_class][14])
-        self.__v_des_2 = np.append(self.__v_des_2, APF[mass_class][13])
-        self.__m_des = np.append(self.__m_des, APF[mass_class][12]/100)
-        self.climb_schedule = np.append(
-            self.climb_schedule, [[0., 0., 0., 0., 0., 0., 0., 0.]], axis=0)
-        self.cruise_schedule = np.append(
-            self.cruise_schedule, [[0., 0., 0., 0., 0.]], axis=0)
-        self.descent_schedule = np.append(
-            self.descent_schedule, [[0., 0., 0., 0., 0., 0., 0., 0.]], axis=0)
-
-        # Delete variable to free memory
-        del APF
-        del OPF_Actype
-        del OPF
-
-    def del_aircraft(self, index):
-        """
-        Delete one specific aircraft performance data to the performance array according to index. This is done by setting all parameters to 0 for reuse in future.
-
-        Parameters
-        ----------
-        self: Performance class instance
-            Used to delete data to the performance array.
-
-        index: int
-            Index of array.
-        """
-        self.__n_eng = np.delete(self.__n_eng, index)
-        self.__engine_type = np.delete(self.__engine_type, index)
-        self.__wake_category = np.delete(self.__wake_category, index)
-        self.__m_ref = np.delete(self.__m_ref, index)
-        self.m_min = np.delete(self.m_min, index)
-        self.__m_max = np.delete(self.__m_max, index)
-        self.__m_pyld = np.delete(self.__m_pyld, index)
-        self.v_mo = np.delete(self.v_mo, index)
-        self.m_mo = np.delete(self.m_mo, index)
-        self.__h_mo = np.delete(self.__h_mo, index)
-        self.__h_max = np.delete(self.__h_max, index)
-        self.__g_w = np.delete(self.__g_w, index)
-        self.__g_t = np.delete(self.__g_t, index)
-        self.__S = np.delete(self.__S, index)
-        self.__c_d0_cr = np.delete(self.__c_d0_cr, index)
-        self.__c_d2_cr = np.delete(self.__c_d2_cr, index)
-        self.__c_d0_ap = np.delete(self.__c_d0_ap, index)
-        self.__c_d2_ap = np.delete(self.__c_d2_ap, index)
-        self.__c_d0_ld = np.delete(self.__c_d0_ld, index)
-        self.__c_d2_ld = np.delete(self.__c_d2_ld, index)
-        self.__c_d0_ldg = np.delete(self.__c_d0_ldg, index)
-        self.__v_stall_to = np.delete(self.__v_stall_to, index)
-        self.__v_stall_ic = np.delete(self.__v_stall_ic, index)
-        self.__v_stall_cr = np.delete(self.__v_stall_cr, index)
-        self.__v_stall_ap = np.delete(self.__v_stall_ap, index)
-        self.__v_stall_ld = np.delete(self.__v_stall_ld, index)
-        self.__c_lbo = np.delete(self.__c_lbo, index)
-        self.__k = np.delete(self.__k, index)
-        self.__c_tc_1 = np.delete(self.__c_tc_1, index)
-        self.__c_tc_2 = np.delete(self.__c_tc_2, index)
-        self.__c_tc_3 = np.delete(self.__c_tc_3, index)
-        self.__c_tc_4 = np.delete(self.__c_tc_4, index)
-        self.__c_tc_5 = np.delete(self.__c_tc_5, index)
-        self.__c_tdes_low = np.delete(self.__c_tdes_low, index)
-        self.__c_tdes_high = np.delete(self.__c_tdes_high, index)
-        self.__h_p_des = np.delete(self.__h_p_des, index)
-        self.__c_tdes_app = np.delete(self.__c_tdes_app, index)
-        self.__c_tdes_ld = np.delete(self.__c_tdes_ld, index)
-        self.__v_des_ref = np.delete(self.__v_des_ref, index)
-        self.__m_des_ref = np.delete(self.__m_des_ref, index)
-        self.__c_f1 = np.delete(self.__c_f1, index)
-        self.__c_f2 = np.delete(self.__c_f2, index)
-        self.__c_f3 = np.delete(self.__c_f3, index)
-        self.__c_f4 = np.delete(self.__c_f4, index)
-        self.__c_fcr = np.delete(self.__c_fcr, index)
-        self.__tol = np.delete(self.__tol, index)
-        self.__ldl = np.delete(self.__ldl, index)
-        self.__span = np.delete(self.__span, index)
-        self.__length = np.delete(self.__length, index)
-        self.__v_cl_1 = np.delete(self.__v_cl_1, index)
-        self.__v_cl_2 = np.delete(self.__v_cl_2, index)
-        self.__m_cl = np.delete(self.__m_cl, index)
-        self.__v_cr_1 = np.delete(self.__v_cr_1, index)
-        self.__v_cr_2 = np.delete(self.__v_cr_2, index)
-        self.__m_cr = np.delete(self.__m_cr, index)
-        self.__v_des_1 = np.delete(self.__v_des_1, index)
-        self.__v_des_2 = np.delete(self.__v_des_2, index)
-        self.__m_des = np.delete(self.__m_des, index)
-        self.climb_schedule = np.delete(self.climb_schedule, index, axis=0)
-        self.cruise_schedule = np.delete(self.cruise_schedule, index, axis=0)
-        self.descent_schedule = np.delete(self.descent_schedule, index, axis=0)
+        rows = []
+        for mass_class in range(len(APF)):
+            coefficients = {
+                'n_eng': OPF_Actype.item()[2],
+                'engine_type': {'Jet': 1, 'Turboprop': 2, 'Piston': 3}.get(OPF_Actype.item()[4]),
+                'm_ref': OPF[0][3],
+                'm_min': OPF[0][4],
+                'm_max': OPF[0][5],
+                'm_pyld': OPF[0][6],
+                'v_mo': OPF[1][3],
+                'm_mo': OPF[1][4],
+                'h_mo': OPF[1][5],
+                'h_max': OPF[1][6],
+                'g_w': OPF[0][7],
+                'g_t': OPF[1][7],
+                'S': OPF[2][3],
+                'c_d0_cr': OPF[3][5],
+                'c_d2_cr': OPF[3][6],
+                'c_d0_ap': OPF[6][5],
+                'c_d2_ap': OPF[6][6],
+                'c_d0_ld': OPF[7][5],
+                'c_d2_ld': OPF[7][6],
+                'c_d0_ldg': OPF[11][5],
+                'v_stall_to': OPF[5][4],
+                'v_stall_ic': OPF[4][4],
+                'v_stall_cr': OPF[3][4],
+                'v_stall_ap': OPF[6][4],
+                'v_stall_ld': OPF[7][4],
+                'c_lbo': OPF[2][4],
+                'k': OPF[2][5],
+                'c_tc_1': OPF[14][3],
+                'c_tc_2': OPF[14][4],
+                'c_tc_3': OPF[14][5],
+                'c_tc_4': OPF[14][6],
+                'c_tc_5': OPF[14][7],
+                'c_tdes_low': OPF[15][3],
+                'c_tdes_high': OPF[15][4],
+                'h_p_des': OPF[15][5],
+                'c_tdes_app': OPF[15][6],
+                'c_tdes_ld': OPF[15][7],
+                'v_des_ref': OPF[16][3],
+                'm_des_ref': OPF[16][4],
+                'c_f1': OPF[17][3],
+                'c_f2': OPF[17][4],
+                'c_f3': OPF[18][3],
+                'c_f4': OPF[18][4],
+                'c_fcr': OPF[19][3],
+                'tol': OPF[20][3],
+                'ldl': OPF[20][4],
+                'span': OPF[20][5],
+                'length': OPF[20][6],
+                'v_cl_1': APF[mass_class][4],
+                'v_cl_2': APF[mass_class][5],
+                'm_cl': APF[mass_class][6]/100,
+                'v_cr_1': APF[mass_class][9],
+                'v_cr_2': APF[mass_class][10],
+                'm_cr': APF[mass_class][11]/100,
+                'v_des_1': APF[mass_class][14],
+                'v_des_2': APF[mass_class][13],
+                'm_des': APF[mass_class][12]/100,
+            }
+            rows.append([coefficients[name] for name in Bada.coefficient_names])
+        return np.array(rows, dtype=float).reshape(len(APF), len(Bada.coefficient_names)), OPF_Actype.item()[5]
 
     def cal_fuel_burn(self, flight_phase, tas, thrust, alt):
         """
@@ -515,7 +649,7 @@ class Bada:
 
         Parameters
         ----------
-        flight_phase : float[]
+        flight_phase : int8[]
             Flight phase from Traffic class [Flight_phase enum]
         tas : float[]
             True airspeed [kt]
@@ -531,26 +665,22 @@ class Bada:
 
         TODO: Thrust mode -> idle descent
         """
-        a = self.__cal_nominal_fuel_flow(tas, thrust)/60.0
+        # Each fuel flow is only calculated once for all aircraft
+        nominal = self.__cal_nominal_fuel_flow(tas, thrust)
+        minimum = self.__cal_minimum_fuel_flow(alt)
         return np.select(
             condlist=[
                 flight_phase == FlightPhase.CRUISE,
                 flight_phase == FlightPhase.DESCENT,
-                flight_phase == FlightPhase.APPROACH,
-                flight_phase == FlightPhase.LANDING
+                (flight_phase == FlightPhase.APPROACH) | (flight_phase == FlightPhase.LANDING)
             ],
             choicelist=[
-                self.__cal_cruise_fuel_flow(
-                    tas, thrust)/60000.0,                      # cruise
+                self.__cal_cruise_fuel_flow(nominal)/60000.0,                     # cruise
                 # Idle descent
-                self.__cal_minimum_fuel_flow(alt)/60000.0,
-                self.__cal_approach_landing_fuel_flow(
-                    tas, thrust, alt)/60000.0,       # Approach
-                self.__cal_approach_landing_fuel_flow(
-                    tas, thrust, alt/60000.0)        # Landing
+                minimum/60000.0,
+                self.__cal_approach_landing_fuel_flow(nominal, minimum)/60000.0,  # Approach and landing
             ],
-            default=self.__cal_nominal_fuel_flow(
-                tas, thrust)/60000.0                      # Others
+            default=nominal/60000.0                                               # Others
         )
 
     def cal_thrust(self, vertical_mode, configuration, H_p, V_tas, d_T, drag, ap_speed_mode):
@@ -559,10 +689,10 @@ class Bada:
 
         Parameters
         ----------
-        vertical_mode : float[]
+        vertical_mode : int8[]
             Vertical mode from Traffic class [Vertical_mode enum]
 
-        configuration : float[] 
+        configuration : int8[] 
             Configuration from Traffic class [Configuration enum]
 
          H_p : float[]
@@ -585,6 +715,8 @@ class Bada:
         _type_
             _description_
         """
+        # Maximum climb thrust is the base of all modes
+        thr_max_climb = self.__cal_max_climb_to_thrust(H_p, V_tas, d_T)
         return np.select(
             condlist=[
                         (vertical_mode == VerticalMode.CLIMB) | (
@@ -593,11 +725,10 @@ class Bada:
                             ap_speed_mode == APSpeedMode.CONSTANT_MACH)),
                         (vertical_mode == VerticalMode.DESCENT) | ((vertical_mode == VerticalMode.LEVEL) & (ap_speed_mode == APSpeedMode.DECELERATE))],
             choicelist=[
-                self.__cal_max_climb_to_thrust(H_p, V_tas, d_T),
+                thr_max_climb,
                 # max climb thrust when acceleration, T = D at cruise, but limited at max cruise thrust
-                np.minimum(drag, self.__cal_max_cruise_thrust(
-                    self.__cal_max_climb_to_thrust(H_p, V_tas, d_T))),
-                self.__cal_descent_thrust(H_p, self.__cal_max_climb_to_thrust(H_p, V_tas, d_T), configuration)])
+                np.minimum(drag, self.__cal_max_cruise_thrust(thr_max_climb)),
+                self.__cal_descent_thrust(H_p, thr_max_climb, configuration)])
 
     # -----------------------------------------------------------------------------------------------------
     # ----------------------------- BADA Implementation----------------------------------------------------
@@ -655,7 +786,7 @@ class Bada:
 
         Parameters
         ----------
-        configuration: float[]
+        configuration: int8[]
             configuration from Traffic class [configuration enum]
 
         Returns
@@ -664,17 +795,7 @@ class Bada:
             Minimum at speed at specific configuration [knots] TODO: need to consider mass using __calculate_operating_speed?
         """
 
-        return np.select(condlist=[configuration == Config.TAKEOFF,
-                                   configuration == Config.INITIAL_CLIMB,
-                                   configuration == Config.APPROACH,
-                                   configuration == Config.LANDING],
-
-                         choicelist=[self.__C_V_MIN_TO * self.__v_stall_to,
-                                     self.__C_V_MIN * self.__v_stall_ic,
-                                     self.__C_V_MIN * self.__v_stall_ap,
-                                     self.__C_V_MIN * self.__v_stall_ld],
-
-                         default=self.__C_V_MIN * self.__v_stall_cr)
+        return self.__config_v_min[self.type_id, configuration]
 
     # ----------------------------  Aerodynamic section 3.6 -----------------------------------------
 
@@ -696,7 +817,7 @@ class Bada:
         rho: float[]
             Density [kg/m^3]
 
-        configuration: float[]
+        configuration: int8[]
             Configuration from Traffic class [Configuration enum]
 
         c_des_exp: float[]
@@ -711,27 +832,8 @@ class Bada:
         c_L = 2.0 * m * self.__G_0 / rho / \
             np.square(V_tas) / self.__S / np.cos(np.deg2rad(bank_angle))
 
-        # Drag coefficient (Equation3.6-2~4)
-        c_D = np.select(condlist=[
-            configuration == Config.APPROACH,
-            configuration == Config.LANDING
-        ],
-            choicelist=[
-            np.where(self.__c_d2_ap != 0,                                               # Approach config
-                     # If c_d0_ap / c_d2_ap are NOT set to 0 (Equation 3.6-3)
-                     self.__c_d0_ap + self.__c_d2_ap * \
-                     np.square(c_L),
-                     self.__c_d0_cr + self.__c_d2_cr * np.square(c_L)),                          # If c_d0_ap / c_d2_ap are  set to 0 (Equation 3.6-2)
-            np.where(self.__c_d2_ld != 0,                                               # Landing config
-                     # If c_d0_ld / c_d2_ld are NOT set to 0 (Equation 3.6-4)
-                     self.__c_d0_ld + self.__c_d0_ldg + \
-                     self.__c_d2_ld * np.square(c_L),
-                     self.__c_d0_cr + self.__c_d2_cr * np.square(c_L))                           # If c_d0_ld / c_d2_ld are set to 0 (Equation 3.6-2)
-        ],
-            # All configs except for approach and landing. (Equation 3.6-2)
-            default=self.__c_d0_cr + \
-            self.__c_d2_cr * np.square(c_L),
-        )
+        # Drag coefficient (Equation3.6-2~4) with the coefficients of the configuration
+        c_D = self.__config_c_d0[self.type_id, configuration] + self.__config_c_d2[self.type_id, configuration] * np.square(c_L)
 
         # Drag force
         return np.where(V_tas == 0.0, 0.0, c_D * rho * np.square(V_tas) * self.__S / 2.0 * c_des_exp)
@@ -859,14 +961,8 @@ class Bada:
         return np.where(H_p > np.where(self.__c_d2_ap != 0, np.clip(self.__h_p_des, self.__H_MAX_AP, None), self.__h_p_des),
                         # If H_p > H_p_des
                         self.__c_tdes_high * Thr_max_climb,     # Equation 3.7-9
-                        # Else
-                        np.select([configuration == Config.CLEAN,
-                                   configuration == Config.APPROACH,
-                                   configuration == Config.LANDING],
-
-                                  [self.__c_tdes_low * Thr_max_climb,       # Equation 3.7-10
-                                   self.__c_tdes_app * Thr_max_climb,       # Equation 3.7-11
-                                   self.__c_tdes_ld * Thr_max_climb]))      # Equation 3.7-12
+                        # Else (Equation 3.7-10~12)
+                        self.__config_c_tdes[self.type_id, configuration] * Thr_max_climb)
 
     # ----------------------------  Reduced climb power section 3.8 -----------------------------------------
 
@@ -954,20 +1050,17 @@ class Bada:
                         # Piston
                         self.__c_f3)                                # Equation 3.9-8
 
-    def __cal_approach_landing_fuel_flow(self, V_tas, Thr, H_p):
+    def __cal_approach_landing_fuel_flow(self, f_nom, f_min):
         """
         Calculate fuel flow for approach and landing (equations 3.9-5 and 3.9-8)
 
         Parameters
         ----------
-        V_tas: float[]
-            True airspeed [kt] TODO: Different unit
+        f_nom: float[]
+            Nominal fuel flow [kg/min] (obtained from __cal_nominal_fuel_flow())
 
-        Thr: float[]
-            Thrust acting parallel to the aircraft velocity vector [N]
-
-        H_p: float[]
-            Geopotential pressuer altitude [ft] TODO: Different uni
+        f_min: float[]
+            Minimum fuel flow [kg/min] (obtained from __cal_minimum_fuel_flow())
 
         Returns
         -------
@@ -976,37 +1069,25 @@ class Bada:
         """
         return np.where(self.__engine_type != EngineType.PISTON,
                         # Non piston
-                        np.maximum(self.__cal_nominal_fuel_flow(
-                            V_tas, Thr), self.__cal_minimum_fuel_flow(H_p)),  # Equation 3.9-5
+                        np.maximum(f_nom, f_min),   # Equation 3.9-5
                         # Piston
-                        self.__cal_minimum_fuel_flow(H_p))                                                          # Equation 3.9-8
+                        f_min)                      # Equation 3.9-8
 
-    def __cal_cruise_fuel_flow(self, V_tas, Thr):
+    def __cal_cruise_fuel_flow(self, f_nom):
         """
         Calculate fuel flow for cruise (equations 3.9-6 and 3.9-9)
 
         Parameters
         ----------
-        V_tas: float[]
-            True airspeed [kt] TODO: Different unit
-
-        Thr: float[]
-            Thrust acting parallel to the aircraft velocity vector [N]
+        f_nom: float[]
+            Nominal fuel flow [kg/min] (obtained from __cal_nominal_fuel_flow())
 
         Returns
         -------
         f_cr: float[]
             Cruise fuel flow [kg/min]
         """
-        return np.select([self.__engine_type == EngineType.JET,
-                          self.__engine_type == EngineType.TURBOPROP,
-                          self.__engine_type == EngineType.PISTON],
-
-                         [self.__c_f1 * (1.0 + V_tas/self.__c_f2) * Thr * self.__c_fcr,                     # Equation 3.9-6
-                          # Equation 3.9-6
-                          self.__c_f1 * (1.0 - V_tas/self.__c_f2) * \
-                          (V_tas/1000.0) * Thr * self.__c_fcr,
-                          self.__c_f1 * self.__c_fcr])                                                      # Equation 3.9-9
+        return f_nom * self.__c_fcr                 # Equation 3.9-6 and 3.9-9
 
     # ----------------------------  Airline Procedure Models section 4 -----------------------------------------
 
@@ -1017,46 +1098,61 @@ class Bada:
         Parameters
         ----------
         m: float[]
-            Aircraft mass [kg]
+            Aircraft mass of all aircraft [kg]
 
-        n: int
+        n: int[]
             Index of performance array.
         """
+        n = np.atleast_1d(n)
+        jet = (self.__engine_type[n] == EngineType.JET)[:, None]
+        zero = np.zeros(len(n))
+
         # Actual stall speed for takeoff
         v_stall_to_act = Unit.mps2kts(self.__cal_operating_speed(
             m, Unit.kts2mps(self.__v_stall_to))[n])
         # Standard climb schedule
-        if (self.__engine_type[n] == EngineType.JET):
-            # If Jet (Equation 4.1-1~5)
-            self.climb_schedule[n] = [self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_1, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_2, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_3,
-                                      self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_4, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_5, np.minimum(self.__v_cl_1[n], 250), self.__v_cl_2[n], self.__m_cl[n]]
-        else:
-            # Else if turboprop and piston (Equation 4.1-6~8)
-            self.climb_schedule[n] = [self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_6, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_7, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_8,
-                                      np.minimum(self.__v_cl_1[n], 250), self.__v_cl_2[n], self.__m_cl[n], 0.0, 0.0]
+        self.climb_schedule[n] = np.where(jet,
+                                          # If Jet (Equation 4.1-1~5)
+                                          np.column_stack([self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_1, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_2, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_3,
+                                                           self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_4, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_5, np.minimum(self.__v_cl_1[n], 250), self.__v_cl_2[n], self.__m_cl[n]]),
+                                          # Else if turboprop and piston (Equation 4.1-6~8)
+                                          np.column_stack([self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_6, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_7, self.__C_V_MIN * v_stall_to_act + self.__V_D_CL_8,
+                                                           np.minimum(self.__v_cl_1[n], 250), self.__v_cl_2[n], self.__m_cl[n], zero, zero]))
 
         # Standard cruise schedule
-        if (self.__engine_type[n] == EngineType.JET):
-            # If Jet
-            self.cruise_schedule[n] = [np.minimum(self.__v_cr_1[n], 170), np.minimum(
-                self.__v_cr_1[n], 220), np.minimum(self.__v_cr_1[n], 250), self.__v_cr_2[n], self.__m_cr[n]]
-        else:
-            # Else if turboprop and piston
-            self.cruise_schedule[n] = [np.minimum(self.__v_cr_1[n], 150), np.minimum(
-                self.__v_cr_1[n], 180), np.minimum(self.__v_cr_1[n], 250), self.__v_cr_2[n], self.__m_cr[n]]
+        self.cruise_schedule[n] = np.where(jet,
+                                           # If Jet
+                                           np.column_stack([np.minimum(self.__v_cr_1[n], 170), np.minimum(
+                                               self.__v_cr_1[n], 220), np.minimum(self.__v_cr_1[n], 250), self.__v_cr_2[n], self.__m_cr[n]]),
+                                           # Else if turboprop and piston
+                                           np.column_stack([np.minimum(self.__v_cr_1[n], 150), np.minimum(
+                                               self.__v_cr_1[n], 180), np.minimum(self.__v_cr_1[n], 250), self.__v_cr_2[n], self.__m_cr[n]]))
 
         # Actual stall speed for landing TODO: consider fuel mass?
         v_stall_ld_act = Unit.mps2kts(self.__cal_operating_speed(
             m, Unit.kts2mps(self.__v_stall_ld))[n])
         # Standard descent schedule
-        if (self.__engine_type[n] != EngineType.PISTON):
-            # If Jet and Turboprop (Equation 4.3-1~4)
-            self.descent_schedule[n] = [self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_1, self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_2, self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_3,
-                                        self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_4, np.minimum(self.__v_des_1[n], 220), np.minimum(self.__v_des_1[n], 250), self.__v_des_2[n], self.__m_des[n]]
-        else:
-            # Else if Piston (Equation 4.3-5~7)
-            self.descent_schedule[n] = [self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_5, self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_6, self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_7,
-                                        self.__v_des_1[n], self.__v_des_2[n], self.__m_des[n], 0.0, 0.0]
+        self.descent_schedule[n] = np.where((self.__engine_type[n] != EngineType.PISTON)[:, None],
+                                            # If Jet and Turboprop (Equation 4.3-1~4)
+                                            np.column_stack([self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_1, self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_2, self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_3,
+                                                             self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_4, np.minimum(self.__v_des_1[n], 220), np.minimum(self.__v_des_1[n], 250), self.__v_des_2[n], self.__m_des[n]]),
+                                            # Else if Piston (Equation 4.3-5~7)
+                                            np.column_stack([self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_5, self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_6, self.__C_V_MIN * v_stall_ld_act + self.__V_D_DSE_7,
+                                                             self.__v_des_1[n], self.__v_des_2[n], self.__m_des[n], zero, zero]))
+
+        # Breakpoint tables of the schedules. Shorter schedules are padded at the low end with ranges that are never used.
+        jet = jet[:, 0]
+        piston = self.__engine_type[n] == EngineType.PISTON
+        none = -np.inf
+        self.speed_breakpoints[n, 0] = np.where(jet[:, None], [1500.0, 3000.0, 4000.0, 5000.0, 6000.0, 10000.0, 10000.0],
+                                                [none, none, 500.0, 1000.0, 1500.0, 10000.0, 10000.0])
+        self.speed_schedule[n, 0] = np.where(jet[:, None], self.climb_schedule[n], np.roll(self.climb_schedule[n], 2, axis=1))
+        self.speed_breakpoints[n, 1] = np.where(jet[:, None], [none, none, none, 3000.0, 6000.0, 14000.0, 14000.0],
+                                                [none, none, none, 3000.0, 6000.0, 10000.0, 10000.0])
+        self.speed_schedule[n, 1] = np.column_stack([zero, zero, zero, self.cruise_schedule[n]])
+        self.speed_breakpoints[n, 2] = np.where(piston[:, None], [none, none, 500.0, 1000.0, 1500.0, 10000.0, 10000.0],
+                                                [1000.0, 1500.0, 2000.0, 3000.0, 6000.0, 10000.0, 10000.0])
+        self.speed_schedule[n, 2] = np.where(piston[:, None], np.roll(self.descent_schedule[n], 2, axis=1), self.descent_schedule[n])
 
     def get_procedure_speed(self, H_p, H_p_trans, flight_phase):
         """
@@ -1073,7 +1169,7 @@ class Bada:
         m: float[]
             Aircraft mass [kg]
 
-        flight_phase: float[]
+        flight_phase: int8[]
             Flight phase from Traffic class [Flight_phase enum]
 
         Returns
@@ -1091,39 +1187,13 @@ class Bada:
 
         TODO: Bound the speed schedule form the minimum and maximum speed.
         """
-        return np.select([
-            flight_phase <= FlightPhase.CLIMB,
-            flight_phase == FlightPhase.CRUISE,
-            flight_phase >= FlightPhase.DESCENT
-        ], [
-            # If climb
-            np.where(self.__engine_type == EngineType.JET,
-                     # If jet
-                     np.select([(H_p < 1500), (H_p >= 1500) & (H_p < 3000), (H_p >= 3000) & (H_p < 4000), (H_p >= 4000) & (H_p < 5000), (H_p >= 5000) & (H_p < 6000), (H_p >= 6000) & (H_p < 10000), (H_p >= 10000) & (H_p < H_p_trans), (H_p >= H_p_trans)],
-                               [self.climb_schedule[:, 0], self.climb_schedule[:, 1], self.climb_schedule[:, 2], self.climb_schedule[:, 3], self.climb_schedule[:, 4], self.climb_schedule[:, 5], self.climb_schedule[:, 6], self.climb_schedule[:, 7]]),
-                     # If turboprop and piston
-                     np.select([(H_p < 500), (H_p >= 500) & (H_p < 1000), (H_p >= 1000) & (H_p < 1500), (H_p >= 1500) & (H_p < 10000), (H_p >= 10000) & (H_p < H_p_trans), (H_p >= H_p_trans)],
-                               [self.climb_schedule[:, 0], self.climb_schedule[:, 1], self.climb_schedule[:, 2], self.climb_schedule[:, 3], self.climb_schedule[:, 4], self.climb_schedule[:, 5]])
-                     ),
-            # If cruise
-            np.where(self.__engine_type == EngineType.JET,
-                     # If jet
-                     np.select([(H_p < 3000), (H_p >= 3000) & (H_p < 6000), (H_p >= 6000) & (H_p < 14000), (H_p >= 14000) & (H_p < H_p_trans), (H_p >= H_p_trans)],
-                               [self.cruise_schedule[:, 0], self.cruise_schedule[:, 1], self.cruise_schedule[:, 2], self.cruise_schedule[:, 3], self.cruise_schedule[:, 4]]),
-                     # If turboprop and piston
-                     np.select([(H_p < 3000), (H_p >= 3000) & (H_p < 6000), (H_p >= 6000) & (H_p < 10000), (H_p >= 10000) & (H_p < H_p_trans), (H_p >= H_p_trans)],
-                               [self.cruise_schedule[:, 0], self.cruise_schedule[:, 1], self.cruise_schedule[:, 2], self.cruise_schedule[:, 3], self.cruise_schedule[:, 4]])
-                     ),
-            # If descent
-            np.where(self.__engine_type != EngineType.PISTON,
-                     # If jet and turboprop
-                     np.select([(H_p < 999), (H_p >= 1000) & (H_p < 1500), (H_p >= 1500) & (H_p < 2000), (H_p >= 2000) & (H_p < 3000), (H_p >= 3000) & (H_p < 6000), (H_p >= 6000) & (H_p < 10000), (H_p >= 10000) & (H_p < H_p_trans), (H_p >= H_p_trans)],
-                               [self.descent_schedule[:, 0], self.descent_schedule[:, 1], self.descent_schedule[:, 2], self.descent_schedule[:, 3], self.descent_schedule[:, 4], self.descent_schedule[:, 5], self.descent_schedule[:, 6], self.descent_schedule[:, 7]]),
-                     # If piston
-                     np.select([(H_p < 500), (H_p >= 500) & (H_p < 1000), (H_p >= 1000) & (H_p < 1500), (H_p >= 1500) & (H_p < 10000), (H_p >= 10000) & (H_p < H_p_trans), (H_p >= H_p_trans)],
-                               [self.descent_schedule[:, 0], self.descent_schedule[:, 1], self.descent_schedule[:, 2], self.descent_schedule[:, 3], self.descent_schedule[:, 4], self.descent_schedule[:, 5]])
-                     )
-        ])
+        # Schedule of the flight phase (0: climb, 1: cruise, 2: descent)
+        rows = np.arange(len(H_p))
+        phase = np.where(flight_phase <= FlightPhase.CLIMB, 0, np.where(flight_phase == FlightPhase.CRUISE, 1, 2))
+        breakpoints = self.speed_breakpoints[rows, phase]
+        # Altitude range: number of lower bounds at or below H_p. The transition altitude only applies above the fixed bounds.
+        k = np.sum(breakpoints[:, :-1] <= H_p[:, None], axis=1) + (np.maximum(breakpoints[:, -1], H_p_trans) <= H_p)
+        return self.speed_schedule[rows, phase, k]
 
     def update_configuration(self, V_cas, H_p, vertical_mode):
         """
@@ -1135,26 +1205,29 @@ class Bada:
         H_p: float[]
             Geopotential pressuer altitude [ft]
 
-        vertical_mode : float[]
+        vertical_mode : int8[]
             Vertical mode from Traffic class [Vertical_mode enum]
 
         Returns
         -------
-        configuration : float[]
+        configuration : int8[]
             configuration from Traffic class [configuration enum]
 
         TODO: Make use of Airport Elevation in calculation
         """
+        # Minimum speed of clean and approach configuration with margin
+        v_clean = self.__config_v_min[self.type_id, Config.CLEAN] + 10.0
+        v_approach = self.__config_v_min[self.type_id, Config.APPROACH] + 10.0
         return np.select(condlist=[
             (vertical_mode == VerticalMode.CLIMB) & (H_p <= self.__H_MAX_TO),
             (vertical_mode == VerticalMode.CLIMB) & (
                 H_p > self.__H_MAX_TO) & (H_p < self.__H_MAX_IC),
             (H_p > self.__H_MAX_IC) | (vertical_mode == VerticalMode.DESCENT) & (
-                (V_cas >= (self.__C_V_MIN * self.__v_stall_cr + 10.0))),
-            (vertical_mode == VerticalMode.DESCENT) & ((V_cas < self.__C_V_MIN * self.__v_stall_cr + 10.0) & (H_p > self.__H_MAX_LD) & (H_p <= self.__H_MAX_AP)
-                                                       ) | ((V_cas < (self.__C_V_MIN * self.__v_stall_cr + 10.0)) & (V_cas >= (self.__C_V_MIN * self.__v_stall_ap + 10.0)) & (H_p <= self.__H_MAX_LD)),
+                (V_cas >= v_clean)),
+            (vertical_mode == VerticalMode.DESCENT) & ((V_cas < v_clean) & (H_p > self.__H_MAX_LD) & (H_p <= self.__H_MAX_AP)
+                                                       ) | ((V_cas < v_clean) & (V_cas >= v_approach) & (H_p <= self.__H_MAX_LD)),
             (vertical_mode == VerticalMode.DESCENT) & (H_p < self.__H_MAX_LD) & (
-                V_cas < (self.__C_V_MIN * self.__v_stall_ap + 10.0))
+                V_cas < v_approach)
         ],
             choicelist=[
             Config.TAKEOFF,
@@ -0,0 +1,226 @@
+"""Aircraft performance class calculation using OpenAP"""
+import numpy as np
+from openap import prop, Thrust, Drag, FuelFlow, WRAP
+
+from airtrafficsim.core.storage import Storage, StorageMixin
+from airtrafficsim.utils.enums import APSpeedMode, VerticalMode
+
+
+class OpenAP(StorageMixin):
+    """
+    OpenAP Performance class
+
+    The OpenAP models are created once per aircraft type and shared by all aircraft of the type. Each aircraft only
+    stores the id of its type. The OpenAP models accept numpy arrays, so drag, thrust and fuel flow are calculated
+    by one call per type with the arrays of all aircraft of that type.
+    """
+
+    def __init__(self, storage=None):
+        """
+        Initialize OpenAP performance models
+
+        Parameters
+        ----------
+        storage : Storage, optional
+            Storage shared with the traffic class, by default a new Storage
+        """
+        self.storage = storage if storage is not None else Storage()
+        """Capacity managed storage of all per-aircraft arrays"""
+
+        self.type_id = self.storage.column(dtype=np.int32, fill=0)
+        """Index of the aircraft type in the model lists [int]"""
+        self.types = {}
+        """Type id of each loaded aircraft type {ICAO code: type id}"""
+
+        # Models of each loaded aircraft type
+        self.prop_model = []
+        """Aircraft properties of each type id [dict]"""
+        self.thrust_model = []
+        """Thrust model of each type id [openap.Thrust]"""
+        self.drag_model = []
+        """Drag model of each type id [openap.Drag]"""
+        self.fuel_flow_model = []
+        """Fuel flow model of each type id [openap.FuelFlow]"""
+        self.wrap_model = []
+        """Kinematic model of each type id [openap.WRAP]"""
+
+        # Limits of each loaded aircraft type
+        self.oew = np.empty(0)
+        """Operating empty weight of each type id [kg]"""
+        self.ceiling = np.empty(0)
+        """Ceiling of each type id [m]"""
+
+    def add_aircraft_batch(self, icao):
+        """
+        Add a batch of aircraft to the last len(icao) rows of traffic array. The rows must already be reserved in the storage.
+
+        Parameters
+        ----------
+        icao : string[]
+            ICAO aircraft type of each aircraft
+        """
+        types, inverse = np.unique(np.asarray(icao, dtype=str), return_inverse=True)
+        rows = np.arange(self.storage.n - len(inverse), self.storage.n)
+        type_id = np.array([self.get_type_id(aircraft_type) for aircraft_type in types], dtype=int)
+        self.type_id[rows] = type_id[inverse]
+
+    def get_type_id(self, icao):
+        """
+        Get the type id of an aircraft type. The OpenAP models are created if the type is not loaded yet.
+
+        Parameters
+        ----------
+        icao : string
+            ICAO aircraft type
+
+        Returns
+        -------
+        int
+            Index of the aircraft type in the model lists
+        """
+        if icao not in self.types:
+            engine = prop.aircraft_engine_options(icao)[0]
+            self.prop_model.append(prop.aircraft(icao))
+            self.thrust_model.append(Thrust(ac=icao, eng=engine))
+            self.drag_model.append(Drag(ac=icao))
+            self.fuel_flow_model.append(FuelFlow(ac=icao, eng=engine))
+            self.wrap_model.append(WRAP(ac=icao))
+            self.oew = np.append(self.oew, self.prop_model[-1]['limits']['OEW'])
+            self.ceiling = np.append(self.ceiling, self.prop_model[-1]['limits']['ceiling'])
+            self.types[icao] = len(self.prop_model) - 1
+        return self.types[icao]
+
+    def __groups(self):
+        """
+        Group the aircraft by type.
+
+        Returns
+        -------
+        list
+            [(type id, rows of the aircraft of the type)]
+        """
+        order = np.argsort(self.type_id, kind='stable')
+        type_id, start = np.unique(self.type_id[order], return_index=True)
+        return list(zip(type_id, np.split(order, start[1:])))
+
+    def cal_drag(self, mass, tas, alt, vs):
+        """
+        Calculate drag in clean configuration
+
+        Parameters
+        ----------
+        mass : float[]
+            Aircraft mass [kg]
+        tas : float[]
+            True airspeed [kt]
+        alt : float[]
+            Altitude [ft]
+        vs : float[]
+            Vertical speed [ft/min]
+
+        Returns
+        -------
+        float[]
+            Drag [N]
+        """
+        drag = np.zeros(self.storage.n)
+        for t, rows in self.__groups():
+            drag[rows] = self.drag_model[t].clean(mass=mass[rows], tas=tas[rows], alt=alt[rows], vs=vs[rows])
+        return drag
+
+    def cal_thrust(self, vertical_mode, ap_speed_mode, tas, alt, drag):
+        """
+        Calculate thrust
+
+        Parameters
+        ----------
+        vertical_mode : int8[]
+            Vertical mode from Traffic class [Vertical_mode enum]
+        ap_speed_mode : int8[]
+            Speed mode from Autopilot class [AP_speed_mode enum]
+        tas : float[]
+            True airspeed [kt]
+        alt : float[]
+            Altitude [ft]
+        drag : float[]
+            Drag [N]
+
+        Returns
+        -------
+        float[]
+            Thrust [N]
+        """
+        climb = (vertical_mode == VerticalMode.CLIMB) | ((vertical_mode == VerticalMode.LEVEL) & (ap_speed_mode == APSpeedMode.ACCELERATE))
+        level = (vertical_mode == VerticalMode.LEVEL) & ((ap_speed_mode == APSpeedMode.CONSTANT_CAS) | (ap_speed_mode == APSpeedMode.CONSTANT_MACH))
+        descent = (vertical_mode == VerticalMode.DESCENT) | ((vertical_mode == VerticalMode.LEVEL) & (ap_speed_mode == APSpeedMode.DECELERATE))
+        # Max climb thrust when climbing or accelerating, T = D at constant speed, idle thrust when descending or decelerating
+        thrust = np.where(level, drag, 0.0)
+        for t, rows in self.__groups():
+            rows_climb, rows_descent = rows[climb[rows]], rows[descent[rows]]
+            if len(rows_climb) > 0:
+                thrust[rows_climb] = self.thrust_model[t].climb(tas=tas[rows_climb], alt=alt[rows_climb], roc=1000)
+            if len(rows_descent) > 0:
+                thrust[rows_descent] = self.thrust_model[t].descent_idle(tas=tas[rows_descent], alt=alt[rows_descent])
+        return thrust
+
+    def cal_fuel_burn(self, thrust):
+        """
+        Calculate fuel burn
+
+        Parameters
+        ----------
+        thrust : float[]
+            Thrust [N]
+
+        Returns
+        -------
+        float[]
+            Fuel burn [kg/s]
+        """
+        fuel_burn = np.zeros(self.storage.n)
+        for t, rows in self.__groups():
+            fuel_burn[rows] = self.fuel_flow_model[t].at_thrust(total_ac_thrust=thrust[rows])
+        return fuel_burn
+
+    def cal_transition_alt(self, n):
+        """
+        Get the Mach/CAS transition altitude of the default climb
+
+        Parameters
+        ----------
+        n : int[]
+            Index of aircraft
+
+        Returns
+        -------
+        float[]
+            Transition altitude [m]
+        """
+        return np.array([self.wrap_model[t].climb_cross_alt_conmach()['default'] for t in self.type_id[n]])*1000.0
+
+    def get_empty_weight(self, n):
+        """
+        Get operating empty weight
+
+        Parameters
+        ----------
+        n : int[]
+            Index of aircraft
+
+        Returns
+        -------
+        float[]
+            Operating empty weight [kg]
+        """
+        return self.oew[self.type_id[n]]
+
+    def get_ceiling(self):
+        """
+        Get ceiling of all aircraft
+
+        Returns
+        -------
+        float[]
+            Ceiling [m]
+        """
+        return self.ceiling[self.type_id]
@@ -1,18 +1,20 @@
 """Performance base class"""
 import numpy as np
-from openap import prop, Thrust, Drag, FuelFlow, WRAP
 
+from airtrafficsim.core.storage import Storage, StorageMixin
 from airtrafficsim.core.performance.bada import Bada
+from airtrafficsim.core.performance.openap_model import OpenAP
 from airtrafficsim.utils.enums import APSpeedMode, Config, VerticalMode
+from airtrafficsim.utils.lookup_table import LookupTable
 from airtrafficsim.utils.unit_conversion import Unit
 
 
-class Performance:
+class Performance(StorageMixin):
     """
     Performance base class
     """
 
-    def __init__(self, performance_mode):
+    def __init__(self, performance_mode, storage=None, atmosphere="formula"):
         """
         Initialize Performance base class
 
@@ -20,32 +22,43 @@ class Performance:
         ----------
         performance_mode : string, optional
             Which performance model to use [BADA, OpenAP]
+        storage : Storage, optional
+            Storage shared with the traffic class, by default a new Storage
+        atmosphere : string, optional
+            How the atmosphere model is evaluated [formula, table], by default "formula"
+
+        Notes
+        -----
+        atmosphere="table" replaces the power and exponential functions of the air pressure and the energy share
+        factor by linear interpolation in lookup tables built once here:
+
+        - Air pressure over geopotential pressure altitude (-2000 m to 26000 m, 10 m spacing). Pressure only depends
+          on the pressure altitude (T - d_T is the ISA temperature), so one table serves all temperature differentials.
+          Relative error < 4e-7.
+        - Compressibility term of the constant CAS energy share factor over Mach number squared (Mach 0 to 2, 0.001
+          spacing). Error of the energy share factor < 1e-7.
+
+        The largest error at the midpoints of each table is kept in its error attribute. Values outside the tables
+        are evaluated by the formulas. CAS/TAS conversions always use the formulas: they depend on both airspeed
+        and pressure and need two lookups, which is slower than numpy's vectorized power functions.
         """
+        self.storage = storage if storage is not None else Storage()
+        """Capacity managed storage of all per-aircraft arrays"""
 
         self.performance_mode = performance_mode
         """Whether BADA performance model is used [string]"""
 
         if (self.performance_mode == "BADA"):
-            self.perf_model = Bada()
+            self.perf_model = Bada(self.storage)
         else:
             # OpenAP
-            self.prop_model = []
-            self.thrust_model = []
-            self.drag_model = []
-            self.fuel_flow_model = []
-            self.wrap_model = []
-
-            # self.prop_model = np.empty([N], dtype=np.void)
-            # self.thrust_model = np.empty([N], dtype=np.void)
-            # self.drag_model = np.empty([N], dtype=np.void)
-            # self.fuel_flow_model = np.empty([N], dtype=np.void)
-            # self.wrap_model = np.empty([N], dtype=np.void)
-
-        self.drag = np.zeros([0])
+            self.perf_model = OpenAP(self.storage)
+
+        self.drag = self.storage.column()
         """Drag [N]"""
-        self.thrust = np.zeros([0])
+        self.thrust = self.storage.column()
         """Thrust [N]"""
-        self.esf = np.zeros([0])
+        self.esf = self.storage.column()
         """Energy share factor [dimensionless]"""
 
         # ----------------------------  Atmosphere model (Ref: BADA user menu section 3.1) -----------------------------------------
@@ -71,43 +84,44 @@ class Performance:
         self.__H_P_TROP = 11000
         """Geopotential pressure altitude [m]"""
 
+        self.atmosphere = atmosphere
+        """How the atmosphere model is evaluated [formula, table]"""
+        if (self.atmosphere == "table"):
+            self.__pressure_table = LookupTable(lambda H_p: self.__cal_air_pressure(H_p, self.cal_temperature(H_p, 0.0), 0.0), -2000.0, 26000.0, 10.0)
+            """Air pressure over geopotential pressure altitude [Pa over m]"""
+            self.__esf_cas_table = LookupTable(lambda M2: np.power(1.0 + (self.__KAPPA-1.0)/2.0 * M2, -1.0/(self.__KAPPA-1.0))
+                                               * (np.power(1.0 + (self.__KAPPA-1.0)/2.0 * M2, self.__KAPPA/(self.__KAPPA-1.0)) - 1.0), 0.0, 4.0, 0.001)
+            """Compressibility term of the constant CAS energy share factor over Mach number squared [dimensionless]"""
+
     def add_aircraft(self, icao, engine=None, mass_class=2):
         """
-        Add an aircraft to traffic array.
+        Add an aircraft to traffic array. The row must already be reserved in the storage.
 
-        Returns
-        -------
-        n: int
-            Index of the added aircraft
+        Parameters
+        ----------
+        icao : string
+            ICAO aircraft type
         """
-        self.drag = np.append(self.drag, 0.0)
-        self.thrust = np.append(self.thrust, 0.0)
-        self.esf = np.append(self.esf, 0.0)
-
-        if (self.performance_mode == "BADA"):
-            self.perf_model.add_aircraft(icao, mass_class)
-        else:
-            self.prop_model.append(prop.aircraft(icao))
-            self.thrust_model.append(Thrust(ac=icao, eng=prop.aircraft_engine_options(icao)[0]))
-            self.drag_model.append(Drag(ac=icao))
-            self.fuel_flow_model.append(FuelFlow(ac=icao, eng=prop.aircraft_engine_options(icao)[0]))
-            self.wrap_model.append(WRAP(ac=icao))
+        self.add_aircraft_batch([icao], engine, mass_class)
 
-    def del_aircraft(self, index):
+    def add_aircraft_batch(self, icao, engine=None, mass_class=2):
         """
-        Delete an aircraft from traffic array.
+        Add a batch of aircraft to the last len(icao) rows of traffic array. The rows must already be reserved in the storage.
+
+        Parameters
+        ----------
+        icao : string[]
+            ICAO aircraft type of each aircraft
         """
-        self.drag = np.delete(self.drag, index)
-        self.thrust = np.delete(self.thrust, index)
-        self.esf = np.delete(self.esf, index)
+        rows = np.arange(self.storage.n - len(icao), self.storage.n)
+        self.drag[rows] = 0.0
+        self.thrust[rows] = 0.0
+        self.esf[rows] = 0.0
+
         if (self.performance_mode == "BADA"):
-            self.perf_model.del_aircraft(index)
+            self.perf_model.add_aircraft_batch(icao, mass_class)
         else:
-            del self.prop_model[index]
-            del self.thrust_model[index]
-            del self.drag_model[index]
-            del self.fuel_flow_model[index]
-            del self.wrap_model[index]
+            self.perf_model.add_aircraft_batch(icao)
 
     def init_procedure_speed(self, mass, n):
         """
@@ -115,10 +129,10 @@ class Performance:
 
         Parameters
         ----------
-        m: float[]
-            Aircraft mass [kg]
+        mass: float[]
+            Aircraft mass of all aircraft [kg]
 
-        n: int
+        n: int[]
             Index of performance array.
         """
         if (self.performance_mode == "BADA"):
@@ -139,7 +153,7 @@ class Performance:
         m: float[]
             Aircraft mass [kg]
 
-        flight_phase: float[]
+        flight_phase: int8[]
             Flight phase from Traffic class [Flight_phase enum]
 
         Returns
@@ -206,6 +220,14 @@ class Performance:
         p\_> if above tropopause: float[]
             Pressure [Pa]
         """
+        if (self.atmosphere == "table"):
+            return self.__pressure_table(H_p)
+        return self.__cal_air_pressure(H_p, T, d_T)
+
+    def __cal_air_pressure(self, H_p, T, d_T):
+        """
+        Calculate Air Pressure by the formula (Equation 3.1-17~20). See cal_air_pressure().
+        """
         return np.where(H_p <= self.__H_P_TROP,
                         # If below or equal Geopotential pressure altitude of tropopause (Equation 3.1-18)
                         self.__P_0 * \
@@ -379,7 +401,7 @@ class Performance:
                             self.__H_P_TROP - self.__R*self.cal_temperature(self.__H_P_TROP, 0.0)/self.__G_0 * np.log(p_trans/p_trop))
 
         else:
-            return self.wrap_model[n].climb_cross_alt_conmach()['default']*1000.0
+            return self.perf_model.cal_transition_alt(n)
 
     def get_empty_weight(self, n):
         """
@@ -387,18 +409,18 @@ class Performance:
 
         Parameters
         ----------
-        n: int
+        n: int[]
             index of aircraft
 
         Returns
         -------
-        Weight: float
+        Weight: float[]
             Empty weight(BADA) or Operating empty weight(OpenAP) [kg]
         """
         if (self.performance_mode == "BADA"):
             return self.perf_model.m_min[n] * 1000.0
         else:
-            return self.prop_model[n]['limits']['OEW']
+            return self.perf_model.get_empty_weight(n)
 
     def cal_maximum_alt(self, d_T, m):
         """
@@ -420,7 +442,7 @@ class Performance:
         if (self.performance_mode == "BADA"):
             return self.perf_model.cal_maximum_altitude(d_T, m)
         else:
-            return Unit.m2ft(np.array([x['limits']['ceiling'] for x in self.prop_model]))
+            return Unit.m2ft(self.perf_model.get_ceiling())
 
     def cal_maximum_speed(self):
         """
@@ -434,7 +456,7 @@ class Performance:
         if (self.performance_mode == "BADA"):
             return self.perf_model.v_mo, self.perf_model.m_mo
         else:
-            return np.full(len(self.prop_model), 1000), np.full(len(self.prop_model), 1000)
+            return np.full(self.storage.n, 1000), np.full(self.storage.n, 1000)
 
     def cal_minimum_speed(self, configuration):
         """
@@ -442,7 +464,7 @@ class Performance:
 
         Parameters
         ----------
-        configuration: float[]
+        configuration: int8[]
             configuration from Traffic class [configuration enum]
 
         Returns
@@ -520,10 +542,10 @@ class Performance:
         M: float[]
             Mach number [dimensionless]
 
-        ap_speed_mode: float[]
+        ap_speed_mode: int8[]
             Speed mode from Autopilot class [AP_speed_mode enum]
 
-        vertical_mode: float[]
+        vertical_mode: int8[]
             Vertical mode from Traffic class [Vertical_mode enum]
 
         Returns
@@ -531,6 +553,23 @@ class Performance:
         f{M}: float[]
             Energy share factor [dimenesionless]
         """
+        if (self.atmosphere == "table"):
+            M2 = np.square(M)
+            # Temperature gradient term (Equation 3.2-9~10) and compressibility term (Equation 3.2-10~11)
+            gradient = self.__KAPPA*self.__R*self.__BETA_T_BELOW_TROP/2.0/self.__G_0 * M2 * (T-d_T)/T
+            compressibility = self.__esf_cas_table(M2)
+            return np.select(condlist=[
+                ap_speed_mode == APSpeedMode.CONSTANT_MACH,
+                ap_speed_mode == APSpeedMode.CONSTANT_CAS,
+                ap_speed_mode == APSpeedMode.ACCELERATE,
+                ap_speed_mode == APSpeedMode.DECELERATE],
+                choicelist=[
+                np.where(H_p > self.__H_P_TROP, 1.0, 1.0 / (1.0 + gradient)),
+                np.where(H_p <= self.__H_P_TROP, 1.0 / (1.0 + gradient + compressibility), 1.0 / (1.0 + compressibility)),
+                (vertical_mode == VerticalMode.CLIMB) * 0.3 + (vertical_mode == VerticalMode.DESCENT) * 1.7,
+                (vertical_mode == VerticalMode.DESCENT) * 0.3 + (vertical_mode == VerticalMode.CLIMB) * 1.7
+            ])
+
         return np.select(condlist=[
             ap_speed_mode == APSpeedMode.CONSTANT_MACH,
             ap_speed_mode == APSpeedMode.CONSTANT_CAS,
@@ -699,20 +738,10 @@ class Performance:
             self.thrust = self.perf_model.cal_thrust(
                 traffic.vertical_mode, traffic.configuration, traffic.alt, traffic.tas, traffic.weather.d_T, self.drag, traffic.ap.speed_mode)
         else:
-            self.drag = np.array([x.clean(mass=traffic.mass[i], tas=traffic.tas[i],
-                                 alt=traffic.alt[i], path_angle=traffic.path_angle[i]) for i, x in enumerate(self.drag_model)])
-            # drag.nonclean(mass=60000, tas=150, alt=100, flap_angle=20, path_angle=10, landing_gear=True)
-            self.thrust = np.array(
-                [x.cruise(tas=traffic.cas[i], alt=traffic.alt[i]) for i, x in enumerate(self.thrust_model)])
-            thrust = []
-            for i, x in enumerate(self.thrust_model):
-                if (traffic.vertical_mode[i] == VerticalMode.CLIMB) | ((traffic.vertical_mode[i] == VerticalMode.LEVEL) & (traffic.ap.speed_mode[i] == APSpeedMode.ACCELERATE)):
-                    thrust.append(x.climb(tas=traffic.tas[i], alt=traffic.alt[i], roc=1000))
-                elif (traffic.vertical_mode[i] == VerticalMode.LEVEL) & ((traffic.ap.speed_mode[i] == APSpeedMode.CONSTANT_CAS) | (traffic.ap.speed_mode[i] == APSpeedMode.CONSTANT_MACH)):
-                    thrust.append(self.drag[i])
-                elif (traffic.vertical_mode[i] == VerticalMode.DESCENT) | ((traffic.vertical_mode[i] == VerticalMode.LEVEL) & (traffic.ap.speed_mode[i] == APSpeedMode.DECELERATE)):
-                    thrust.append(x.descent_idle(tas=traffic.tas[i], alt=traffic.alt[i]))
-            self.thrust = np.array(thrust)
+            # One call of the OpenAP models per aircraft type
+            self.drag = self.perf_model.cal_drag(traffic.mass, traffic.tas, traffic.alt, traffic.vs)
+            # drag.nonclean(mass=60000, tas=150, alt=100, flap_angle=20, vs=-700, landing_gear=True)
+            self.thrust = self.perf_model.cal_thrust(traffic.vertical_mode, traffic.ap.speed_mode, traffic.tas, traffic.alt, self.drag)
             # T = thrust.takeoff(tas=100, alt=0) T = thrust.climb(tas=200, alt=20000, roc=1000)
 
         # Total Energy Model
@@ -738,7 +767,7 @@ class Performance:
 
         Parameters
         ----------
-        flight_phase : float[]
+        flight_phase : int8[]
             Flight phase from Traffic class [Flight_phase enum]
         tas : float[]
             True airspeed [kt]
@@ -755,10 +784,10 @@ class Performance:
         if (self.performance_mode == "BADA"):
             return self.perf_model.cal_fuel_burn(flight_phase, tas, self.thrust, alt)
         else:
-            return [x.at_thrust(acthr=self.thrust[i], alt=alt[i]) for i, x in enumerate(self.fuel_flow_model)]
+            return self.perf_model.cal_fuel_burn(self.thrust)
         # FF = fuelflow.takeoff(tas=100, alt=0, throttle=1)
-        # FF = fuelflow.enroute(mass=60000, tas=200, alt=20000, path_angle=3)
-        # FF = fuelflow.enroute(mass=60000, tas=230, alt=32000, path_angle=0)
+        # FF = fuelflow.enroute(mass=60000, tas=200, alt=20000, vs=1000)
+        # FF = fuelflow.enroute(mass=60000, tas=230, alt=32000, vs=0)
 
     # ----------------------------  Turning -----------------------------------------
     def cal_rate_of_turn(self, bank_angle, V_tas):
@@ -824,7 +853,7 @@ class Performance:
 
         Parameters
         ----------
-        configuration: float[]
+        configuration: int8[]
             configuration from Traffic class [configuration enum]
 
         Returns
@@ -847,12 +876,12 @@ class Performance:
         H_p: float[]
             Geopotential pressuer altitude [ft]
 
-        vertical_mode : float[]
+        vertical_mode : int8[]
             Vertical mode from Traffic class [Vertical_mode enum]
 
         Returns
         -------
-        configuration : float[]
+        configuration : int8[]
             configuration from Traffic class [configuration enum]
         """
         if (self.performance_mode == "BADA"):
@@ -0,0 +1,245 @@
+import numpy as np
+
+
+class Column:
+    """
+    Declaration of a per-aircraft array to be allocated in a Storage.
+    """
+
+    def __init__(self, dtype=np.float64, shape=(), fill=0.0):
+        """
+        Initialize column declaration.
+
+        Parameters
+        ----------
+        dtype : numpy dtype, optional
+            Data type of the column, by default np.float64
+        shape : tuple, optional
+            Shape of each row (e.g. (8,) for a speed schedule), by default ()
+        fill : any or callable, optional
+            Value of a newly added row. A callable is called once per new row (e.g. list for object columns), by default 0.0
+        """
+        self.dtype = np.dtype(dtype)
+        """Data type of the column"""
+        self.shape = tuple(shape)
+        """Shape of each row"""
+        self.fill = fill
+        """Value of a newly added row"""
+
+
+class Storage:
+    """
+    Capacity managed storage shared by all per-aircraft state arrays.
+
+    Every per-aircraft array of Traffic, Autopilot, Weather, Performance and Bada is allocated with spare capacity.
+    The attribute seen by the owner is a view of the first n (live) rows. When the storage is full, its capacity
+    is doubled so that adding an aircraft costs amortised O(1).
+
+    Scalar numeric columns are packed into one contiguous column-major block per dtype (e.g. a float64 matrix with
+    one column per state variable and a small int block), so that adding, removing or growing the state of all
+    aircraft is one operation per block. Strings, objects and multi-dimensional rows (e.g. speed schedules) keep a
+    buffer of their own.
+    """
+
+    def __init__(self, capacity=64, precision="float64"):
+        """
+        Initialize storage.
+
+        Parameters
+        ----------
+        capacity : int, optional
+            Initial number of rows allocated for each column, by default 64
+        precision : str, optional
+            Default floating point type of the columns [float64, float32], by default "float64"
+        """
+        self.precision = np.dtype(precision)
+        """Default floating point type of the columns [numpy dtype]"""
+        self.n = 0
+        """Number of live aircraft rows [int]"""
+        self.capacity = max(int(capacity), 1)
+        """Number of allocated rows of each buffer [int]"""
+        self.columns = []
+        """Registered columns [[owner, name, Column, buffer]]"""
+        self.blocks = {}
+        """Column-major block of each dtype {dtype: [block, fill values, column indices]}"""
+
+    def column(self, dtype=None, shape=(), fill=0.0):
+        """
+        Declare a per-aircraft array. Assign the result to an attribute of a StorageMixin subclass to allocate it.
+
+        Parameters
+        ----------
+        dtype : numpy dtype, optional
+            Data type of the column, by default the precision of the storage
+        shape : tuple, optional
+            Shape of each row, by default ()
+        fill : any or callable, optional
+            Value of a newly added row, by default 0.0
+
+        Returns
+        -------
+        Column
+            Column declaration
+        """
+        return Column(dtype if dtype is not None else self.precision, shape, fill)
+
+    def register(self, owner, name, column):
+        """
+        Allocate a column and expose its live view as owner.name.
+
+        Parameters
+        ----------
+        owner : StorageMixin
+            Object which owns the attribute
+        name : str
+            Attribute name
+        column : Column
+            Column declaration
+        """
+        if column.shape == () and column.dtype.kind in 'biuf' and not callable(column.fill):
+            # Append one column to the block of this dtype
+            block, fills, indices = self.blocks.get(column.dtype, [np.empty((self.capacity, 0), dtype=column.dtype, order='F'), [], []])
+            new_block = np.empty((self.capacity, block.shape[1] + 1), dtype=column.dtype, order='F')
+            new_block[:, :-1] = block
+            new_block[:, -1] = column.fill
+            fills.append(column.fill)
+            indices.append(len(self.columns))
+            self.columns.append([owner, name, column, None])
+            self.blocks[column.dtype] = [new_block, fills, indices]
+            self.__point_to_blocks()
+        else:
+            buffer = np.empty((self.capacity,) + column.shape, dtype=column.dtype)
+            self.__fill(buffer, column, 0, self.capacity)
+            self.columns.append([owner, name, column, buffer])
+        owner.__dict__.setdefault('_columns', set()).add(name)
+        owner.__dict__[name] = self.columns[-1][3][:self.n]
+
+    def add(self, k=1):
+        """
+        Add k rows at the end of all columns. Grow the buffers geometrically when full.
+
+        Parameters
+        ----------
+        k : int, optional
+            Number of rows to add, by default 1
+
+        Returns
+        -------
+        rows : int[]
+            Row indices of the added rows
+        """
+        if self.n + k > self.capacity:
+            self.__grow(self.n + k)
+        for block, fills, _ in self.blocks.values():
+            block[self.n:self.n + k] = fills
+        for _, _, column, buffer in self.__own_buffers():
+            self.__fill(buffer, column, self.n, self.n + k)
+        self.n = self.n + k
+        self.__refresh()
+        return np.arange(self.n - k, self.n)
+
+    def remove(self, rows):
+        """
+        Remove rows from all columns by moving the last live rows into their places.
+
+        The cost is proportional to the number of removed rows, not to the number of live rows. The freed rows
+        at the end of the buffers are reused by the next add(). Rows are therefore not kept in insertion order
+        and callers should identify aircraft by a stored id rather than by row index.
+
+        Parameters
+        ----------
+        rows : int or int[]
+            Row indices to be removed
+        """
+        rows = np.unique(np.asarray(rows, dtype=int))
+        n = self.n - len(rows)
+        # Removed rows inside the new live range are filled by the kept rows beyond it
+        holes = rows[rows < n]
+        movers = np.setdiff1d(np.arange(n, self.n), rows, assume_unique=True)
+        for block, _, _ in self.blocks.values():
+            block[holes] = block[movers]
+        for _, _, column, buffer in self.__own_buffers():
+            buffer[holes] = buffer[movers]
+            if column.dtype == object:
+                buffer[n:self.n] = None
+        self.n = n
+        self.__refresh()
+
+    def __own_buffers(self):
+        """
+        Get the records of the columns which are not packed in a block.
+        """
+        packed = {i for _, _, indices in self.blocks.values() for i in indices}
+        return [record for i, record in enumerate(self.columns) if i not in packed]
+
+    def __grow(self, size):
+        """
+        Reallocate all blocks and buffers with at least the given number of rows.
+
+        Parameters
+        ----------
+        size : int
+            Minimum number of rows
+        """
+        capacity = self.capacity
+        while capacity < size:
+            capacity = capacity * 2
+        for record in self.blocks.values():
+            block, fills = record[0], record[1]
+            new_block = np.empty((capacity, block.shape[1]), dtype=block.dtype, order='F')
+            new_block[:self.n] = block[:self.n]
+            new_block[self.n:] = fills
+            record[0] = new_block
+        for record in self.__own_buffers():
+            column, buffer = record[2], record[3]
+            new_buffer = np.empty((capacity,) + column.shape, dtype=column.dtype)
+            new_buffer[:self.n] = buffer[:self.n]
+            self.__fill(new_buffer, column, self.n, capacity)
+            record[3] = new_buffer
+        self.capacity = capacity
+        self.__point_to_blocks()
+
+    def __point_to_blocks(self):
+        """
+        Point the buffers of packed columns to their (contiguous) column of the blocks.
+        """
+        for block, _, indices in self.blocks.values():
+            for j, i in enumerate(indices):
+                self.columns[i][3] = block[:, j]
+
+    def __refresh(self):
+        """
+        Point the attributes of all owners to the live rows of the buffers.
+        """
+        for owner, name, _, buffer in self.columns:
+            owner.__dict__[name] = buffer[:self.n]
+
+    @staticmethod
+    def __fill(buffer, column, start, end):
+        """
+        Fill rows [start, end) of a buffer with the default value of the column.
+        """
+        if callable(column.fill):
+            for i in range(start, end):
+                buffer[i] = column.fill()
+        elif column.dtype == object:
+            buffer[start:end] = None
+        else:
+            buffer[start:end] = column.fill
+
+
+class StorageMixin:
+    """
+    Mixin for classes which keep their per-aircraft arrays in a shared Storage.
+
+    Assigning a Column (from Storage.column()) to an attribute allocates it in self.storage.
+    Assigning an array to an allocated attribute writes into the storage buffer instead of rebinding the attribute.
+    """
+
+    def __setattr__(self, name, value):
+        if isinstance(value, Column):
+            self.storage.register(self, name, value)
+        elif name in self.__dict__.get('_columns', ()):
+            self.__dict__[name][...] = value
+        else:
+            object.__setattr__(self, name, value)
@@ -1,15 +1,19 @@
 import numpy as np
+import pandas as pd
 
+from airtrafficsim.core import traffic_kernel
+from airtrafficsim.core.storage import Storage, StorageMixin
 from airtrafficsim.core.autopilot import Autopilot
 from airtrafficsim.core.weather.weather import Weather
 from airtrafficsim.core.performance.performance import Performance
+from airtrafficsim.core.navigation import Nav
 from airtrafficsim.utils.unit_conversion import Unit
 from airtrafficsim.utils.enums import FlightPhase, SpeedMode, APSpeedMode, APThrottleMode, APVerticalMode, Config, VerticalMode
 from airtrafficsim.utils.calculation import Cal
 
 
-class Traffic:
-    def __init__(self, file_name, start_time, end_time, weather_mode, performance_mode):
+class Traffic(StorageMixin):
+    def __init__(self, file_name, start_time, end_time, weather_mode, performance_mode, precision="float64", atmosphere="formula", kernel="numpy"):
         """
         Initialize base traffic array to store aircraft state variables for one timestep.
 
@@ -19,117 +23,126 @@ class Traffic:
             Output file name
         N :  int
             Total number of aircraft
+        precision : str, optional
+            Floating point type of the state arrays [float64, float32], by default "float64".
+            With float32, position (lat, long and autopilot waypoint coordinates), mass, fuel consumed and index are
+            kept in float64 while all other state arrays are stored in float32. See Environment for the error budget.
+        atmosphere : str, optional
+            How the atmosphere model is evaluated [formula, table], by default "formula". See Performance.
+        kernel : str, optional
+            Implementation of the per-aircraft kinematics of update() [numpy, numba], by default "numpy".
+            "numba" fuses them into one compiled loop (see traffic_kernel) and falls back to numpy if Numba is not installed.
+            The loop computes in float64 with libm functions, so the states are not bit-identical to numpy: in float64
+            they agree to about 1e-11 (relative), in float32 within the float32 error budget given in Environment.
         """
 
         # Memory and index control vairable:
-        self.n = 0
-        """Aircraft count"""
-        # self.N = N
-        # """Maximum aircraft count"""
-
-        # self.df = np.empty([0], dtype=[
-        #     ('index', 'i8'), ('callsign', 'U10'), ('type', 'U4'), ('configuration', 'i8'), ('flight_phase', 'i8'),
-        #     ('lat', 'f8'), ('long', 'f8'), ('alt', 'f8'), ('trans_alt', 'f8'),
-        #     ('heading', 'f8'), ('track_angle', 'f8'), ('bank_angle', 'f8'), ('path_angle', 'f8'),
-        #     ('cas', 'f8'), ('tas', 'f8'), ('gs_north', 'f8'), ('gs_east', 'f8'), ('mach', 'f8'), ('accel', 'f8'), ('speed_mode', 'i8'),
-        #     ('max_alt', 'f8'), ('max_cas', 'f8'), ('max_mach', 'f8'),
-        #     ('vs', 'f8'), ('fpa', 'f8'), ('vertical_mode', 'i8'),
-        #     ('mass', 'f8'), ('empty_weight', 'f8'), ('fuel_weight', 'f8'), ('payload_weight', 'f8'), ('fuel_consumed', 'f8'),
-        #     # Autopilot
-        #     ('ap_alt', 'f8'), ('ap_heading', 'f8'), ('ap_track_angle', 'f8'), ('ap_rate_of_turn', 'f8'),
-        #     ('ap_cas', 'f8'), ('ap_mach', 'f8'), ('ap_vs', 'f8'), ('ap_fpa', 'f8'),
-        #     ('ap_lat', 'f8'), ('ap_long', 'f8'), ('ap_lat_next', 'f8'), ('ap_long_next', 'f8'), ('ap_hv_next_wp', '?'), ('ap_dist_wp', 'f8')
-        #     ('ap_flight_plan_index', 'i8'), ('ap_procedure_speed', 'f8')
-        #     # Weather
-        #     ('wind_speed', 'f8'), ('wind_dir', 'f8'), ('wind_north', 'f8'), ('wind_east', 'f8'),
-        #     ('d_T', 'f8'), ('d_p', 'f8'), ('T', 'f8'), ('p', 'f8'), ('rho', 'f8')
-        # ])
-
-        self.index = np.zeros([0])
+        self.next_id = 0
+        """Index (id) of the next added aircraft = number of aircraft ever added, bounds row_map (storage.n is the number of active aircraft)"""
+        self.storage = Storage(precision=precision)
+        """Capacity managed storage of all per-aircraft arrays (shared with sub classes)"""
+        self.row_map = np.full(self.storage.capacity, -1, dtype=int)
+        """Row of each aircraft index in the traffic arrays, -1 if the aircraft is deleted [int]"""
+
+        # Scalar numeric state arrays of traffic, autopilot, weather and performance are packed by the storage into one
+        # contiguous column-major block per dtype. Each attribute below is a named view of one column of a block.
+
+        self.index = self.storage.column(dtype=np.float64)
         """Index array to indicate whether there is an aircraft active in each index."""
 
         # General information
-        self.call_sign = np.empty([0], dtype='U10')
+        self.call_sign = self.storage.column(dtype='U10', fill='')
         """Callsign [string]"""
-        self.aircraft_type = np.empty([0], dtype='U4')
+        self.aircraft_type = self.storage.column(dtype='U4', fill='')
         """Aircraft type in ICAO format [string]"""
-        self.configuration = np.zeros([0])
+        self.configuration = self.storage.column(dtype=np.int8, fill=0)
         """Aircraft configuration [Configuration enum 1: Clean, 2: Take Off, 3: Approach, 4: Landing]"""
-        self.flight_phase = np.zeros([0])
+        self.flight_phase = self.storage.column(dtype=np.int8, fill=0)
         """Flight phase [Flight_phase enum] (BADA section 3.5)"""
 
         # Position
-        self.lat = np.zeros([0])
+        self.lat = self.storage.column(dtype=np.float64)
         """Latitude [deg]"""
-        self.long = np.zeros([0])
+        self.long = self.storage.column(dtype=np.float64)
         """Longitude [deg]"""
-        self.alt = np.zeros([0])
+        self.alt = self.storage.column()
         """Altitude [ft] Geopotential altitude"""
-        self.trans_alt = np.zeros([0])
+        self.trans_alt = self.storage.column()
         """Transaition altitude [ft]"""
-        self.cruise_alt = np.zeros([0])
+        self.cruise_alt = self.storage.column()
         """Cruise altitude [ft]"""
 
         # Orientation
-        self.heading = np.zeros([0])
+        self.heading = self.storage.column()
         """Heading [deg]"""
-        self.track_angle = np.zeros([0])
+        self.track_angle = self.storage.column()
         """Track angle [deg]"""
-        self.bank_angle = np.zeros([0])
+        self.bank_angle = self.storage.column()
         """Bank angle [deg]"""
-        self.path_angle = np.zeros([0])
+        self.path_angle = self.storage.column()
         """Path angle [deg]"""
 
         # Speed
-        self.cas = np.zeros([0])
+        self.cas = self.storage.column()
         """Calibrated air speed [knot]"""
-        self.tas = np.zeros([0])
+        self.tas = self.storage.column()
         """True air speed [knot]"""
-        self.gs_north = np.zeros([0])
+        self.gs_north = self.storage.column()
         """Ground speed - North[knot]"""
-        self.gs_east = np.zeros([0])
+        self.gs_east = self.storage.column()
         """Ground speed - East [knot]  """
-        self.mach = np.zeros([0])
+        self.mach = self.storage.column()
         """Mach number [dimensionless]"""
-        self.accel = np.zeros([0])
+        self.accel = self.storage.column()
         """Acceleration [m/s^2]"""
-        self.speed_mode = np.zeros([0])
+        self.speed_mode = self.storage.column(dtype=np.int8, fill=0)
         """Speed mode [Traffic.speed_mode enum 1: CAS, 2: MACH]"""
 
         # Ceiling
-        self.max_alt = np.zeros([0])
+        self.max_alt = self.storage.column()
         """Maximum altitude [feet]"""
-        self.max_cas = np.zeros([0])
+        self.max_cas = self.storage.column()
         """Maximum calibrated air speed [knot]"""
-        self.max_mach = np.zeros([0])
+        self.max_mach = self.storage.column()
         """Maximum mach number [dimensionless]"""
 
         # Vertical speed
-        self.vs = np.zeros([0])
+        self.vs = self.storage.column()
         """Vertical speed [feet/min]"""
-        self.fpa = np.zeros([0])
+        self.fpa = self.storage.column()
         """Flight path angle [deg]"""
-        self.vertical_mode = np.zeros([0])
+        self.vertical_mode = self.storage.column(dtype=np.int8, fill=0)
         """Vertical mode [Vertical mode enum 1: LEVEL, 2: CLIMB, 3: DESCENT]"""
 
         # Weight and balance
-        self.mass = np.zeros([0])
+        self.mass = self.storage.column(dtype=np.float64)
         """Aircraft mass [kg]"""
-        self.empty_weight = np.zeros([0])
+        self.empty_weight = self.storage.column()
         """Empty weight [kg]"""
-        self.fuel_weight = np.zeros([0])
+        self.fuel_weight = self.storage.column()
         """Initial fuel weight [kg]"""
-        self.payload_weight = np.zeros([0])
+        self.payload_weight = self.storage.column()
         """Payload weight [kg]"""
-        self.fuel_consumed = np.zeros([0])
+        self.fuel_consumed = self.storage.column(dtype=np.float64)
         """Fuel consumped [kg]"""
 
+        # Terrain clearance
+        self.mora = self.storage.column()
+        """Minimum off route altitude at the aircraft position [feet, nan if unknown]"""
+        self.below_mora = self.storage.column(dtype=np.bool_, fill=False)
+        """Whether the aircraft is below the minimum off route altitude in climb, cruise or descent phase [bool]"""
+
+        self.kernel = kernel if kernel != "numba" or traffic_kernel.numba is not None else "numpy"
+        """Implementation of the per-aircraft kinematics [numpy, numba]"""
+        if self.kernel != kernel:
+            print("Traffic.py - Numba is not installed, the numpy kernel is used.")
+
         # Sub classes
-        self.perf = Performance(performance_mode)
+        self.perf = Performance(performance_mode, self.storage, atmosphere)
         """Performance class"""
-        self.ap = Autopilot()
+        self.ap = Autopilot(self.storage)
         """Autopilot class"""
-        self.weather = Weather(start_time, end_time, weather_mode, file_name)
+        self.weather = Weather(start_time, end_time, weather_mode, file_name, self.storage)
         """Weather class"""
 
     def add_aircraft(self, call_sign, aircraft_type, flight_phase, configuration, lat, long, alt, heading, cas, fuel_weight, payload_weight, departure_airport, departure_runway, sid, arrival_airport, arrival_runway, star, approach, flight_plan, cruise_alt):
@@ -138,115 +151,212 @@ class Traffic:
 
         Returns
         -------
-        self.n-1: int
+        int
             Index of the added aircraft
         """
 
         print("Traffic.py - add_aircraft()",
               call_sign, " Type:",  aircraft_type)
 
+        return int(self.__add_aircraft([call_sign], [aircraft_type], [flight_phase], [configuration], [lat], [long], [alt], [heading], [cas], [fuel_weight], [payload_weight],
+                                       [departure_airport], [departure_runway], [sid], [arrival_airport], [arrival_runway], [star], [approach], [flight_plan], [cruise_alt])[0])
+
+    def add_aircraft_batch(self, call_sign, aircraft_type=None, flight_phase=None, configuration=None, lat=None, long=None, alt=None, heading=None, cas=None, fuel_weight=None, payload_weight=None,
+                           departure_airport=None, departure_runway=None, sid=None, arrival_airport=None, arrival_runway=None, star=None, approach=None, flight_plan=None, cruise_alt=None):
+        """
+        Add a batch of aircraft to traffic array. All arrays are resized at most once and the performance data and procedures
+        are loaded once for each aircraft type and route in the batch.
+
+        Parameters
+        ----------
+        call_sign : str[] or pandas.DataFrame
+            Call sign of each aircraft, or a DataFrame with one column per parameter (named as the parameters of this function)
+        aircraft_type, flight_phase, ..., cruise_alt : array_like
+            One element per aircraft, same meaning as the parameters of Aircraft. The optional parameters of Aircraft
+            (departure_airport to cruise_alt) can be omitted and take the same default values.
+
+        Returns
+        -------
+        index: int[]
+            Index of the added aircraft
+
+        Raises
+        ------
+        ValueError
+            If a required parameter is missing or a parameter does not have one element per aircraft
+        """
+        columns = {'call_sign': call_sign, 'aircraft_type': aircraft_type, 'flight_phase': flight_phase, 'configuration': configuration, 'lat': lat, 'long': long, 'alt': alt,
+                   'heading': heading, 'cas': cas, 'fuel_weight': fuel_weight, 'payload_weight': payload_weight, 'departure_airport': departure_airport,
+                   'departure_runway': departure_runway, 'sid': sid, 'arrival_airport': arrival_airport, 'arrival_runway': arrival_runway, 'star': star,
+                   'approach': approach, 'flight_plan': flight_plan, 'cruise_alt': cruise_alt}
+        if isinstance(call_sign, pd.DataFrame):
+            columns = {key: call_sign[key].to_list() if key in call_sign else None for key in columns}
+
+        k = len(columns['call_sign'])
+        for key, default in (('departure_airport', ""), ('departure_runway', ""), ('sid', ""), ('arrival_airport', ""), ('arrival_runway', ""), ('star', ""), ('approach', ""), ('cruise_alt', -1)):
+            if columns[key] is None:
+                columns[key] = [default] * k
+        if columns['flight_plan'] is None:
+            columns['flight_plan'] = [[] for _ in range(k)]
+        missing = [key for key, value in columns.items() if value is None]
+        if missing:
+            raise ValueError("Missing aircraft parameters: " + ", ".join(missing))
+        wrong_length = [key for key, value in columns.items() if not hasattr(value, '__len__') or isinstance(value, str) or len(value) != k]
+        if wrong_length:
+            raise ValueError("Aircraft parameters with a length other than " + str(k) + ": " + ", ".join(wrong_length))
+
+        print("Traffic.py - add_aircraft_batch()", k, "aircraft")
+
+        return self.__add_aircraft(**columns)
+
+    def __add_aircraft(self, call_sign, aircraft_type, flight_phase, configuration, lat, long, alt, heading, cas, fuel_weight, payload_weight, departure_airport, departure_runway, sid, arrival_airport, arrival_runway, star, approach, flight_plan, cruise_alt):
+        """
+        Add aircraft given one array per parameter to traffic array.
+
+        Returns
+        -------
+        index: int[]
+            Index of the added aircraft
+        """
+        lat, long, alt, heading, cas, fuel_weight, payload_weight = (np.asarray(x, dtype=float) for x in (lat, long, alt, heading, cas, fuel_weight, payload_weight))
+
+        # Reserve rows in all traffic, performance, weather, and autopilot arrays
+        n = self.storage.add(len(call_sign))
+
         # Add aircraft in performance, weather, and autopilot array
-        self.perf.add_aircraft(aircraft_type)
-        self.weather.add_aircraft(alt, self.perf)
-        self.ap.add_aircraft(lat, long, alt, heading, cas, departure_airport, departure_runway,
-                             sid, arrival_airport, arrival_runway, star, approach, flight_plan, cruise_alt)
-
-        self.index = np.append(self.index, self.n)
-        self.call_sign = np.append(self.call_sign, call_sign)
-        self.aircraft_type = np.append(self.aircraft_type, aircraft_type)
-        self.configuration = np.append(self.configuration, configuration)
-        self.flight_phase = np.append(self.flight_phase, flight_phase)
-        self.lat = np.append(self.lat, lat)
-        self.long = np.append(self.long, long)
-        self.alt = np.append(self.alt, alt)
-        self.cruise_alt = np.append(self.cruise_alt, cruise_alt)
-        self.heading = np.append(self.heading, heading)
-        self.track_angle = np.append(self.track_angle, heading)
-        self.bank_angle = np.append(self.bank_angle, 0.0)
-        self.path_angle = np.append(self.path_angle, 0.0)
-        self.cas = np.append(self.cas, cas)
-        self.tas = np.append(self.tas, Unit.mps2kts(self.perf.cas_to_tas(
-            Unit.kts2mps(cas), self.weather.p[-1], self.weather.rho[-1])))
-        self.gs_north = np.append(self.gs_north, 0.0)
-        self.gs_east = np.append(self.gs_east, 0.0)
-        self.mach = np.append(self.mach, self.perf.tas_to_mach(
-            Unit.kts2mps(self.tas[-1]), self.weather.T[-1]))
-        self.accel = np.append(self.accel, 0.0)
-        self.speed_mode = np.append(self.speed_mode, SpeedMode.CAS)
-        self.max_alt = np.append(self.max_alt, 0.0)
-        self.max_cas = np.append(self.max_cas, 0.0)
-        self.max_mach = np.append(self.max_mach, 0.0)
-        self.vs = np.append(self.vs, 0.0)
-        self.fpa = np.append(self.fpa, 0.0)
-        self.vertical_mode = np.append(self.vertical_mode, VerticalMode.LEVEL)
-        self.empty_weight = np.append(
-            self.empty_weight, self.perf.get_empty_weight(-1))
-        self.fuel_weight = np.append(self.fuel_weight, fuel_weight)
-        self.payload_weight = np.append(self.payload_weight, payload_weight)
-        self.mass = np.append(
-            self.mass, self.empty_weight[-1] + fuel_weight + payload_weight)
-        self.fuel_consumed = np.append(self.fuel_consumed, 0.0)
+        self.perf.add_aircraft_batch(aircraft_type)
+        self.weather.add_aircraft_batch(alt, self.perf)
+        self.ap.add_aircraft_batch(lat, long, alt, heading, cas, departure_airport, departure_runway,
+                                   sid, arrival_airport, arrival_runway, star, approach, flight_plan, cruise_alt)
+
+        self.index[n] = np.arange(self.next_id, self.next_id + len(n))
+        if self.next_id + len(n) > len(self.row_map):
+            # Double the capacity as the storage to reallocate rarely
+            capacity = max(len(self.row_map), 1)
+            while capacity < self.next_id + len(n):
+                capacity = capacity * 2
+            row_map = np.full(capacity, -1, dtype=int)
+            row_map[:self.next_id] = self.row_map[:self.next_id]
+            self.row_map = row_map
+        self.row_map[self.next_id:self.next_id + len(n)] = n
+        self.call_sign[n] = call_sign
+        self.aircraft_type[n] = aircraft_type
+        self.configuration[n] = configuration
+        self.flight_phase[n] = flight_phase
+        self.lat[n] = lat
+        self.long[n] = long
+        self.alt[n] = alt
+        self.cruise_alt[n] = cruise_alt
+        self.heading[n] = heading
+        self.track_angle[n] = heading
+        self.bank_angle[n] = 0.0
+        self.path_angle[n] = 0.0
+        self.cas[n] = cas
+        self.tas[n] = Unit.mps2kts(self.perf.cas_to_tas(
+            Unit.kts2mps(cas), self.weather.p[n], self.weather.rho[n]))
+        self.gs_north[n] = 0.0
+        self.gs_east[n] = 0.0
+        self.mach[n] = self.perf.tas_to_mach(
+            Unit.kts2mps(self.tas[n]), self.weather.T[n])
+        self.accel[n] = 0.0
+        self.speed_mode[n] = SpeedMode.CAS
+        self.max_alt[n] = 0.0
+        self.max_cas[n] = 0.0
+        self.max_mach[n] = 0.0
+        self.vs[n] = 0.0
+        self.fpa[n] = 0.0
+        self.vertical_mode[n] = VerticalMode.LEVEL
+        self.empty_weight[n] = self.perf.get_empty_weight(n)
+        self.fuel_weight[n] = fuel_weight
+        self.payload_weight[n] = payload_weight
+        self.mass[n] = self.empty_weight[n] + fuel_weight + payload_weight
+        self.fuel_consumed[n] = 0.0
+        self.mora[n] = Nav.get_mora(self.lat[n], self.long[n])
+        self.below_mora[n] = False
 
         # Init Procedural speed
-        self.perf.init_procedure_speed(self.mass[-1], -1)
-        self.trans_alt = np.append(self.trans_alt, Unit.m2ft(
-            self.perf.cal_transition_alt(-1, self.weather.d_T[-1])))
+        self.perf.init_procedure_speed(self.mass, n)
+        self.trans_alt[n] = Unit.m2ft(
+            self.perf.cal_transition_alt(n, self.weather.d_T[n]))
 
         self.max_alt = self.perf.cal_maximum_alt(self.weather.d_T, self.mass)
         self.max_cas, self.max_mach = self.perf.cal_maximum_speed()
 
-        # Increase aircraft count
-        self.n = self.n + 1
+        # Advance the index of the next aircraft
+        self.next_id = self.next_id + len(n)
 
-        return self.n - 1
+        return self.index[n].astype(int)
 
     def del_aircraft(self, index):
         """
         Delete an aircraft from traffic array.
 
+        The last aircraft is moved into the freed row so that no array is shifted. The index (id) of every
+        remaining aircraft is unchanged but its row may be.
+
         Parameters
         ----------
         index : int
             Index of an aircraft
         """
         print("Traffic.py - del_aircraft()", index)
-        i = np.where(self.index == index)[0][0]
-        self.index = np.delete(self.index, i)
-        self.call_sign = np.delete(self.call_sign, i)
-        self.aircraft_type = np.delete(self.aircraft_type, i)
-        self.configuration = np.delete(self.configuration, i)
-        self.flight_phase = np.delete(self.flight_phase, i)
-        self.lat = np.delete(self.lat, i)
-        self.long = np.delete(self.long, i)
-        self.alt = np.delete(self.alt, i)
-        self.trans_alt = np.delete(self.trans_alt, i)
-        self.cruise_alt = np.delete(self.cruise_alt, i)
-        self.heading = np.delete(self.heading, i)
-        self.track_angle = np.delete(self.track_angle, i)
-        self.bank_angle = np.delete(self.bank_angle, i)
-        self.path_angle = np.delete(self.path_angle, i)
-        self.cas = np.delete(self.cas, i)
-        self.tas = np.delete(self.tas, i)
-        self.gs_north = np.delete(self.gs_north, i)
-        self.gs_east = np.delete(self.gs_east, i)
-        self.mach = np.delete(self.mach, i)
-        self.accel = np.delete(self.accel, i)
-        self.speed_mode = np.delete(self.speed_mode, i)
-        self.max_alt = np.delete(self.max_alt, i)
-        self.max_cas = np.delete(self.max_cas, i)
-        self.max_mach = np.delete(self.max_mach, i)
-        self.vs = np.delete(self.vs, i)
-        self.fpa = np.delete(self.fpa, i)
-        self.vertical_mode = np.delete(self.vertical_mode, i)
-        self.mass = np.delete(self.mass, i)
-        self.empty_weight = np.delete(self.empty_weight, i)
-        self.fuel_weight = np.delete(self.fuel_weight, i)
-        self.payload_weight = np.delete(self.payload_weight, i)
-        self.fuel_consumed = np.delete(self.fuel_consumed, i)
-
-        self.perf.del_aircraft(i)
-        self.ap.del_aircraft(i)
-        self.weather.del_aircraft(i)
+        self.__del_aircraft(self.rows_for([index]))
+
+    def del_aircraft_batch(self, index):
+        """
+        Delete a batch of aircraft from traffic array with one compaction of all arrays.
+
+        Parameters
+        ----------
+        index : int[]
+            Index of each aircraft
+        """
+        if len(index) == 0:
+            return
+        print("Traffic.py - del_aircraft_batch()", index)
+        self.__del_aircraft(self.rows_for(index))
+
+    def __del_aircraft(self, rows):
+        """
+        Swap-remove rows from all traffic, performance, weather, and autopilot arrays and update the row map.
+
+        Parameters
+        ----------
+        rows : int[]
+            Rows to be removed
+        """
+        self.row_map[self.index[rows].astype(int)] = -1
+        self.storage.remove(rows)
+        # Removed rows inside the live range now hold the aircraft moved from the end
+        moved = rows[rows < self.storage.n]
+        self.row_map[self.index[moved].astype(int)] = moved
+
+    def rows_for(self, index):
+        """
+        Get the rows of aircraft in the traffic arrays given their index (id).
+
+        Parameters
+        ----------
+        index : int or int[]
+            Index of each aircraft
+
+        Returns
+        -------
+        int or int[]
+            Row of each aircraft
+
+        Raises
+        ------
+        IndexError
+            If an aircraft does not exist or is deleted
+        """
+        index = np.asarray(index, dtype=int)
+        if np.any((index < 0) | (index >= self.next_id)):
+            raise IndexError("Aircraft index out of range: " + str(index))
+        rows = self.row_map[index]
+        if np.any(rows < 0):
+            raise IndexError("Aircraft is deleted: " + str(index[rows < 0]))
+        return rows
 
     def update(self, global_time, d_t=1):
         """
@@ -329,11 +439,42 @@ class Traffic:
         # Air Speed
         # self.tas = self.perf.cas_to_tas(self.cas, self.weather.p, self.weather.rho)
         tas = tas + self.accel
-        self.mach = self.perf.tas_to_mach(tas, self.weather.T)
-        self.cas = Unit.mps2kts(self.perf.tas_to_cas(
-            tas, self.weather.p, self.weather.rho))
+        if (self.kernel == "numba"):
+            # Speeds, heading, ground speed, path angle, position and altitude in one compiled pass
+            traffic_kernel.update(tas, self.weather.T, self.weather.p, self.weather.rho, self.bank_angle, d_heading, self.speed_mode,
+                                  self.ap.speed_mode, self.vertical_mode, self.ap.mach, self.ap.cas, self.ap.heading, self.ap.alt, self.vs,
+                                  self.weather.wind_north, self.weather.wind_east, self.mach, self.cas, self.tas, self.heading,
+                                  self.gs_north, self.gs_east, self.path_angle, self.lat, self.long, self.alt)
+        else:
+            self.mach = self.perf.tas_to_mach(tas, self.weather.T)
+            self.cas = Unit.mps2kts(self.perf.tas_to_cas(
+                tas, self.weather.p, self.weather.rho))
+
+            # Bound to autopilot
+            self.__bound_speed()
+
+            # TAS of the bounded Mach and CAS (each converted once for both selections below) and Mach/CAS of these TAS
+            tas_of_mach = self.perf.mach_to_tas(self.mach, self.weather.T)
+            tas_of_cas = self.perf.cas_to_tas(Unit.kts2mps(self.cas), self.weather.p, self.weather.rho)
+            mach_of_cas = self.perf.tas_to_mach(tas_of_cas, self.weather.T)
+            cas_of_mach = Unit.mps2kts(self.perf.tas_to_cas(tas_of_mach, self.weather.p, self.weather.rho))
+
+            self.__integrate(tas, tas_of_mach, tas_of_cas, mach_of_cas, cas_of_mach, d_heading)
 
-        # Bound to autopilot
+        # Fuel
+        fuel_burn = self.perf.cal_fuel_burn(
+            self.configuration, self.tas, self.alt)
+        self.fuel_consumed = self.fuel_consumed + fuel_burn
+        self.mass = self.mass - fuel_burn
+
+        # Terrain clearance (one gather from the MORA grid for all aircraft)
+        self.mora = Nav.get_mora(self.lat, self.long)
+        self.below_mora = (self.alt < self.mora) & np.isin(self.flight_phase, [FlightPhase.CLIMB, FlightPhase.CRUISE, FlightPhase.DESCENT])
+
+    def __bound_speed(self):
+        """
+        Bound Mach number and CAS to the autopilot target (numpy kernel).
+        """
         self.mach = np.select(condlist=[
             (self.speed_mode == SpeedMode.MACH) & (
                 self.ap.speed_mode == APSpeedMode.ACCELERATE),
@@ -368,14 +509,28 @@ class Traffic:
         ],
             default=self.cas)
 
+    def __integrate(self, tas, tas_of_mach, tas_of_cas, mach_of_cas, cas_of_mach, d_heading):
+        """
+        Select the TAS and integrate heading, ground speed, path angle, position and altitude (numpy kernel).
+
+        Parameters
+        ----------
+        tas : float[]
+            TAS after acceleration [m/s]
+        tas_of_mach, tas_of_cas : float[]
+            TAS of the bounded Mach number and CAS [m/s]
+        mach_of_cas, cas_of_mach : float[]
+            Mach number of tas_of_cas [dimensionless] and CAS of tas_of_mach [knots]
+        d_heading : float[]
+            Heading difference to the autopilot heading [deg]
+        """
         tas = np.select(condlist=[
             self.ap.speed_mode == APSpeedMode.CONSTANT_MACH,
             self.ap.speed_mode == APSpeedMode.CONSTANT_CAS
         ],
             choicelist=[
-            self.perf.mach_to_tas(self.mach, self.weather.T),
-            self.perf.cas_to_tas(Unit.kts2mps(
-                self.cas), self.weather.p, self.weather.rho)
+            tas_of_mach,
+            tas_of_cas
         ],
             default=tas)
 
@@ -386,19 +541,17 @@ class Traffic:
                 self.ap.speed_mode == APSpeedMode.DECELERATE)) & (self.mach == self.ap.mach)
         ],
             choicelist=[
-            self.perf.cas_to_tas(Unit.kts2mps(
-                self.cas), self.weather.p, self.weather.rho),
-            self.perf.mach_to_tas(self.mach, self.weather.T)
+            tas_of_cas,
+            tas_of_mach
         ],
             default=tas)
 
         self.mach = np.where((self.speed_mode == SpeedMode.CAS) & ((self.ap.speed_mode == APSpeedMode.ACCELERATE) | (self.ap.speed_mode == APSpeedMode.DECELERATE)) & (self.cas == self.ap.cas),
-                             self.perf.tas_to_mach(tas, self.weather.T),
+                             mach_of_cas,
                              self.mach)
 
         self.cas = np.where((self.speed_mode == SpeedMode.MACH) & ((self.ap.speed_mode == APSpeedMode.ACCELERATE) | (self.ap.speed_mode == APSpeedMode.DECELERATE)) & (self.mach == self.ap.mach),
-                            Unit.mps2kts(self.perf.tas_to_cas(
-                                tas, self.weather.p, self.weather.rho)),
+                            cas_of_mach,
                             self.cas)
 
         self.tas = Unit.mps2kts(tas)
@@ -442,9 +595,3 @@ class Traffic:
                      self.ap.alt, self.alt)
         ],
             default=self.alt)
-
-        # Fuel
-        fuel_burn = self.perf.cal_fuel_burn(
-            self.configuration, self.tas, self.alt)
-        self.fuel_consumed = self.fuel_consumed + fuel_burn
-        self.mass = self.mass - fuel_burn
@@ -0,0 +1,167 @@
+"""Per-aircraft kinematics of Traffic.update fused into one loop compiled by Numba (optional)"""
+import math
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+from airtrafficsim.utils.enums import SpeedMode, VerticalMode, APSpeedMode
+
+
+# Enum values as plain integers for the compiled loop
+_MACH = int(SpeedMode.MACH)
+_CAS = int(SpeedMode.CAS)
+_CLIMB = int(VerticalMode.CLIMB)
+_DESCENT = int(VerticalMode.DESCENT)
+_ACCELERATE = int(APSpeedMode.ACCELERATE)
+_DECELERATE = int(APSpeedMode.DECELERATE)
+_CONSTANT_MACH = int(APSpeedMode.CONSTANT_MACH)
+_CONSTANT_CAS = int(APSpeedMode.CONSTANT_CAS)
+
+# Constants of Performance and Unit
+_P_0 = 101325.0
+"""Standard atmospheric pressure at MSL [Pa]"""
+_RHO_0 = 1.225
+"""Standard atmospheric density at MSL [kg/m^3]"""
+_KAPPA = 1.4
+"""Adiabatic index of air [dimensionless]"""
+_R = 287.05287
+"""Real gas constant for air [m^2/(K*s^2)]"""
+_G_0 = 9.80665
+"""Gravitational acceleration [m/s^2]"""
+_MU = (_KAPPA - 1.0) / _KAPPA
+_KTS = 0.514444444
+"""Knots to m/s"""
+
+
+def _pow_inv_mu(x):
+    """
+    x ** (1/mu) = x ** 3.5 with one square root instead of a power.
+    """
+    return x * x * x * math.sqrt(x)
+
+
+def _cas_to_tas(v_cas, p, rho):
+    """
+    Convert CAS [m/s] to TAS [m/s] (Performance.cas_to_tas, BADA Equation 3.1-23).
+    """
+    return math.sqrt(2.0/_MU * p/rho * ((1.0 + _P_0/p * (_pow_inv_mu(1.0 + _MU/2.0 * _RHO_0/_P_0 * v_cas * v_cas) - 1.0)) ** _MU - 1.0))
+
+
+def _tas_to_cas(v_tas, p, rho):
+    """
+    Convert TAS [m/s] to CAS [m/s] (Performance.tas_to_cas, BADA Equation 3.1-24).
+    """
+    return math.sqrt(2.0/_MU * _P_0/_RHO_0 * ((1.0 + p/_P_0 * (_pow_inv_mu(1.0 + _MU/2.0 * rho/p * v_tas * v_tas) - 1.0)) ** _MU - 1.0))
+
+
+def _update(tas_accel, T, p, rho, bank_angle, d_heading, speed_mode, ap_speed_mode, vertical_mode, ap_mach, ap_cas, ap_heading,
+            ap_alt, vs, wind_north, wind_east, mach, cas, tas, heading, gs_north, gs_east, path_angle, lat, long, alt):
+    """
+    Update the speeds, heading, ground speed, path angle, position and altitude of all aircraft in one pass (in place).
+
+    This is the same sequence of formulas as Traffic.update with the numpy kernel, from the Mach/CAS conversion of the
+    accelerated TAS to the altitude overshoot. Each aircraft is computed in float64 without temporary arrays and only
+    the Mach/CAS/TAS conversions that are used are evaluated. The results are written to the state arrays (float64 or
+    float32).
+
+    Parameters
+    ----------
+    tas_accel : float[]
+        TAS after acceleration [m/s]
+    T, p, rho : float[]
+        Air temperature [K], pressure [Pa] and density [kg/m^3]
+    bank_angle : float[]
+        Bank angle [deg]
+    d_heading : float[]
+        Heading difference to the autopilot heading [deg]
+    speed_mode, ap_speed_mode, vertical_mode : int8[]
+        Speed mode [SpeedMode enum], autopilot speed mode [APSpeedMode enum] and vertical mode [VerticalMode enum]
+    ap_mach, ap_cas, ap_heading, ap_alt : float[]
+        Autopilot target Mach number, CAS [knots], heading [deg] and altitude [ft]
+    vs, wind_north, wind_east : float[]
+        Vertical speed [ft/min] and wind speed [knots]
+    mach, cas, tas, heading, gs_north, gs_east, path_angle, lat, long, alt : float[]
+        Traffic states (output)
+    """
+    for i in range(len(tas_accel)):
+        # Mach number and CAS of the accelerated TAS
+        v_tas = float(tas_accel[i])
+        a = math.sqrt(_KAPPA * _R * T[i])
+        m = v_tas / a
+        c = _tas_to_cas(v_tas, p[i], rho[i]) / _KTS
+
+        # Bound to autopilot
+        mode = speed_mode[i]
+        ap_mode = ap_speed_mode[i]
+        if mode == _MACH:
+            if ap_mode == _ACCELERATE:
+                m = min(m, ap_mach[i])
+            elif ap_mode == _DECELERATE:
+                m = max(m, ap_mach[i])
+            elif ap_mode == _CONSTANT_MACH:
+                m = ap_mach[i]
+        elif mode == _CAS:
+            if ap_mode == _ACCELERATE:
+                c = min(c, ap_cas[i])
+            elif ap_mode == _DECELERATE:
+                c = max(c, ap_cas[i])
+            elif ap_mode == _CONSTANT_CAS:
+                c = ap_cas[i]
+
+        # TAS of the speed hold mode or of the target speed when it is reached
+        changing = (ap_mode == _ACCELERATE) or (ap_mode == _DECELERATE)
+        if mode == _CAS and changing and c == ap_cas[i]:
+            v_tas = _cas_to_tas(c * _KTS, p[i], rho[i])
+            m = v_tas / a
+        elif mode == _MACH and changing and m == ap_mach[i]:
+            v_tas = m * a
+            c = _tas_to_cas(v_tas, p[i], rho[i]) / _KTS
+        elif ap_mode == _CONSTANT_MACH:
+            v_tas = m * a
+        elif ap_mode == _CONSTANT_CAS:
+            v_tas = _cas_to_tas(c * _KTS, p[i], rho[i])
+        mach[i] = m
+        cas[i] = c
+        v_kts = v_tas / _KTS
+        tas[i] = v_kts
+
+        # Heading (rate of turn of Equation 5.3-1 as Performance.cal_rate_of_turn)
+        rate_of_turn = math.degrees(_G_0 / v_tas * math.tan(math.radians(bank_angle[i])))
+        if abs(d_heading[i]) < abs(rate_of_turn) or abs(d_heading[i]) < 0.5:
+            h = float(ap_heading[i])
+        else:
+            h = heading[i] + rate_of_turn
+        if h > 360.0:
+            h = h - 360.0
+        elif h < 0.0:
+            h = h + 360.0
+        heading[i] = h
+
+        # Ground speed and path angle
+        north = v_kts * math.cos(math.radians(h)) + wind_north[i]
+        east = v_kts * math.sin(math.radians(h)) + wind_east[i]
+        gs_north[i] = north
+        gs_east[i] = east
+        path_angle[i] = math.degrees(math.atan((vs[i] / 60.0) / (v_kts * 1.68781)))
+
+        # Position and altitude (bounded to the autopilot altitude)
+        lat[i] = lat[i] + north / 216000.0
+        long[i] = long[i] + east / 216000.0
+        z = alt[i] + vs[i] / 60.0
+        if vertical_mode[i] == _CLIMB:
+            z = min(z, ap_alt[i])
+        elif vertical_mode[i] == _DESCENT:
+            z = max(z, ap_alt[i])
+        alt[i] = z
+
+
+if numba is not None:
+    # Division by zero gives inf/nan as in numpy instead of raising
+    _pow_inv_mu = numba.njit(cache=True, error_model='numpy')(_pow_inv_mu)
+    _cas_to_tas = numba.njit(cache=True, error_model='numpy')(_cas_to_tas)
+    _tas_to_cas = numba.njit(cache=True, error_model='numpy')(_tas_to_cas)
+    update = numba.njit(cache=True, error_model='numpy')(_update)
+else:
+    update = None
@@ -1,17 +1,18 @@
 import numpy as np
 import xarray as xr
 from datetime import timedelta
+from airtrafficsim.core.storage import Storage, StorageMixin
 from airtrafficsim.core.performance.performance import Performance
 from airtrafficsim.utils.unit_conversion import Unit
 from airtrafficsim.core.weather.era5 import Era5
 
 
-class Weather:
+class Weather(StorageMixin):
     """
     Weather class
     """
 
-    def __init__(self, start_time, end_time, weather_mode, file_name):
+    def __init__(self, start_time, end_time, weather_mode, file_name, storage=None):
         """
         Weather class constructor
         
@@ -25,32 +26,36 @@ class Weather:
             Weather mode [ISA, ERA5]
         file_name : str
             File name of the weather data
+        storage : Storage, optional
+            Storage shared with the traffic class, by default a new Storage
         """
+        self.storage = storage if storage is not None else Storage()
+        """Capacity managed storage of all per-aircraft arrays"""
         self.mode = weather_mode
         """Weather mode [ISA, ERA5]"""
         self.start_time = start_time
         """Start time of the simulation [datetime]"""
 
         # Wind speed
-        self.wind_speed = np.zeros([0])
+        self.wind_speed = self.storage.column()
         """Wind speed [knots]"""
-        self.wind_direction = np.zeros([0])
+        self.wind_direction = self.storage.column()
         """Wind direction [deg]"""
-        self.wind_north = np.zeros([0])
+        self.wind_north = self.storage.column()
         """Wind - North [knots]"""
-        self.wind_east = np.zeros([0])
+        self.wind_east = self.storage.column()
         """Wind - East [knots]"""
 
         # Atmospheric condition
-        self.d_T = np.zeros([0])
+        self.d_T = self.storage.column()
         """Temperature difference compare to ISA [K]"""
-        self.d_p = np.zeros([0])
+        self.d_p = self.storage.column()
         """Pressure difference compare to ISA [Pa]"""
-        self.T = np.zeros([0])
+        self.T = self.storage.column()
         """Temperature [K]"""
-        self.p = np.zeros([0])       
+        self.p = self.storage.column()       
         """Pressure [Pa]"""
-        self.rho = np.zeros([0])
+        self.rho = self.storage.column()
         """Density [kg/m^3]"""
 
         # Download ERA5 data
@@ -71,37 +76,30 @@ class Weather:
         perf : Performance
             Performance class
         """
-        self.wind_speed = np.append(self.wind_speed, 0.0)
-        self.wind_direction = np.append(self.wind_direction, 0.0)
-        self.wind_north = np.append(self.wind_north, 0.0)
-        self.wind_east = np.append(self.wind_east, 0.0)
-        self.d_T = np.append(self.d_T, 0.0)
-        self.d_p = np.append(self.d_p, 0.0)
-        self.T = np.append(self.T, perf.cal_temperature(
-            Unit.ft2m(alt), self.d_T[-1]))
-        self.p = np.append(self.p, perf.cal_air_pressure(
-            Unit.ft2m(alt), self.T[-1], self.d_T[-1]))
-        self.rho = np.append(
-            self.rho, perf.cal_air_density(self.p[-1], self.T[-1]))
+        self.add_aircraft_batch(np.array([alt]), perf)
 
-    def del_aircraft(self, index):
+    def add_aircraft_batch(self, alt, perf: Performance):
         """
-        Delete aircraft from the weather class
+        Add a batch of aircraft to the last len(alt) rows of the weather class
 
         Parameters
         ----------
-        index : int
-            Index of the aircraft
+        alt : float[]
+            Altitude of each aircraft [ft]
+        perf : Performance
+            Performance class
         """
-        self.wind_speed = np.delete(self.wind_speed, index)
-        self.wind_direction = np.delete(self.wind_direction, index)
-        self.wind_north = np.delete(self.wind_north, index)
-        self.wind_east = np.delete(self.wind_east, index)
-        self.d_T = np.delete(self.d_T, index)
-        self.d_p = np.delete(self.d_p, index)
-        self.T = np.delete(self.T, index)
-        self.p = np.delete(self.p, index)
-        self.rho = np.delete(self.rho, index)
+        rows = np.arange(self.storage.n - len(alt), self.storage.n)
+        self.wind_speed[rows] = 0.0
+        self.wind_direction[rows] = 0.0
+        self.wind_north[rows] = 0.0
+        self.wind_east[rows] = 0.0
+        self.d_T[rows] = 0.0
+        self.d_p[rows] = 0.0
+        self.T[rows] = perf.cal_temperature(Unit.ft2m(alt), self.d_T[rows])
+        self.p[rows] = perf.cal_air_pressure(
+            Unit.ft2m(alt), self.T[rows], self.d_T[rows])
+        self.rho[rows] = perf.cal_air_density(self.p[rows], self.T[rows])
 
     def update(self, lat, long, alt, perf: Performance, global_time):
         """
@@ -87,9 +87,7 @@ class ConvertHistoricDemo(Environment):
                                                              lat=self.position[i][0], long=self.position[i][1], alt=self.start_alt[i], heading=self.heading[i], cas=self.speed[i], fuel_weight=10000.0, payload_weight=12000.0,
                                                              arrival_airport="VHHH", arrival_runway="07R", star = self.star[i], approach = self.approach[i], cruise_alt=37000)
         # Delete aircraft
-        index = self.traffic.index[self.traffic.ap.hv_next_wp == False]
-        for i in index:
-            self.traffic.del_aircraft(i)
+        self.traffic.del_aircraft_batch(self.traffic.index[self.traffic.ap.hv_next_wp == False])
 
         # User algorithm
         # Holding and vectoring
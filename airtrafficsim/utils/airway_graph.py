@@ -0,0 +1,223 @@
+import heapq
+import math
+from collections import deque
+
+import numpy as np
+
+from airtrafficsim.utils.calculation import Cal
+
+
+class AirwayGraph:
+    """
+    Directed graph of airway segments for route expansion and shortest path routing.
+
+    Each waypoint on an airway (name, region and type) is one node with an integer id. The outgoing segments of all
+    nodes are stored in compressed sparse rows: the segments of node i are adj_node[adj_offset[i]:adj_offset[i+1]]
+    with their length in adj_dist and airway id in adj_airway. A segment belonging to several airways is stored once
+    per airway.
+    """
+
+    def __init__(self, name1, region1, type1, name2, region2, type2, direction, airway, wp_key, wp_lat, wp_long):
+        """
+        Initialize airway graph.
+
+        Parameters
+        ----------
+        name1, region1, type1 : string[], string[], int[]
+            Name, ICAO region and type (11 fix, 3 VOR, 2 NDB) of the first waypoint of each segment
+        name2, region2, type2 : string[], string[], int[]
+            Name, ICAO region and type of the second waypoint of each segment
+        direction : string[]
+            Allowed direction of each segment (N both, F first to second, B second to first)
+        airway : string[]
+            Airway names of each segment joined by "-" (e.g. A1-B2)
+        wp_key : string[]
+            "name region type" key of the waypoints with known coordinates
+        wp_lat : float[]
+            Latitude of the waypoints in wp_key [deg]
+        wp_long : float[]
+            Longitude of the waypoints in wp_key [deg]
+        """
+        name1, name2 = np.asarray(name1, dtype=str), np.asarray(name2, dtype=str)
+        key1 = np.char.add(np.char.add(np.char.add(np.char.add(name1, ' '), np.asarray(region1, dtype=str)), ' '), np.asarray(type1, dtype=str))
+        key2 = np.char.add(np.char.add(np.char.add(np.char.add(name2, ' '), np.asarray(region2, dtype=str)), ' '), np.asarray(type2, dtype=str))
+        direction = np.asarray(direction, dtype=str)
+        airway = np.asarray(airway, dtype=str)
+
+        # Nodes. The first waypoint of a key is used if it appears more than once in the waypoint data.
+        wp_order = np.argsort(np.asarray(wp_key, dtype=str), kind='stable')
+        wp_key = np.append(np.asarray(wp_key, dtype=str)[wp_order], '')
+        wp_lat = np.append(np.asarray(wp_lat, dtype=float)[wp_order], np.nan)
+        wp_long = np.append(np.asarray(wp_long, dtype=float)[wp_order], np.nan)
+        key, node = np.unique(np.append(key1, key2), return_inverse=True)
+        found = np.searchsorted(wp_key[:-1], key)
+        found[wp_key[found] != key] = len(wp_key) - 1
+        self.node_name = np.array([k.split(' ')[0] for k in key], dtype=str)
+        """Name of each node [string]"""
+        self.node_lat = wp_lat[found]
+        """Latitude of each node, nan if the waypoint is not found [deg]"""
+        self.node_long = wp_long[found]
+        """Longitude of each node, nan if the waypoint is not found [deg]"""
+        node1, node2 = node[:len(key1)], node[len(key1):]
+
+        # Split the segments of several airways
+        airways = [a.split('-') for a in airway]
+        count = np.array([len(a) for a in airways], dtype=int)
+        self.airway_name, airway_id = np.unique(np.array([a for names in airways for a in names], dtype=str), return_inverse=True)
+        """Name of each airway id [string]"""
+        seg = np.repeat(np.arange(len(airway)), count)
+
+        # Directed edges. Segments with unknown waypoints are dropped.
+        forward = (direction[seg] != 'B')
+        backward = (direction[seg] != 'F')
+        src = np.concatenate((node1[seg][forward], node2[seg][backward]))
+        dst = np.concatenate((node2[seg][forward], node1[seg][backward]))
+        awy = np.concatenate((airway_id[forward], airway_id[backward]))
+        valid = np.isfinite(self.node_lat[src]) & np.isfinite(self.node_lat[dst])
+        src, dst, awy = src[valid], dst[valid], awy[valid]
+        order = np.lexsort((awy, dst, src))
+        self.adj_node = dst[order]
+        """Destination node of each edge sorted by source node [int]"""
+        self.adj_airway = awy[order]
+        """Airway id of each edge [int]"""
+        self.adj_dist = Cal.cal_great_circle_dist(self.node_lat[src[order]], self.node_long[src[order]],
+                                                  self.node_lat[self.adj_node], self.node_long[self.adj_node])
+        """Great circle length of each edge [km]"""
+        self.adj_offset = np.searchsorted(src[order], np.arange(len(key) + 1))
+        """Position of the first edge of each node [int]"""
+
+        self.name_order = np.argsort(self.node_name, kind='stable')
+        """Node ids sorted by name [int]"""
+
+    def find_nodes(self, name):
+        """
+        Get all nodes of a waypoint name.
+
+        Parameters
+        ----------
+        name : string
+            Waypoint name
+
+        Returns
+        -------
+        int[]
+            Node ids in ascending order
+        """
+        sorted_name = self.node_name[self.name_order]
+        lo = np.searchsorted(sorted_name, name, side='left')
+        hi = np.searchsorted(sorted_name, name, side='right')
+        return np.sort(self.name_order[lo:hi])
+
+    def find_airway(self, name):
+        """
+        Get the id of an airway.
+
+        Parameters
+        ----------
+        name : string
+            Airway name
+
+        Returns
+        -------
+        int
+            Airway id, -1 if not found
+        """
+        i = np.searchsorted(self.airway_name, name)
+        return int(i) if i < len(self.airway_name) and self.airway_name[i] == name else -1
+
+    def follow_airway(self, airway, start, end):
+        """
+        Get the path along one airway between two waypoints with the least number of segments.
+
+        Parameters
+        ----------
+        airway : int
+            Airway id
+        start : int[]
+            Candidate start nodes
+        end : string
+            Name of the end waypoint
+
+        Returns
+        -------
+        int[]
+            Nodes of the path from one of the start nodes to the end waypoint (both included), empty if not found
+        """
+        parent = {int(s): -1 for s in start}
+        queue = deque(parent)
+        while queue:
+            i = queue.popleft()
+            if self.node_name[i] == end and parent[i] != -1:
+                path = [i]
+                while parent[path[-1]] != -1:
+                    path.append(parent[path[-1]])
+                return path[::-1]
+            for e in range(self.adj_offset[i], self.adj_offset[i + 1]):
+                j = int(self.adj_node[e])
+                if self.adj_airway[e] == airway and j not in parent:
+                    parent[j] = i
+                    queue.append(j)
+        return []
+
+    def shortest_path(self, start, end):
+        """
+        Get the shortest path between two sets of nodes by A* search with the great circle distance to the nearest end node as heuristic.
+
+        Parameters
+        ----------
+        start : int[]
+            Candidate start nodes
+        end : int[]
+            Candidate end nodes
+
+        Returns
+        -------
+        path : int[]
+            Nodes of the path (both ends included), empty if the end nodes cannot be reached
+        dist : float
+            Length of the path, inf if the end nodes cannot be reached [km]
+        """
+        end = np.asarray(end, dtype=int)
+        if len(start) == 0 or len(end) == 0:
+            return [], np.inf
+        # Great circle distance to the nearest end node (Cal.cal_great_circle_dist for one node) is never longer than
+        # a path along the airways. It is only computed for the nodes pushed by the search, not for the whole graph.
+        # It is shortened by 1e-9 so that rounding cannot make it longer than the segment lengths computed by numpy.
+        end_lat = np.radians(self.node_lat[end]).tolist()
+        end_long = np.radians(self.node_long[end]).tolist()
+        h = {}
+
+        def estimate(i):
+            if i not in h:
+                lat, long = math.radians(self.node_lat[i]), math.radians(self.node_long[i])
+                d = math.inf
+                for lat2, long2 in zip(end_lat, end_long):
+                    a = math.sin((lat2 - lat)/2.0)**2 + math.cos(lat) * math.cos(lat2) * math.sin((long2 - long)/2.0)**2
+                    d = min(d, 2.0 * 6371.009 * math.atan2(math.sqrt(a), math.sqrt(1.0 - a)))
+                h[i] = d * (1.0 - 1e-9) if d < math.inf else 0.0
+            return h[i]
+
+        targets = set(end.tolist())
+        dist = {int(s): 0.0 for s in start}
+        parent = {int(s): -1 for s in start}
+        heap = [(estimate(s), s) for s in dist]
+        heapq.heapify(heap)
+        done = set()
+        while heap:
+            _, i = heapq.heappop(heap)
+            if i in done:
+                continue
+            if i in targets:
+                path = [i]
+                while parent[path[-1]] != -1:
+                    path.append(parent[path[-1]])
+                return path[::-1], dist[i]
+            done.add(i)
+            for e in range(self.adj_offset[i], self.adj_offset[i + 1]):
+                j = int(self.adj_node[e])
+                d = dist[i] + self.adj_dist[e]
+                if j not in done and d < dist.get(j, np.inf):
+                    dist[j] = d
+                    parent[j] = i
+                    heapq.heappush(heap, (d + estimate(j), j))
+        return [], np.inf
@@ -0,0 +1,73 @@
+import numpy as np
+
+
+class LookupTable:
+    """
+    Function tabulated on a uniform grid and evaluated by linear interpolation.
+
+    The interval of a value is found by one multiplication instead of a binary search. The error of linear
+    interpolation of a smooth function is at most h^2/8 * max|f''| on an interval of width h and is largest near the
+    midpoints, so the largest error at the midpoints of all intervals is kept as an (empirical) error bound. Values
+    outside the grid (or nan) are evaluated by the function itself.
+    """
+
+    def __init__(self, func, start, stop, step):
+        """
+        Initialize lookup table.
+
+        Parameters
+        ----------
+        func : callable
+            Vectorized function of one array to be tabulated
+        start : float
+            First grid point
+        stop : float
+            Last grid point (rounded up to a whole number of steps)
+        step : float
+            Grid spacing (at least two grid points)
+        """
+        self.func = func
+        """Tabulated function [callable]"""
+        self.start = float(start)
+        """First grid point"""
+        self.n = int(np.ceil((stop - start) / step)) + 1
+        """Number of grid points [int]"""
+        self.inv_step = 1.0 / step
+        """Inverse of the grid spacing"""
+        x = self.start + step * np.arange(self.n)
+        self.value = np.asarray(func(x), dtype=np.float64)
+        """Function value at each grid point"""
+        self.slope = np.append(np.diff(self.value), 0.0)
+        """Difference to the next grid point (0 at the last grid point)"""
+        midpoint = x[:-1] + step / 2.0
+        self.error = float(np.max(np.abs(self.__interp((midpoint - self.start) * self.inv_step) - func(midpoint))))
+        """Largest absolute interpolation error at the midpoints of the intervals"""
+
+    def __interp(self, u):
+        """
+        Interpolate at grid coordinates u (position in steps from the first grid point) inside the grid.
+        """
+        i = u.astype(np.intp)
+        return self.value[i] + self.slope[i] * (u - i)
+
+    def __call__(self, x):
+        """
+        Evaluate the table.
+
+        Parameters
+        ----------
+        x : float[]
+            Values
+
+        Returns
+        -------
+        float[]
+            Interpolated function values
+        """
+        x = np.asarray(x, dtype=np.float64)
+        u = (x - self.start) * self.inv_step
+        # Checking the range by two reductions is cheaper than an element-wise mask (nan fails both comparisons)
+        if u.size == 0 or (u.min() >= 0.0 and u.max() <= self.n - 1):
+            return self.__interp(u)
+        inside = (u >= 0.0) & (u <= self.n - 1)
+        return np.where(inside, self.__interp(np.where(inside, u, 0.0)), self.func(x))
@@ -160,10 +160,8 @@ def get_arrival_data(airport, runway):
         arrivals_dict[star] = wp
     arrival_waypoints = np.unique(arrival_waypoints)
     # Get coordinate of all arrival waypoints
-    arrival_waypoints_coord_dict = {}
-    for wp in arrival_waypoints:
-        coord = Nav.get_wp_coord(wp, lat, long)
-        arrival_waypoints_coord_dict[wp] = list(coord)
+    wp_lat, wp_long = Nav.get_wp_coords(arrival_waypoints, lat, long)
+    arrival_waypoints_coord_dict = {wp: [wp_lat[i], wp_long[i]] for i, wp in enumerate(arrival_waypoints)}
 
     return arrivals_dict, arrival_waypoints_coord_dict
 
@@ -208,8 +206,6 @@ def get_approach_data(airport, runway):
         approach_dict[approach] = wp
     approach_waypoints = np.unique(approach_waypoints)
     # Get coordinate of all approach waypoints
-    approach_waypoints_coord_dict = {}
-    for wp in approach_waypoints:
-        coord = Nav.get_wp_coord(wp, lat, long)
-        approach_waypoints_coord_dict[wp] = list(coord)
+    wp_lat, wp_long = Nav.get_wp_coords(approach_waypoints, lat, long)
+    approach_waypoints_coord_dict = {wp: [wp_lat[i], wp_long[i]] for i, wp in enumerate(approach_waypoints)}
     return approach_dict, approach_waypoints_coord_dict
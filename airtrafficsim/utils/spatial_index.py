@@ -0,0 +1,161 @@
+import numpy as np
+
+from airtrafficsim.utils.calculation import Cal
+
+
+class SpatialIndex:
+    """
+    Uniform latitude/longitude grid of points for box, radius and nearest neighbour queries.
+
+    The points are sorted by grid cell, so that the points of adjacent cells in one latitude row form one contiguous
+    slice. A query only visits the cells overlapping the search area and then checks the exact condition on their
+    points. Areas crossing the antimeridian are split into two longitude ranges.
+    """
+
+    def __init__(self, lat, long, cell_size=1.0):
+        """
+        Initialize spatial index.
+
+        Parameters
+        ----------
+        lat : float[]
+            Latitude of the points. Points with nan coordinates are never returned [deg]
+        long : float[]
+            Longitude of the points [deg -180 to 180]
+        cell_size : float, optional
+            Size of the grid cells, by default 1.0 [deg]
+        """
+        self.lat = np.asarray(lat, dtype=float)
+        """Latitude of the points [deg]"""
+        self.long = np.asarray(long, dtype=float)
+        """Longitude of the points [deg]"""
+        self.cell_size = cell_size
+        """Size of the grid cells [deg]"""
+        self.n_row = int(np.ceil(180.0 / cell_size))
+        """Number of latitude rows of the grid [int]"""
+        self.n_col = int(np.ceil(360.0 / cell_size))
+        """Number of longitude columns of the grid [int]"""
+
+        valid = np.isfinite(self.lat) & np.isfinite(self.long)
+        row, col = self.__cell(np.where(valid, self.lat, 0.0), np.where(valid, self.long, 0.0))
+        cell = np.where(valid, row * self.n_col + col, self.n_row * self.n_col)
+        self.order = np.argsort(cell, kind='stable')
+        """Index of the points sorted by grid cell [int]"""
+        self.offset = np.searchsorted(cell[self.order], np.arange(self.n_row * self.n_col + 1))
+        """Position of the first point of each grid cell in order [int]"""
+
+    def __cell(self, lat, long):
+        """
+        Get the grid row and column of positions.
+        """
+        row = np.clip(np.floor((np.asarray(lat) + 90.0) / self.cell_size).astype(int), 0, self.n_row - 1)
+        col = np.clip(np.floor((np.asarray(long) + 180.0) / self.cell_size).astype(int), 0, self.n_col - 1)
+        return row, col
+
+    def __gather(self, lat1, long1, lat2, long2):
+        """
+        Get the index of all points in the grid cells overlapping an area which does not cross the antimeridian.
+        """
+        (row1, row2), (col1, col2) = self.__cell([lat1, lat2], [long1, long2])
+        rows = np.arange(row1, row2 + 1)
+        start = self.offset[rows * self.n_col + col1]
+        count = self.offset[rows * self.n_col + col2 + 1] - start
+        return self.order[np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count) + np.repeat(start, count)]
+
+    def query_box(self, lat1, long1, lat2, long2):
+        """
+        Get the points within a latitude/longitude box (boundaries included).
+
+        Parameters
+        ----------
+        lat1 : float
+            Latitude of south boundary [deg]
+        long1 : float
+            Longitude of west boundary. The box crosses the antimeridian if long1 > long2 [deg]
+        lat2 : float
+            Latitude of north boundary [deg]
+        long2 : float
+            Longitude of east boundary [deg]
+
+        Returns
+        -------
+        int[]
+            Index of the points in ascending order
+        """
+        if lat1 > lat2:
+            return np.array([], dtype=int)
+        long_ranges = [(long1, long2)] if long1 <= long2 else [(long1, 180.0), (-180.0, long2)]
+        found = []
+        for west, east in long_ranges:
+            index = self.__gather(lat1, west, lat2, east)
+            mask = (self.lat[index] >= lat1) & (self.lat[index] <= lat2) & (self.long[index] >= west) & (self.long[index] <= east)
+            found.append(index[mask])
+        return np.sort(np.concatenate(found))
+
+    def query_radius(self, lat, long, radius):
+        """
+        Get the points within a great circle distance.
+
+        Parameters
+        ----------
+        lat : float
+            Latitude of the center [deg]
+        long : float
+            Longitude of the center [deg]
+        radius : float
+            Great circle distance [km]
+
+        Returns
+        -------
+        index : int[]
+            Index of the points sorted by distance (then by index)
+        dist : float[]
+            Great circle distance of the points [km]
+        """
+        # Bounding box of the spherical cap (with a small margin for rounding)
+        angle = radius / 6371.009
+        dlat = np.rad2deg(angle) * (1.0 + 1e-9) + 1e-9
+        if lat - dlat <= -90.0 or lat + dlat >= 90.0 or angle >= np.pi / 2.0:
+            # Cap contains a pole
+            dlong = 180.0
+        else:
+            dlong = np.rad2deg(np.arcsin(min(np.sin(angle) / np.cos(np.deg2rad(lat)), 1.0))) * (1.0 + 1e-9) + 1e-9
+        if dlong >= 180.0:
+            index = self.query_box(max(lat - dlat, -90.0), -180.0, min(lat + dlat, 90.0), 180.0)
+        else:
+            index = self.query_box(lat - dlat, np.mod(long - dlong + 180.0, 360.0) - 180.0,
+                                   lat + dlat, np.mod(long + dlong + 180.0, 360.0) - 180.0)
+
+        dist = Cal.cal_great_circle_dist(lat, long, self.lat[index], self.long[index])
+        mask = dist <= radius
+        index, dist = index[mask], dist[mask]
+        order = np.lexsort((index, dist))
+        return index[order], dist[order]
+
+    def query_nearest(self, lat, long, k=1):
+        """
+        Get the k nearest points by great circle distance.
+
+        Parameters
+        ----------
+        lat : float
+            Latitude of the center [deg]
+        long : float
+            Longitude of the center [deg]
+        k : int, optional
+            Number of points, by default 1
+
+        Returns
+        -------
+        index : int[]
+            Index of the points sorted by distance (then by index). Less than k if the index has less points.
+        dist : float[]
+            Great circle distance of the points [km]
+        """
+        # Grow the search radius until it contains k points
+        radius = 111.0 * self.cell_size
+        while True:
+            index, dist = self.query_radius(lat, long, radius)
+            if len(index) >= k or radius >= np.pi * 6371.009:
+                return index[:k], dist[:k]
+            radius = radius * 4.0
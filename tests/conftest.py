@@ -0,0 +1,120 @@
+import pytest
+from zipfile import ZipFile
+from airtrafficsim.core.navigation import Nav
+
+
+HEADER = "I\n1100 Version - synthetic\n\n"
+
+FIX = [
+    # Hong Kong terminal area
+    (21.6, 113.95, "SIERA", "VH"), (21.9, 113.7, "TAMAR", "VH"), (22.1, 113.6, "LIMES", "VH"), (22.2, 113.7, "FIRED", "VH"),
+    (22.26, 113.8, "FF07R", "VH"), (22.15, 114.25, "BETTY", "VH"), (21.8, 114.1, "CANTO", "VH"), (22.36, 114.1, "PORPA", "VH"),
+    # Airways to Taipei
+    (22.5, 114.5, "OCEAN", "VH"), (23.0, 115.5, "RASSE", "VH"), (23.5, 116.8, "CONGA", "VH"), (24.0, 118.0, "ENVAR", "VH"),
+    (24.3, 119.2, "DADON", "VH"), (24.4, 119.8, "EXTRA", "VH"), (24.5, 120.3, "RENOT", "VH"), (24.6, 120.5, "TONGA", "VH"),
+    (24.8, 120.8, "JAMMY", "VH"), (24.9, 121.0, "LOTUS", "VH"), (25.0, 121.12, "FF05R", "VH"),
+    # Names used in several regions
+    (10.0, 10.0, "DUPLI", "VH"), (-30.0, 150.0, "TAMAR", "ZZ"), (50.0, 8.0, "LIMES", "ZZ"), (22.0, 114.0, "DUPLI", "ZZ"),
+]
+
+NAV = """3 22.220000 114.030000 0 11390 130 -2.0 SMT ENRT VH SIU MO SHAN VOR/DME
+3 25.000000 121.000000 0 11390 130 -2.0 TIA ENRT RC TAIPEI VOR/DME XX
+2 22.100000 113.900000 0 340 50 0.0 TD ENRT VH TUNG LUNG NDB XX XX
+3 -33.000000 151.000000 0 11390 130 -2.0 SMT ENRT YM SOMEWHERE VOR/DME
+"""
+
+# A1 from OCEAN to TONGA, B2 from PORPA to OCEAN and W3 one way from RASSE to DADON
+AIRWAY = """OCEAN VH 11 RASSE VH 11 N 2 180 460 A1
+RASSE VH 11 CONGA VH 11 N 2 180 460 A1
+CONGA VH 11 ENVAR VH 11 N 2 180 460 A1
+ENVAR VH 11 DADON VH 11 N 2 180 460 A1
+DADON VH 11 EXTRA VH 11 N 2 180 460 A1
+EXTRA VH 11 RENOT VH 11 N 2 180 460 A1
+RENOT VH 11 TONGA VH 11 N 2 180 460 A1
+PORPA VH 11 OCEAN VH 11 N 1 180 460 B2
+RASSE VH 11 DADON VH 11 F 2 180 460 W3
+"""
+
+HOLDING = """BETTY VH ENRT 11 161.0 1.0 5.0 R 6000 0 230
+SIERA VH ENRT 11 340.0 1.0 0.0 L 6000 0 230
+"""
+
+MSA = "A VHHH VH VHHH VH 0 0 035 90 025 180 045 270 035 0 0 0 0 0 0 0 0 0 0 0 0\n"
+
+APT = """1 28 0 0 VHHH Hong Kong Intl
+100 60.00 1 0 0.25 0 2 1 07L 22.310000 113.896000 0 0 2 0 0 0 25R 22.324000 113.933000 0 0 2 0 0 0
+100 60.00 1 0 0.25 0 2 1 07R 22.296000 113.899000 0 0 2 0 0 0 25L 22.310000 113.936000 0 0 2 0 0 0
+1 106 0 0 RCTP Taoyuan Intl
+100 60.00 1 0 0.25 0 2 1 05L 25.070000 121.210000 0 0 2 0 0 0 23R 25.090000 121.240000 0 0 2 0 0 0
+100 60.00 1 0 0.25 0 2 1 05R 25.060000 121.220000 0 0 2 0 0 0 23L 25.080000 121.250000 0 0 2 0 0 0
+1 13 0 0 KXYZ Somewhere
+101 49 1 08 35.0 -120.0 26 35.01 -119.9
+1 200 0 0 EGLL Heathrow
+100 60.00 1 0 0.25 0 2 1 09L 51.477500 -0.485000 0 0 2 0 0 0 27R 51.477700 -0.433000 0 0 2 0 0 0
+99
+"""
+
+CIFP = {'VHHH': """STAR:010,5,SIER7A,RW07R,SIERA,VH,P,C,E   , , , , , , , , , , , , , ,-,FL150,     ,     , ,   , , , , , , , , , ,
+STAR:020,5,SIER7A,RW07R,TAMAR,VH,P,C,E   , , , , , , , , , , , , , , ,     ,     ,     , ,250, , , , , , , , , ,
+STAR:030,5,SIER7A,RW07R,LIMES,VH,P,C,E  A, , , , , , , , , , , , , ,+,07000,     ,     , ,   , , , , , , , , , ,
+STAR:010,5,CANT2A,ALL,CANTO,VH,P,C,E   , , , , , , , , , , , , , ,+,FL110,     ,     , ,   , , , , , , , , , ,
+STAR:020,5,CANT2A,ALL,BETTY,VH,P,C,E   , , , , , , , , , , , , , , ,06000,09000,     , ,   , , , , , , , , , ,
+STAR:030,5,CANT2A,ALL,LIMES,VH,P,C,E  A, , , , , , , , , , , , , ,+,07000,     ,     , ,   , , , , , , , , , ,
+SID:010,5,OCEA2B,RW25L,PORPA,VH,P,C,E   , , , , , , , , , , , , , ,+,05000,     ,     , ,   , , , , , , , , , ,
+SID:020,5,OCEA2B,RW25L,OCEAN,VH,P,C,E   , , , , , , , , , , , , , ,+,FL140,     ,     , ,250, , , , , , , , , ,
+APPCH:010,A,I07R,LIMES,LIMES,VH,P,C,E  A, , , , , , , , , , , , , ,+,07000,     ,     , ,   , , , , , , , , , ,
+APPCH:020,A,I07R,LIMES,FIRED,VH,P,C,E   , , , , , , , , , , , , , , ,04000,     ,     , ,210, , , , , , , , , ,
+APPCH:010,I,I07R,I07R,FIRED,VH,P,C,E  I, , , , , , , , , , , , , , ,04000,     ,     , ,   , , , , , , , , , ,
+APPCH:020,I,I07R,I07R,FF07R,VH,P,C,E  F, , , , , , , , , , , , , , ,02000,     ,     , ,   , , , , , , , , , ,
+APPCH:030,I,I07R,I07R,RW07R,VH,P,C,GY M, , , , , , , , , , , , , , ,00050,     ,     , ,   , , , , , , , , , ,
+APPCH:040,I,I07R,I07R,SMT,VH,P,C,E  M, , , , , , , , , , , , , , ,05000,     ,     , ,   , , , , , , , , , ,
+APPCH:010,R,R25LZ,R25LZ,BETTY,VH,P,C,E  F, , , , , , , , , , , , , , ,02000,     ,     , ,   , , , , , , , , , ,
+RWY:RW07R,     ,     ,00000, ,N22171800,E113535800,,,,,,,,,,,,,,,,,,,,,,,,,,,,,,,
+""", 'RCTP': """STAR:010,5,TONG1A,RW05R,TONGA,VH,P,C,E   , , , , , , , , , , , , , ,-,FL200,     ,     , ,   , , , , , , , , , ,
+STAR:020,5,TONG1A,RW05R,JAMMY,VH,P,C,E  A, , , , , , , , , , , , , , ,     ,     ,     , ,   , , , , , , , , , ,
+APPCH:010,A,I05R,JAMMY,JAMMY,VH,P,C,E  A, , , , , , , , , , , , , ,+,05000,     ,     , ,   , , , , , , , , , ,
+APPCH:020,A,I05R,JAMMY,LOTUS,VH,P,C,E   , , , , , , , , , , , , , , ,03000,     ,     , ,   , , , , , , , , , ,
+APPCH:010,I,I05R,I05R,LOTUS,VH,P,C,E  I, , , , , , , , , , , , , , ,03000,     ,     , ,   , , , , , , , , , ,
+APPCH:020,I,I05R,I05R,FF05R,VH,P,C,E  F, , , , , , , , , , , , , , ,01600,     ,     , ,   , , , , , , , , , ,
+APPCH:030,I,I05R,I05R,RW05R,VH,P,C,GY M, , , , , , , , , , , , , , ,00150,     ,     , ,   , , , , , , , , , ,
+""", 'VMMC': """SID:010,5,ALBE1A,RW16,ALBER,VH,P,C,E   , , , , , , , , , , , , , ,+,05000,     ,     , ,   , , , , , , , , , ,
+,5,NOTYP,RW16,ALBER,VH,P,C,E   , , , , , , , , , , , , , ,+,05000,     ,     , ,   , , , , , , , , , ,
+"""}
+
+
+def mora_cell(lat, long):
+    # 5000 ft at N20 to 10000 ft at N25 from E113 to E121, unknown north of N81, 0 elsewhere
+    if lat >= 81:
+        return "UNK"
+    if 20 <= lat <= 25 and 113 <= long <= 121:
+        return "%03d" % (50 + 10 * (lat - 20))
+    return "000"
+
+def make_navigation_data(zip_path):
+    # Small X-plane navigation data set around Hong Kong and Taipei
+    mora = ["%s%02d%s%03d " % ("S" if lat < 0 else "N", abs(lat), "W" if long < 0 else "E", abs(long)) + " ".join(mora_cell(lat, long + i) for i in range(30))
+            for lat in range(-90, 90) for long in range(-180, 180, 30)]
+    with ZipFile(zip_path, 'w') as zip_file:
+        zip_file.writestr('earth_fix.dat', HEADER + "".join("%f %f %s ENRT %s\n" % fix for fix in FIX) + "99\n")
+        zip_file.writestr('earth_nav.dat', HEADER + NAV + "99\n")
+        zip_file.writestr('earth_awy.dat', HEADER + AIRWAY + "99\n")
+        zip_file.writestr('earth_hold.dat', HEADER + HOLDING + "99\n")
+        zip_file.writestr('earth_mora.dat', HEADER + "\n".join(mora) + "\n99\n")
+        zip_file.writestr('earth_msa.dat', HEADER + MSA + "99\n")
+        zip_file.writestr('apt.dat', HEADER + APT)
+        for airport, procedures in CIFP.items():
+            zip_file.writestr('CIFP/' + airport + '.dat', procedures)
+
+@pytest.fixture(scope="session")
+def navigation_data(tmp_path_factory):
+    path = tmp_path_factory.mktemp("navigation")
+    make_navigation_data(path.joinpath('navigation.zip'))
+    return path.joinpath('navigation.zip'), path.joinpath('xplane')
+
+@pytest.fixture(scope="module")
+def nav(navigation_data):
+    """Point Nav to the test navigation data for the tests of a module."""
+    zip_path, path = Nav.zip_path, Nav.data_path
+    Nav.set_data_path(*navigation_data)
+    yield Nav
+    Nav.set_data_path(zip_path, path)
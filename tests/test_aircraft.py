@@ -0,0 +1,156 @@
+import pytest
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from airtrafficsim.core.traffic import Traffic
+from airtrafficsim.core.aircraft import Aircraft
+from airtrafficsim.core.navigation import Nav
+from airtrafficsim.utils.enums import Config, FlightPhase
+from airtrafficsim.utils.calculation import Cal
+from airtrafficsim.utils.unit_conversion import Unit
+
+# Navigation data of tests/conftest.py
+pytestmark = pytest.mark.usefixtures("nav")
+
+
+@pytest.fixture()
+def traffic():
+    return Traffic("TestAircraft", datetime.fromisoformat('2022-03-22T00:00:00+00:00'), 100, "", "BADA")
+
+def add_aircraft(traffic, call_sign, aircraft_type="A20N", **kwargs):
+    state = dict(flight_phase=FlightPhase.CRUISE, configuration=Config.CLEAN, lat=22.0, long=113.5, alt=20000.0, heading=175.0,
+                 cas=250.0, fuel_weight=10000.0, payload_weight=12000.0, cruise_alt=37000)
+    state.update(kwargs)
+    return Aircraft(traffic, call_sign=call_sign, aircraft_type=aircraft_type, **state)
+
+def test_get_wake(traffic):
+    aircraft = [add_aircraft(traffic, "A", "A20N"), add_aircraft(traffic, "B", "AT76"), add_aircraft(traffic, "C", "B738")]
+    assert [a.get_wake() for a in aircraft] == ["M", "M", "M"]
+    # The last aircraft moves into the row of the deleted one
+    traffic.del_aircraft(aircraft[0].index)
+    assert aircraft[2].get_wake() == "M"
+    with pytest.raises(IndexError):
+        aircraft[0].get_wake()
+
+def test_get_next_wp(traffic):
+    no_plan = add_aircraft(traffic, "A")
+    plan = add_aircraft(traffic, "B", flight_plan=["RASSE", "CONGA", "ENVAR"])
+    assert no_plan.get_next_wp() == "NONE" and plan.get_next_wp() == "RASSE"
+    row = traffic.rows_for(plan.index)
+    traffic.ap.flight_plan_index[row] = 2
+    assert plan.get_next_wp() == "ENVAR"
+    # Finished flight plan
+    traffic.ap.flight_plan_index[row] = 3
+    assert plan.get_next_wp() == "NONE"
+
+def test_del_aircraft_batch(traffic, capsys):
+    aircraft = [add_aircraft(traffic, str(i)) for i in range(3)]
+    capsys.readouterr()
+    traffic.del_aircraft_batch(traffic.index[[]])
+    assert capsys.readouterr().out == "" and len(traffic.index) == 3
+    traffic.del_aircraft_batch([aircraft[0].index, aircraft[1].index])
+    assert "del_aircraft_batch()" in capsys.readouterr().out
+    assert list(traffic.index) == [aircraft[2].index] and aircraft[2].get_alt() == 20000.0
+
+def test_rows_for(traffic):
+    # More aircraft than the initial capacity of the storage and the row map
+    aircraft = [add_aircraft(traffic, str(i), alt=1000.0 * i) for i in range(70)]
+    deleted = {0, 5, 69, 68, 30, 31, 32, 66}
+    traffic.del_aircraft(aircraft[5].index)
+    traffic.del_aircraft_batch([aircraft[i].index for i in (69, 0, 30)])
+    traffic.del_aircraft(aircraft[68].index)
+    traffic.del_aircraft_batch([aircraft[i].index for i in (66, 32, 31)])
+    aircraft += [add_aircraft(traffic, str(i), alt=1000.0 * i) for i in range(70, 75)]
+    for i, a in enumerate(aircraft):
+        if i in deleted:
+            with pytest.raises(IndexError):
+                traffic.rows_for(a.index)
+        else:
+            row = traffic.rows_for(a.index)
+            assert traffic.call_sign[row] == str(i) and traffic.index[row] == a.index and a.get_alt() == 1000.0 * i
+    live = [a.index for i, a in enumerate(aircraft) if i not in deleted]
+    assert sorted(traffic.index.astype(int).tolist()) == live
+    # next_id counts deleted aircraft too, storage.n only the active ones
+    assert traffic.next_id == 75 and traffic.storage.n == len(live) and len(traffic.row_map) >= 75
+    assert traffic.rows_for(live).tolist() == [traffic.rows_for(i) for i in live]
+    with pytest.raises(IndexError):
+        traffic.rows_for(75)
+
+def test_add_aircraft_batch_missing_parameter(traffic):
+    state = pd.DataFrame(dict(call_sign=["A", "B"], aircraft_type=["A20N", "B738"], flight_phase=[FlightPhase.CRUISE] * 2, configuration=[Config.CLEAN] * 2,
+                              lat=[22.0, 22.1], long=[113.5, 113.6], alt=[20000.0, 21000.0], heading=[175.0, 180.0], cas=[250.0, 260.0],
+                              fuel_weight=[10000.0] * 2, payload_weight=[12000.0] * 2))
+    with pytest.raises(ValueError, match="heading"):
+        traffic.add_aircraft_batch(state.drop(columns="heading"))
+    with pytest.raises(ValueError, match="cas"):
+        traffic.add_aircraft_batch(**state.drop(columns="cas").to_dict("list"))
+    with pytest.raises(ValueError, match="lat"):
+        traffic.add_aircraft_batch(**dict(state.to_dict("list"), lat=[22.0]))
+    # Nothing is added by a rejected batch
+    assert len(traffic.index) == 0 and traffic.storage.n == 0
+    assert traffic.add_aircraft_batch(state).tolist() == [0, 1] and traffic.heading.tolist() == [175.0, 180.0]
+
+def test_below_mora(traffic):
+    # MORA of the N22E113 cell is 7000 ft
+    low = add_aircraft(traffic, "A", lat=22.3, long=113.9, alt=5000.0, cas=220.0, cruise_alt=5000)
+    high = add_aircraft(traffic, "B", lat=22.3, long=113.9, alt=9000.0, cas=220.0, cruise_alt=9000)
+    unknown = add_aircraft(traffic, "C", lat=89.5, long=0.0, alt=5000.0, cas=220.0, cruise_alt=5000)
+    traffic.update(0)
+    rows = traffic.rows_for([low.index, high.index, unknown.index])
+    assert traffic.mora[rows[:2]].tolist() == [7000.0, 7000.0] and np.isnan(traffic.mora[rows[2]])
+    assert traffic.below_mora[rows].tolist() == [True, False, False]
+
+def test_set_holding(traffic):
+    # Hold two rounds at BETTY (inbound course 161, leg 5 nm) coming from the north west, then leave to the south east
+    holding = add_aircraft(traffic, "A", lat=22.35, long=113.9, alt=6000.0, heading=125.0, cas=220.0, cruise_alt=6000, flight_plan=["BETTY", "CANTO"])
+    other = add_aircraft(traffic, "B", lat=22.35, long=113.9, alt=6000.0, heading=125.0, cas=220.0, cruise_alt=6000, flight_plan=["BETTY", "CANTO"])
+    traffic.ap.insert_waypoint(traffic.rows_for(holding.index), 1, "EXIT", 21.95, 114.6, np.nan, np.nan)
+    holding.set_holding(2, "BETTY", "VH")
+    betty = Nav.get_wp_coord("BETTY", 22.0, 114.0)
+    states = []
+    for step in range(900):
+        traffic.update(step)
+        row, other_row = traffic.rows_for([holding.index, other.index])
+        states.append((bool(traffic.ap.holding[row]), traffic.ap.holding_round[row], int(traffic.ap.flight_plan_index[row]),
+                       Cal.cal_great_circle_dist(traffic.lat[row], traffic.long[row], *betty), bool(traffic.ap.holding[other_row])))
+    hold, rounds, fp_index, dist, other_hold = (np.array(x) for x in zip(*states))
+    assert not other_hold.any()
+    # One round is counted when entering the holding pattern and one when back at the fix after the inbound turn
+    changes = np.flatnonzero(np.diff(rounds)) + 1
+    assert rounds[0] == 2.0 and rounds[changes].tolist() == [1.0, 0.0] and rounds[-1] == 0.0
+    assert hold[changes[0]] and dist[changes[1]] < 1.0 and dist[changes[0]:changes[1]].max() > Unit.nm2m(5.0) / 1000.0
+    # The flight plan stays at BETTY while holding and advances to the next waypoint after leaving the holding pattern
+    leave = np.flatnonzero(hold)[-1] + 1
+    assert hold[changes[0]:leave].all() and not hold[leave:].any() and (fp_index[:leave] == 0).all()
+    assert fp_index[-1] == 1 and traffic.ap.holding_fix[traffic.rows_for(holding.index)] == -1 and holding.get_next_wp() == "EXIT"
+
+def run_kernel(kernel, precision, steps):
+    # Climb through the transition altitude, descent, turns and an arrival with speed and altitude restrictions
+    traffic = Traffic("TestKernel", datetime.fromisoformat('2022-03-22T00:00:00+00:00'), 100, "", "BADA", precision=precision, kernel=kernel)
+    traffic.add_aircraft_batch(call_sign=["CLB", "DES", "TRN", "ARR"], aircraft_type=["A20N", "B738", "A20N", "B738"],
+                               flight_phase=[FlightPhase.CLIMB, FlightPhase.CRUISE, FlightPhase.CRUISE, FlightPhase.CRUISE], configuration=[Config.CLEAN] * 4,
+                               lat=[22.3, 24.0, 23.0, 22.8], long=[114.0, 118.0, 115.5, 114.8], alt=[5000.0, 37000.0, 20000.0, 15000.0],
+                               heading=[90.0, 250.0, 0.0, 240.0], cas=[250.0, 280.0, 300.0, 280.0], fuel_weight=[10000.0] * 4, payload_weight=[12000.0] * 4,
+                               flight_plan=[["RASSE", "CONGA", "ENVAR", "DADON"], ["CONGA", "RASSE", "OCEAN"], ["ENVAR", "DADON"], []],
+                               cruise_alt=[37000, 10000, 20000, 15000], arrival_airport=["", "", "", "VHHH"], arrival_runway=["", "", "", "07R"],
+                               star=["", "", "", "SIER7A"], approach=["", "", "", "I07R"])
+    states = []
+    for step in range(steps):
+        traffic.update(step)
+        states.append({name: getattr(traffic, name).copy() for name in ('lat', 'long', 'alt', 'heading', 'cas', 'tas', 'mach', 'gs_north', 'gs_east', 'path_angle',
+                                                                        'fuel_consumed', 'speed_mode', 'vertical_mode', 'flight_phase', 'configuration')})
+        states[-1]['flight_plan_index'] = traffic.ap.flight_plan_index.copy()
+    return states
+
+@pytest.mark.parametrize("precision, tolerance", [
+    ("float64", dict(lat=1e-9, long=1e-9, alt=1e-6, heading=1e-6, cas=1e-6, tas=1e-6, mach=1e-9, gs_north=1e-6, gs_east=1e-6, path_angle=1e-9, fuel_consumed=1e-6)),
+    ("float32", dict(lat=1e-5, long=1e-5, alt=0.05, heading=1e-3, cas=0.002, tas=0.002, mach=1e-5, gs_north=0.002, gs_east=0.002, path_angle=1e-4, fuel_consumed=0.002))])
+def test_numba_kernel(precision, tolerance):
+    pytest.importorskip("numba")
+    numpy_states = run_kernel("numpy", precision, 800)
+    numba_states = run_kernel("numba", precision, 800)
+    for numpy_state, numba_state in zip(numpy_states, numba_states):
+        for name in ('speed_mode', 'vertical_mode', 'flight_phase', 'configuration', 'flight_plan_index'):
+            assert (numpy_state[name] == numba_state[name]).all()
+        for name, atol in tolerance.items():
+            assert np.abs(numpy_state[name].astype(float) - numba_state[name]).max() <= atol, name
@@ -0,0 +1,43 @@
+import numpy as np
+from airtrafficsim.utils.airway_graph import AirwayGraph
+
+
+def make_grid(n, seed):
+    # n x n waypoints around the antimeridian with random missing segments
+    rng = np.random.default_rng(seed)
+    lat = np.repeat(np.linspace(-10.0, 10.0, n), n) + rng.uniform(-0.2, 0.2, n*n)
+    long = np.mod(np.tile(np.linspace(170.0, 190.0, n), n) + rng.uniform(-0.2, 0.2, n*n) + 180.0, 360.0) - 180.0
+    name = np.array(['W%03d' % i for i in range(n*n)])
+    node = np.arange(n*n).reshape(n, n)
+    a = np.concatenate((node[:, :-1].ravel(), node[:-1, :].ravel()))
+    b = np.concatenate((node[:, 1:].ravel(), node[1:, :].ravel()))
+    keep = rng.uniform(size=len(a)) < 0.7
+    a, b = a[keep], b[keep]
+    direction = rng.choice(['N', 'F', 'B'], len(a))
+    airway = np.array(['A%d' % (i % 7) for i in range(len(a))])
+    return AirwayGraph(name[a], np.full(len(a), 'XX'), np.full(len(a), 11), name[b], np.full(len(a), 'XX'), np.full(len(a), 11),
+                       direction, airway, np.char.add(name, ' XX 11'), lat, long)
+
+def test_shortest_path():
+    graph = make_grid(8, 0)
+    n = len(graph.node_name)
+    # Reference: Floyd-Warshall over all nodes
+    dist = np.full((n, n), np.inf)
+    np.fill_diagonal(dist, 0.0)
+    src = np.repeat(np.arange(n), np.diff(graph.adj_offset))
+    np.minimum.at(dist, (src, graph.adj_node), graph.adj_dist)
+    for k in range(n):
+        dist = np.minimum(dist, dist[:, k:k+1] + dist[k:k+1, :])
+    rng = np.random.default_rng(1)
+    for start, end in rng.integers(0, n, (50, 2)):
+        path, length = graph.shortest_path([start], [end])
+        if np.isfinite(dist[start, end]):
+            assert np.isclose(length, dist[start, end], rtol=1e-12)
+            assert path[0] == start and path[-1] == end
+            edges = [np.flatnonzero(graph.adj_node[graph.adj_offset[i]:graph.adj_offset[i+1]] == j) for i, j in zip(path[:-1], path[1:])]
+            assert all(len(e) > 0 for e in edges)
+        else:
+            assert path == [] and length == np.inf
+    # Nearest of several end nodes
+    for start, end1, end2 in rng.integers(0, n, (20, 3)):
+        assert np.isclose(graph.shortest_path([start], [end1, end2])[1], min(dist[start, end1], dist[start, end2]), rtol=1e-12)
@@ -0,0 +1,17 @@
+import pytest
+import numpy as np
+from airtrafficsim.core.storage import Storage
+from airtrafficsim.core.performance.bada import Bada
+from airtrafficsim.utils.enums import FlightPhase
+
+
+def test_landing_fuel_flow():
+    storage = Storage()
+    bada = Bada(storage)
+    storage.add(2)
+    bada.add_aircraft_batch(["A20N", "A20N"])
+    flight_phase = np.array([FlightPhase.APPROACH, FlightPhase.LANDING], dtype=np.int8)
+    # Idle thrust: max(nominal, minimum) is the minimum fuel flow c_f3 * (1 - H_p/c_f4) = 12.5 * (1 - 1000/50000) kg/min
+    fuel_burn = bada.cal_fuel_burn(flight_phase, np.array([140.0, 140.0]), np.array([0.0, 0.0]), np.array([1000.0, 1000.0]))
+    assert fuel_burn[1] == pytest.approx(12.25/60000.0)
+    assert fuel_burn[1] == pytest.approx(fuel_burn[0])
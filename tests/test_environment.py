@@ -35,4 +35,36 @@ def test_converthistoricdemo():
     env = Env()
     env.run()
     df = pd.read_csv(env.file_path)
-    assert df.shape[0] > 1 and df.isnull().values.any() == False
\ No newline at end of file
+    assert df.shape[0] > 1 and df.isnull().values.any() == False
+
+def run_demo(name, **options):
+    """Run a demo environment with some Environment arguments replaced (e.g. precision) and read its output."""
+    from airtrafficsim.core.environment import Environment
+    Env = getattr(import_module('airtrafficsim.data.environment.'+name, '...'), name)
+
+    class Options(Environment):
+        def __init__(self, **kwargs):
+            kwargs.update(options)
+            kwargs['file_name'] = '-'.join(list(options.values()) + [kwargs['file_name']])
+            super().__init__(**kwargs)
+
+    # Demo.__init__ -> Options.__init__ -> Environment.__init__
+    class Demo(Env, Options):
+        pass
+
+    env = Demo()
+    env.run()
+    return pd.read_csv(env.file_path)
+
+@pytest.mark.parametrize("name", ["DemoEnv", "FullFlightDemo"])
+def test_float32_precision(name):
+    df_64 = run_demo(name, precision="float64")
+    df_32 = run_demo(name, precision="float32")
+    assert df_64.shape == df_32.shape and (df_64[['timestep', 'id']] == df_32[['timestep', 'id']]).all(axis=None)
+    df = df_64.merge(df_32, on=['timestep', 'id'], suffixes=('_64', '_32'))
+    assert (df['lat_64'] - df['lat_32']).abs().max() < 1e-5 and (df['long_64'] - df['long_32']).abs().max() < 1e-5
+    assert (df['alt_64'] - df['alt_32']).abs().max() < 0.05 and (df['heading_64'] - df['heading_32']).abs().max() < 1e-3
+    assert (df['cas_64'] - df['cas_32']).abs().max() < 0.002 and (df['tas_64'] - df['tas_32']).abs().max() < 0.002
+    assert ((df['fuel_consumed_64'] - df['fuel_consumed_32']).abs() / df['fuel_consumed_64']).max() < 1e-6
+    for mode in ['flight_phase', 'configuration', 'speed_mode', 'vertical_mode', 'ap_speed_mode', 'ap_lateral_mode', 'ap_next_wp']:
+        assert (df[mode+'_64'] == df[mode+'_32']).all()
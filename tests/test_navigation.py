@@ -0,0 +1,186 @@
+import json
+import pytest
+import numpy as np
+from zipfile import ZipFile
+from airtrafficsim.core import navigation
+from airtrafficsim.core.navigation import Nav
+
+# Navigation data of tests/conftest.py
+pytestmark = pytest.mark.usefixtures("nav")
+
+
+def test_get_procedure():
+    assert Nav.get_procedure("VHHH", "RW07R", "SIER7A")[0] == ["SIERA", "TAMAR", "LIMES"]
+    # Initial approach from the IAF and final approach without the missed approach
+    assert Nav.get_procedure("VHHH", "RW07R", "I07R", appch="A", iaf="LIMES")[0] == ["LIMES", "FIRED"]
+    assert Nav.get_procedure("VHHH", "RW07R", "I07R", appch="I")[0] == ["FIRED", "FF07R"]
+    assert list(Nav.get_airport_procedures("VHHH", "SID")) == ["OCEA2B"]
+    # A row without procedure type is skipped
+    assert list(Nav.get_airport_procedures("VMMC", "SID")) == ["ALBE1A"]
+
+def test_get_cifp_read_only():
+    procedures = Nav.get_cifp("VHHH")
+    assert procedures is Nav.get_cifp("VHHH")
+    with pytest.raises(TypeError):
+        procedures["SIER7A"] = None
+    with pytest.raises(ValueError):
+        procedures["SIER7A"]["alt_restriction"][0] = 0.0
+    # Callers get copies of the restrictions
+    alt_restriction = Nav.get_procedure("VHHH", "RW07R", "SIER7A")[2]
+    alt_restriction[0] = 0.0
+    assert Nav.get_procedure("VHHH", "RW07R", "SIER7A")[2][0] == 15000.0
+
+def lookup_leg(start, airway, end):
+    # Reference: search the segments of the airway in the airway table leg by leg
+    segments = Nav.airway[Nav.airway[10].fillna('').astype(str).str.split('-').apply(lambda names: airway in names)]
+    parent = {start: None}
+    queue = [start]
+    while queue:
+        wp = queue.pop(0)
+        if wp == end:
+            path = [wp]
+            while parent[path[-1]] is not None:
+                path.append(parent[path[-1]])
+            return path[::-1][1:]
+        nxt = segments[(segments[0] == wp) & (segments[6] != 'B')][3].tolist() + segments[(segments[3] == wp) & (segments[6] != 'F')][0].tolist()
+        for n in nxt:
+            if n not in parent:
+                parent[n] = wp
+                queue.append(n)
+    return None
+
+def test_expand_route():
+    assert Nav.expand_route("RASSE A1 ENVAR DCT TONGA") == ["RASSE"] + lookup_leg("RASSE", "A1", "ENVAR") + ["TONGA"]
+    assert Nav.expand_route("ENVAR A1 OCEAN B2 PORPA") == ["ENVAR"] + lookup_leg("ENVAR", "A1", "OCEAN") + lookup_leg("OCEAN", "B2", "PORPA")
+    assert Nav.expand_route("RASSE W3 DADON") == ["RASSE"] + lookup_leg("RASSE", "W3", "DADON")
+    # W3 is one way
+    assert lookup_leg("DADON", "W3", "RASSE") is None
+    with pytest.raises(ValueError):
+        Nav.expand_route("DADON W3 RASSE")
+
+def test_get_shortest_route():
+    assert Nav.get_shortest_route("RASSE", "DADON") == ["RASSE", "DADON"]
+    assert Nav.get_shortest_route("DADON", "RASSE") == ["DADON", "ENVAR", "CONGA", "RASSE"]
+    with pytest.raises(ValueError):
+        Nav.get_shortest_route("RASSE", "NOWHERE")
+
+def test_get_mora():
+    # Known cells of the grid (N22E113 around Hong Kong, N80 and N81 on the antimeridian)
+    assert Nav.get_mora([22.3, 22.99], [113.9, 113.0]).tolist() == [7000.0, 7000.0]
+    assert Nav.get_mora([80.5, 80.5], [179.5, -179.5]).tolist() == [0.0, 0.0]
+    assert np.isnan(Nav.get_mora([81.5, 81.5], [179.5, -179.5])).all()
+    # Longitudes wrap around the antimeridian
+    assert Nav.get_mora([22.3, 22.3, 80.5], [473.9, -246.1, 180.5]).tolist() == [7000.0, 7000.0, 0.0]
+    # Unknown positions
+    mora = Nav.get_mora([np.nan, 22.3, 22.3, np.inf], [113.9, np.nan, 113.9, 0.0])
+    assert np.isnan(mora[[0, 1, 3]]).all() and mora[2] == 7000.0
+
+def make_navigation_zip(zip_path, n):
+    # Navigation data with n airports of two runways each (airports 3 and 7 are heliports without runways)
+    lines = [b"I\n", b"1100 Generated synthetic\n", b"\n"]
+    for i in range(n):
+        lines.append(b"1 %d 0 0 A%03d Airport %d\n" % (i, i, i))
+        if i % 4 != 3:
+            for j in range(2):
+                lines.append(b"100 60.00 1 0 0.25 0 2 1 %02dL %.6f %.6f 0 0 2 0 0 0 %02dR %.6f %.6f 0 0 2 0 0 0\n" % (j + 1, i * 0.1, j * 0.1, j + 19, i * 0.1 + 0.01, j * 0.1 + 0.02))
+    lines.append(b"99\n")
+    with ZipFile(zip_path, 'w') as zip_file:
+        zip_file.writestr('apt.dat', b"".join(lines))
+        zip_file.writestr('earth_fix.dat', b"I\n1100 Generated synthetic\n\n22.0 113.0 FIX01 ENRT VH\n99\n")
+        zip_file.writestr('CIFP/A000.dat', b"SID:010,5,A1,RW01L,FIX01,VH,P,C,E  , ,   ,DF, , , , , ,      ,    ,    ,    ,    , ,     ,     ,18000,    ,   ,    ,   , , , , , ,0,N,S;\n")
+
+def read_installed(path):
+    index = np.load(path.joinpath('airports_index.npz'))
+    return (path.joinpath('airports.dat').read_bytes(), {key: index[key].tolist() for key in index.files},
+            path.joinpath('airports.csv').read_bytes(), path.joinpath('earth_fix.dat').read_bytes(), path.joinpath('CIFP/A000.dat').read_bytes())
+
+def test_install_resume(tmp_path, monkeypatch):
+    zip_path = tmp_path.joinpath('data.zip')
+    make_navigation_zip(zip_path, 10)
+    Nav.install(block_size=3, zip_path=zip_path, path=tmp_path.joinpath('full'))
+    expected = read_installed(tmp_path.joinpath('full'))
+    assert expected[1]['icao'] == ['A%03d' % i for i in range(10)] and expected[2].count(b"\n") == 8 * 2 * 2
+
+    # Interrupt after the first block
+    parse_airports = navigation._parse_airports
+    calls = []
+    def interrupted(lines):
+        calls.append(len(lines))
+        if len(calls) > 1:
+            raise KeyboardInterrupt
+        return parse_airports(lines)
+    monkeypatch.setattr(navigation, '_parse_airports', interrupted)
+    path = tmp_path.joinpath('resumed')
+    with pytest.raises(KeyboardInterrupt):
+        Nav.install(block_size=3, zip_path=zip_path, path=path)
+    progress = json.loads(path.joinpath('airports.progress').read_text())
+    assert progress['blocks'] == 1 and progress['airports'] == 3 and not path.joinpath('installed').is_file()
+    # Output of an unfinished block written after the saved progress is dropped on resume
+    with open(path.joinpath('airports.dat'), 'ab') as store:
+        store.write(b"1 0 0 0 PART Partial\n")
+
+    # Resume from the second block
+    calls.clear()
+    monkeypatch.setattr(navigation, '_parse_airports', lambda lines: calls.append(len(lines)) or parse_airports(lines))
+    Nav.install(block_size=3, zip_path=zip_path, path=path)
+    assert len(calls) == 3 and read_installed(path) == expected
+    assert not path.joinpath('airports.progress').is_file() and not path.joinpath('airports_index.part').is_file()
+
+    # Installed data of the same zip file is kept, a changed zip file is installed again from the start
+    calls.clear()
+    Nav.install(block_size=3, zip_path=zip_path, path=path)
+    assert calls == []
+    make_navigation_zip(zip_path, 5)
+    Nav.install(block_size=3, zip_path=zip_path, path=path)
+    assert len(calls) == 2 and np.load(path.joinpath('airports_index.npz'))['icao'].tolist() == ['A%03d' % i for i in range(5)]
+
+def test_install_progress_of_other_zip(tmp_path):
+    # Progress saved for another version of the zip file is discarded
+    zip_path = tmp_path.joinpath('data.zip')
+    make_navigation_zip(zip_path, 10)
+    Nav.install(block_size=3, zip_path=zip_path, path=tmp_path.joinpath('full'))
+    path = tmp_path.joinpath('other')
+    path.mkdir()
+    path.joinpath('airports.dat').write_bytes(b"1 0 0 0 OLD0 Old\n")
+    path.joinpath('airports.progress').write_text(json.dumps({'version': 'other', 'blocks': 2, 'airports': 6, 'store': 17, 'index': 0, 'runways': 0}))
+    Nav.install(block_size=3, zip_path=zip_path, path=path)
+    assert read_installed(path) == read_installed(tmp_path.joinpath('full'))
+
+def test_install_interrupted_at_finalisation(tmp_path, monkeypatch):
+    zip_path = tmp_path.joinpath('data.zip')
+    make_navigation_zip(zip_path, 10)
+    Nav.install(block_size=3, zip_path=zip_path, path=tmp_path.joinpath('full'))
+    expected = read_installed(tmp_path.joinpath('full'))
+
+    # Interrupt after airports.part is moved to airports.csv
+    replace = navigation.os.replace
+    def interrupted(src, dst):
+        replace(src, dst)
+        raise KeyboardInterrupt
+    monkeypatch.setattr(navigation.os, 'replace', interrupted)
+    path = tmp_path.joinpath('interrupted')
+    with pytest.raises(KeyboardInterrupt):
+        Nav.install(block_size=3, zip_path=zip_path, path=path)
+    monkeypatch.setattr(navigation.os, 'replace', replace)
+    assert not path.joinpath('airports.progress').is_file() and not path.joinpath('installed').is_file()
+    Nav.install(block_size=3, zip_path=zip_path, path=path)
+    assert read_installed(path) == expected
+
+    # Progress left by an interrupted finalisation without its part files is discarded
+    path = tmp_path.joinpath('stale')
+    Nav.install(block_size=3, zip_path=zip_path, path=path)
+    stat = zip_path.stat()
+    progress = {'version': str(stat.st_size) + "-" + str(stat.st_mtime_ns), 'blocks': 4, 'airports': 10,
+                'store': len(expected[0]), 'index': 100, 'runways': len(expected[2])}
+    path.joinpath('airports.progress').write_text(json.dumps(progress))
+    path.joinpath('installed').unlink()
+    Nav.install(block_size=3, zip_path=zip_path, path=path)
+    assert read_installed(path) == expected
+
+def test_install_workers(tmp_path):
+    # Blocks parsed by several processes are written in order
+    zip_path = tmp_path.joinpath('data.zip')
+    make_navigation_zip(zip_path, 25)
+    Nav.install(block_size=2, zip_path=zip_path, path=tmp_path.joinpath('single'))
+    Nav.install(workers=2, block_size=2, zip_path=zip_path, path=tmp_path.joinpath('pool'))
+    assert read_installed(tmp_path.joinpath('pool')) == read_installed(tmp_path.joinpath('single'))
@@ -0,0 +1,42 @@
+import pytest
+import numpy as np
+from openap import prop, Thrust, Drag, FuelFlow
+from airtrafficsim.core.storage import Storage
+from airtrafficsim.core.performance.openap_model import OpenAP
+from airtrafficsim.utils.enums import VerticalMode, APSpeedMode
+
+
+def test_grouped_models_match_per_aircraft():
+    icao = ["A320", "B738", "A320", "A333", "B738", "A320", "A333", "B738"]
+    storage = Storage()
+    openap = OpenAP(storage)
+    storage.add(len(icao))
+    openap.add_aircraft_batch(icao)
+
+    rng = np.random.default_rng(0)
+    mass = rng.uniform(50000.0, 70000.0, len(icao))
+    tas = rng.uniform(150.0, 480.0, len(icao))
+    alt = rng.uniform(0.0, 38000.0, len(icao))
+    vs = rng.choice([-2000.0, 0.0, 1500.0], len(icao))
+    vertical_mode = np.array([VerticalMode.CLIMB, VerticalMode.LEVEL, VerticalMode.DESCENT, VerticalMode.LEVEL,
+                              VerticalMode.CLIMB, VerticalMode.LEVEL, VerticalMode.DESCENT, VerticalMode.LEVEL], dtype=np.int8)
+    ap_speed_mode = np.array([APSpeedMode.CONSTANT_CAS, APSpeedMode.ACCELERATE, APSpeedMode.CONSTANT_MACH, APSpeedMode.CONSTANT_MACH,
+                              APSpeedMode.CONSTANT_CAS, APSpeedMode.DECELERATE, APSpeedMode.CONSTANT_CAS, APSpeedMode.CONSTANT_CAS], dtype=np.int8)
+
+    drag = openap.cal_drag(mass, tas, alt, vs)
+    thrust = openap.cal_thrust(vertical_mode, ap_speed_mode, tas, alt, drag)
+    fuel_burn = openap.cal_fuel_burn(thrust)
+
+    # Reference: new OpenAP models and one call per aircraft
+    for i, aircraft_type in enumerate(icao):
+        engine = prop.aircraft_engine_options(aircraft_type)[0]
+        assert drag[i] == pytest.approx(Drag(ac=aircraft_type).clean(mass=mass[i], tas=tas[i], alt=alt[i], vs=vs[i]), rel=1e-12)
+        if vertical_mode[i] == VerticalMode.CLIMB or ap_speed_mode[i] == APSpeedMode.ACCELERATE:
+            expected = Thrust(ac=aircraft_type, eng=engine).climb(tas=tas[i], alt=alt[i], roc=1000)
+        elif vertical_mode[i] == VerticalMode.DESCENT or ap_speed_mode[i] == APSpeedMode.DECELERATE:
+            expected = Thrust(ac=aircraft_type, eng=engine).descent_idle(tas=tas[i], alt=alt[i])
+        else:
+            expected = drag[i]
+        assert thrust[i] == pytest.approx(expected, rel=1e-12)
+        assert fuel_burn[i] == pytest.approx(FuelFlow(ac=aircraft_type, eng=engine).at_thrust(total_ac_thrust=thrust[i]), rel=1e-12)
+    assert np.array_equal(openap.get_empty_weight(np.arange(len(icao))), [prop.aircraft(t)['limits']['OEW'] for t in icao])
@@ -0,0 +1,44 @@
+import numpy as np
+from airtrafficsim.utils.spatial_index import SpatialIndex
+from airtrafficsim.utils.calculation import Cal
+
+
+def make_points(n, seed):
+    # Random points plus points on the antimeridian, at the poles, on cell boundaries and without coordinates
+    rng = np.random.default_rng(seed)
+    lat = np.concatenate((rng.uniform(-90.0, 90.0, n), rng.uniform(-90.0, 90.0, 20), rng.uniform(85.0, 90.0, 20), rng.uniform(-90.0, -85.0, 20),
+                          [90.0, -90.0, 0.0, 45.0, np.nan, 10.0]))
+    long = np.concatenate((rng.uniform(-180.0, 180.0, n), rng.choice([-180.0, 180.0], 20), rng.uniform(-180.0, 180.0, 40),
+                           [0.0, 180.0, -180.0, 1.0, 5.0, np.nan]))
+    return lat, long
+
+def test_query_box():
+    lat, long = make_points(2000, 0)
+    index = SpatialIndex(lat, long, cell_size=2.5)
+    rng = np.random.default_rng(1)
+    boxes = [(-90.0, -180.0, 90.0, 180.0), (80.0, 170.0, 90.0, -170.0), (-10.0, 180.0, 10.0, -180.0), (-90.0, 179.0, -85.0, -179.0)]
+    boxes += [tuple(rng.uniform([-90.0, -180.0, -90.0, -180.0], [90.0, 180.0, 90.0, 180.0])) for _ in range(200)]
+    for lat1, long1, lat2, long2 in boxes:
+        in_long = (long >= long1) & (long <= long2) if long1 <= long2 else (long >= long1) | (long <= long2)
+        expected = np.flatnonzero((lat >= lat1) & (lat <= lat2) & in_long)
+        assert index.query_box(lat1, long1, lat2, long2).tolist() == expected.tolist()
+
+def test_query_radius_and_nearest():
+    lat, long = make_points(2000, 2)
+    index = SpatialIndex(lat, long)
+    rng = np.random.default_rng(3)
+    # Centers near the antimeridian and the poles, then anywhere
+    centers = [(0.0, 180.0), (10.0, -179.9), (89.9, 0.0), (-89.5, 120.0), (90.0, 0.0), (60.0, 179.5)]
+    centers += list(zip(rng.uniform(-90.0, 90.0, 100), rng.uniform(-180.0, 180.0, 100)))
+    for (lat0, long0), radius, k in zip(centers, rng.choice([10.0, 300.0, 1500.0, 8000.0, 25000.0], len(centers)), rng.integers(1, 30, len(centers))):
+        dist = Cal.cal_great_circle_dist(lat0, long0, lat, long)
+        order = np.lexsort((np.arange(len(lat)), dist))
+        order = order[np.isfinite(dist[order])]
+        found, found_dist = index.query_radius(lat0, long0, radius)
+        expected = order[dist[order] <= radius]
+        assert found.tolist() == expected.tolist() and np.allclose(found_dist, dist[expected])
+        found, found_dist = index.query_nearest(lat0, long0, k)
+        assert found.tolist() == order[:k].tolist() and np.allclose(found_dist, dist[order[:k]])
+    # Less points than k, points without coordinates are never returned
+    dist = Cal.cal_great_circle_dist(0.0, 0.0, lat, long)
+    assert index.query_nearest(0.0, 0.0, len(lat) + 5)[0].tolist() == np.lexsort((np.arange(len(lat)), dist))[:len(lat) - 2].tolist()
@@ -0,0 +1,58 @@
+import numpy as np
+from airtrafficsim.core.storage import Storage, StorageMixin
+
+
+class State(StorageMixin):
+    def __init__(self, storage):
+        self.storage = storage
+        self.value = storage.column()
+        self.mode = storage.column(dtype=np.int8, fill=-1)
+        self.schedule = storage.column(shape=(3,))
+        self.name = storage.column(dtype='U8', fill='')
+        self.plan = storage.column(dtype=object, fill=list)
+
+
+def add(state, values):
+    rows = state.storage.add(len(values))
+    state.value[rows] = values
+    state.mode[rows] = np.asarray(values, dtype=int) % 100
+    state.schedule[rows] = np.asarray(values, dtype=float)[:, None] + np.arange(3)
+    state.name[rows] = [str(v) for v in values]
+    for row, v in zip(rows, values):
+        state.plan[row].append(v)
+    return rows
+
+def test_add_grows_capacity():
+    storage = Storage(capacity=4)
+    state = State(storage)
+    assert add(state, [0, 1, 2]).tolist() == [0, 1, 2] and storage.capacity == 4
+    # Growing keeps the live rows and the attributes point to the new buffers
+    assert add(state, np.arange(3, 13)).tolist() == list(range(3, 13)) and storage.capacity == 16
+    assert state.value.tolist() == list(range(13)) and state.mode.tolist() == list(range(13))
+    assert state.schedule[:, 2].tolist() == list(range(2, 15))
+    assert state.name.tolist() == [str(i) for i in range(13)]
+    assert [p for p in state.plan] == [[i] for i in range(13)]
+    # New rows get the fill value, one new object per row
+    rows = storage.add(2)
+    assert state.value[rows].tolist() == [0.0, 0.0] and state.mode[rows].tolist() == [-1, -1] and state.name[rows].tolist() == ['', '']
+    assert state.plan[rows[0]] == [] and state.plan[rows[0]] is not state.plan[rows[1]]
+
+def test_remove_swaps_last_rows():
+    storage = Storage(capacity=4)
+    state = State(storage)
+    add(state, np.arange(10))
+    expected = list(range(10))
+    # Holes before the new end are filled by the last kept rows, removed rows at the end are dropped
+    for rows in ([2], [0, 8, 7], [5, 1, 1], [3]):
+        storage.remove(rows)
+        for row in sorted(set(rows)):
+            expected[row] = None
+        kept = [v for v in expected[len(expected) - len(set(rows)):] if v is not None]
+        expected = [v if v is not None else kept.pop(0) for v in expected[:len(expected) - len(set(rows))]]
+        assert state.value.tolist() == expected and storage.n == len(expected)
+        assert state.mode.tolist() == expected and state.schedule[:, 1].tolist() == [v + 1 for v in expected]
+        assert state.name.tolist() == [str(v) for v in expected] and [p for p in state.plan] == [[v] for v in expected]
+    # Freed rows are reused by the next rows added, beyond them the capacity grows again
+    add(state, np.arange(10, 30))
+    assert state.value.tolist() == expected + list(range(10, 30)) and storage.capacity == 32
+    assert [p for p in state.plan] == [[v] for v in expected + list(range(10, 30))]